@@ -1,6 +1,10 @@
 /**
  * Activity Graph Visualization with D3.js
  * Gitflow-style timeline showing specs, commits, and PRs
+ *
+ * Events are loaded per month from the NDJSON chunks listed in
+ * activity-timeline.json: the most recent months first, older ones while
+ * scrolling or zooming back in time.
  */
 
 (function() {
@@ -23,12 +27,26 @@
         }
     };
 
-    let timelineData = null;
+    // Months loaded up front (newest first); older months load while scrolling back
+    const INITIAL_CHUNKS = 3;
+    // Load more once the visible area is this close (in px) to the oldest loaded date
+    const LOAD_MORE_THRESHOLD = 100;
+
+    let manifest = null;
+    let timelineData = [];
+    let nextChunk = -1;         // Index of the next older chunk to load
+    let loadingChunks = null;
+    let windowStart = null;     // Oldest date covered by the loaded chunks
+    let windowPadding = 0;
+    let domainEnd = null;
+    let pxPerMs = 0;
+    let branchIndexBySpec = new Map();
     let svg = null;
     let width = 0;
     let height = 0;
     let xScale = null;
     let zoom = null;
+    let currentTransform = null;
 
     /**
      * Initialize the activity graph
@@ -47,19 +65,24 @@
         }
 
         try {
-            // Load timeline data
+            // Load the chunk manifest, then only the most recent months
             const response = await fetch('../../assets/js/activity-timeline.json');
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
-            const data = await response.json();
-            timelineData = data.events || [];
+            manifest = await response.json();
+            const chunks = manifest.chunks || [];
+            nextChunk = chunks.length - 1;
 
-            if (timelineData.length === 0) {
+            if (chunks.length === 0) {
                 showEmptyState(container);
                 return;
             }
 
+            while (nextChunk >= 0 && chunks.length - 1 - nextChunk < INITIAL_CHUNKS) {
+                await loadChunk();
+            }
+
             // Initialize D3 visualization
             initializeGraph(container);
             renderGraph();
@@ -70,6 +93,46 @@
         }
     }
 
+    /**
+     * Fetch the next older monthly chunk and add its events
+     */
+    async function loadChunk() {
+        const chunk = manifest.chunks[nextChunk];
+        const response = await fetch(`../../${manifest.chunk_base}${chunk.file}`);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const text = await response.text();
+        text.split('\n')
+            .filter(line => line.trim())
+            .forEach(line => timelineData.push(JSON.parse(line)));
+
+        nextChunk--;
+        windowStart = new Date(`${chunk.month}-01`);
+    }
+
+    /**
+     * Load older months once the view is scrolled or zoomed out past the oldest loaded date
+     */
+    function loadOlderIfNeeded() {
+        if (loadingChunks || nextChunk < 0 || !currentTransform) return;
+
+        // Left edge of the visible area in graph coordinates
+        const visibleLeft = (-config.margin.left - currentTransform.x) / currentTransform.k;
+        if (visibleLeft > xScale.range()[0] + LOAD_MORE_THRESHOLD) return;
+
+        loadingChunks = loadChunk()
+            .then(() => {
+                updateScale();
+                renderGraph();
+            })
+            .catch(error => console.error('Failed to load older activity:', error))
+            .finally(() => {
+                loadingChunks = null;
+                loadOlderIfNeeded();
+            });
+    }
+
     /**
      * Initialize D3 SVG canvas and scales
      */
@@ -95,32 +158,33 @@
         zoom = d3.zoom()
             .scaleExtent([0.5, 3])
             .on('zoom', (event) => {
+                currentTransform = event.transform;
                 g.attr('transform', `translate(${config.margin.left},${config.margin.top}) ${event.transform}`);
+                loadOlderIfNeeded();
             });
 
         svg.call(zoom);
 
-        // Parse dates and create time scale
-        const dates = timelineData
-            .map(d => new Date(d.date))
-            .filter(d => !isNaN(d));
-
-        if (dates.length === 0) {
-            console.error('No valid dates found in timeline data');
-            return;
-        }
-
-        const minDate = d3.min(dates);
-        const maxDate = d3.max(dates);
+        // Fit the initially loaded months to the width, with some padding
+        const latest = new Date(manifest.last_date);
+        const dateRange = Math.max(latest - windowStart, 24 * 60 * 60 * 1000);
+        windowPadding = dateRange * 0.1;
+        domainEnd = new Date(latest.getTime() + dateRange * 0.1);
+        pxPerMs = width / (domainEnd - windowStart + windowPadding);
 
-        // Add some padding to the date range
-        const dateRange = maxDate - minDate;
-        const paddedMin = new Date(minDate.getTime() - dateRange * 0.1);
-        const paddedMax = new Date(maxDate.getTime() + dateRange * 0.1);
+        updateScale();
+    }
 
+    /**
+     * Time scale covering the loaded months at a fixed density, anchored at the
+     * newest date, so loading older months extends the graph to the left without
+     * moving what is already drawn
+     */
+    function updateScale() {
+        const domainStart = new Date(windowStart.getTime() - windowPadding);
         xScale = d3.scaleTime()
-            .domain([paddedMin, paddedMax])
-            .range([0, width]);
+            .domain([domainStart, domainEnd])
+            .range([width - (domainEnd - domainStart) * pxPerMs, width]);
     }
 
     /**
@@ -128,6 +192,7 @@
      */
     function renderGraph() {
         const g = svg.select('.graph-content');
+        g.selectAll('*').remove();
 
         // Draw master branch line
         drawMasterBranch(g);
@@ -139,10 +204,8 @@
         const specGroups = groupEventsBySpec();
 
         // Draw each spec's development flow
-        let branchIndex = 0;
-        for (const [specId, events] of Object.entries(specGroups)) {
-            drawSpecFlow(g, specId, events, branchIndex);
-            branchIndex++;
+        for (const [specId, events] of specGroups) {
+            drawSpecFlow(g, specId, events, branchIndexBySpec.get(specId));
         }
 
         // Add legend
@@ -155,7 +218,7 @@
     function drawMasterBranch(g) {
         g.append('line')
             .attr('class', 'master-branch')
-            .attr('x1', 0)
+            .attr('x1', xScale.range()[0])
             .attr('y1', config.masterBranchY)
             .attr('x2', width)
             .attr('y2', config.masterBranchY)
@@ -179,7 +242,7 @@
      */
     function drawTimeAxis(g) {
         const axis = d3.axisBottom(xScale)
-            .ticks(8)
+            .ticks(Math.max(8, Math.round((xScale.range()[1] - xScale.range()[0]) / 150)))
             .tickFormat(d3.timeFormat('%b %d'));
 
         g.append('g')
@@ -189,17 +252,22 @@
     }
 
     /**
-     * Group events by spec ID
+     * Group events by spec ID. Branch rows are assigned in the order specs are
+     * first loaded, so loading older months doesn't reshuffle existing rows.
      */
     function groupEventsBySpec() {
-        const groups = {};
+        const groups = new Map();
 
         timelineData.forEach(event => {
             const specId = event.spec_id;
-            if (!groups[specId]) {
-                groups[specId] = [];
+            if (!groups.has(specId)) {
+                groups.set(specId, []);
+            }
+            groups.get(specId).push(event);
+
+            if (!branchIndexBySpec.has(specId)) {
+                branchIndexBySpec.set(specId, branchIndexBySpec.size);
             }
-            groups[specId].push(event);
         });
 
         return groups;
@@ -211,11 +279,12 @@
     function drawSpecFlow(g, specId, events, branchIndex) {
         const branchY = config.masterBranchY + (branchIndex + 1) * config.branchSpacing;
 
-        // Find spec creation event
+        // Find spec creation event; it may be in a month that isn't loaded yet,
+        // in which case the branch starts at the spec's oldest loaded event
         const specEvent = events.find(e => e.type === 'spec_created');
-        if (!specEvent) return;
+        const firstDate = specEvent ? specEvent.date : events.reduce((min, e) => e.date < min ? e.date : min, events[0].date);
 
-        const startX = xScale(new Date(specEvent.date));
+        const startX = xScale(new Date(firstDate));
 
         // Draw feature branch line
         const branchEndX = width; // Extend to end for now
@@ -240,7 +309,9 @@
             .attr('stroke-width', 2);
 
         // Draw spec node
-        drawSpecNode(g, specEvent, startX, branchY);
+        if (specEvent) {
+            drawSpecNode(g, specEvent, startX, branchY);
+        }
 
         // Draw commits
         events.filter(e => e.type === 'commit').forEach((commit, idx) => {
@@ -1,13 +1,26 @@
 /**
  * Dashboard Table Controller
- * Loads spec data from search-index.json and renders interactive sortable table
+ * The summary and spec table are rendered by build-specs.py; this script adds
+ * sorting and keeps only the rows in view in the page (virtual-list.js). Sort
+ * orders are precomputed in dashboard-stats.json, which is fetched on the
+ * first click, so sorting is a lookup.
  */
 
 (function() {
     'use strict';
 
-    let specsData = [];
-    let currentSort = { column: 'updated', ascending: false }; // Default: newest first
+    // Table rows are rendered by the build; each carries its index into the
+    // precomputed orderings of dashboard-stats.json
+    let orderingsPromise = null;
+    let currentSort = { column: 'updated', ascending: false }; // Rendered newest first
+
+    // Cells and spec ID of every row by row index, the row indexes in display
+    // order and whether that order is read back to front
+    const rowCells = [];
+    const rowSpecIds = [];
+    let rowOrder = [];
+    let reversed = false;
+    let table = null;
 
     /**
      * Initialize dashboard when DOM is ready
@@ -31,201 +44,101 @@
             mdContentInner.style.marginRight = '0';
         }
 
-        loadSpecsData();
-    }
-
-    /**
-     * Load specs from search-index.json
-     */
-    async function loadSpecsData() {
-        try {
-            const response = await fetch('../../assets/js/search-index.json');
-            const data = await response.json();
-            specsData = data.index || [];
-
-            renderTable();
-            attachEventListeners();
-        } catch (error) {
-            console.error('Failed to load specs data:', error);
-            document.getElementById('specs-table-body').innerHTML =
-                '<tr><td colspan="5" style="text-align:center;padding:2rem;">Failed to load specifications data</td></tr>';
-        }
+        virtualizeTable();
+        attachEventListeners();
     }
 
     /**
-     * Render table rows from specs data
+     * Take the rendered rows out of the page and show them through a virtual list
      */
-    function renderTable() {
+    function virtualizeTable() {
         const tbody = document.getElementById('specs-table-body');
-        if (!tbody) {
-            console.error('Table body not found!');
-            return;
-        }
-
-        // Sort data based on current sort settings
-        const sortedData = sortData([...specsData]);
+        if (!tbody || !window.NextPMVirtualList) return;
 
-        // Clear existing rows
-        tbody.innerHTML = '';
+        tbody.querySelectorAll('tr.spec-row').forEach(row => {
+            const index = Number(row.dataset.index);
+            rowCells[index] = row.innerHTML;
+            rowSpecIds[index] = row.dataset.specId;
+            rowOrder.push(index);
+        });
 
-        // Generate and append table rows
-        sortedData.forEach(spec => {
-            const row = createTableRow(spec);
-            tbody.appendChild(row);
+        table = new NextPMVirtualList({
+            container: tbody,
+            rowTag: 'tr',
+            columns: document.querySelectorAll('.specs-table thead th').length || 1,
+            renderRow: renderRow
         });
+        table.setCount(rowOrder.length);
     }
 
     /**
-     * Create HTML for a single table row
+     * Fill a recycled table row with the spec shown at position
      */
-    function createTableRow(spec) {
-        const statusBadge = getStatusBadge(spec.status);
-        const specUrl = spec.url || `engineering/specs/${spec.filename}`;
-        const lastUpdated = formatDate(spec.last_updated);
-
-        // Create row element
-        const row = document.createElement('tr');
+    function renderRow(row, position) {
+        const index = rowOrder[reversed ? rowOrder.length - 1 - position : position];
         row.className = 'spec-row';
-        row.setAttribute('data-spec-id', spec.id);
-
-        // Create cells (removed title column since it's duplicate of ID)
-        const cells = [
-            { class: 'spec-id', html: `<a href="${specUrl}">${spec.id}</a>` },
-            { class: 'spec-status', html: statusBadge },
-            { class: 'spec-commits', html: spec.git_commits || 0 },
-            { class: 'spec-prs', html: spec.pull_requests || 0 },
-            { class: 'spec-updated', html: lastUpdated }
-        ];
-
-        cells.forEach((cellData, index) => {
-            const td = document.createElement('td');
-            td.className = cellData.class;
-            td.innerHTML = cellData.html;
-            row.appendChild(td);
-
-            // Debug: log first row's cells
-            if (spec.id === specsData[0].id && index === 0) {
-                console.log('First spec first cell:', {
-                    class: cellData.class,
-                    html: cellData.html,
-                    cellCount: cells.length
-                });
-            }
-        });
-
-        return row;  // Return DOM element directly instead of outerHTML
+        row.dataset.index = index;
+        row.dataset.specId = rowSpecIds[index];
+        row.innerHTML = rowCells[index];
     }
 
     /**
-     * Get status badge HTML
+     * Load the precomputed row orderings (once, on first sort)
      */
-    function getStatusBadge(status) {
-        const badges = {
-            'draft': '<span class="spec-state-badge spec-state-draft">📋 Draft</span>',
-            'in-progress': '<span class="spec-state-badge spec-state-in-progress">🚧 In Progress</span>',
-            'completed': '<span class="spec-state-badge spec-state-completed">✅ Completed</span>',
-            'archived': '<span class="spec-state-badge spec-state-archived">📦 Archived</span>'
-        };
-        return badges[status] || badges['draft'];
+    function loadOrderings() {
+        if (!orderingsPromise) {
+            orderingsPromise = fetch('../../assets/js/dashboard-stats.json')
+                .then(response => {
+                    if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+                    return response.json();
+                })
+                .then(stats => stats.orderings)
+                .catch(error => {
+                    orderingsPromise = null;
+                    throw error;
+                });
+        }
+        return orderingsPromise;
     }
 
     /**
-     * Get priority badge HTML
+     * Show the rows in the current sort order
      */
-    function getPriorityBadge(priority) {
-        const badges = {
-            'low': '<span class="priority-badge priority-low">▽ Low</span>',
-            'medium': '<span class="priority-badge priority-medium">◇ Medium</span>',
-            'high': '<span class="priority-badge priority-high">△ High</span>',
-            'critical': '<span class="priority-badge priority-critical">⚠️ Critical</span>'
-        };
-        return badges[priority] || badges['medium'];
-    }
+    async function sortTable() {
+        const tbody = document.getElementById('specs-table-body');
+        if (!tbody) return;
 
-    /**
-     * Format date string
-     */
-    function formatDate(dateString) {
-        if (!dateString) return '-';
-        const date = new Date(dateString);
-        if (isNaN(date)) return dateString;
+        let orderings;
+        try {
+            orderings = await loadOrderings();
+        } catch (error) {
+            console.error('Failed to load dashboard orderings:', error);
+            return;
+        }
 
-        const now = new Date();
-        const diffMs = now - date;
-        const diffDays = Math.floor(diffMs / (1000 * 60 * 60 * 24));
+        const ordering = orderings[currentSort.column];
+        if (!ordering) return;
 
-        if (diffDays === 0) return 'Today';
-        if (diffDays === 1) return 'Yesterday';
-        if (diffDays < 7) return `${diffDays} days ago`;
+        // Descending reads the ascending ordering back to front instead of copying it
+        if (table) {
+            rowOrder = ordering;
+            reversed = !currentSort.ascending;
+            table.setCount(rowOrder.length);
+            return;
+        }
 
-        return date.toLocaleDateString('en-US', {
-            year: 'numeric',
-            month: 'short',
-            day: 'numeric'
+        const rowsByIndex = new Map();
+        tbody.querySelectorAll('tr.spec-row').forEach(row => {
+            rowsByIndex.set(Number(row.dataset.index), row);
         });
-    }
-
-    /**
-     * Sort specs data by column
-     */
-    function sortData(data) {
-        const column = currentSort.column;
-        const ascending = currentSort.ascending;
-
-        return data.sort((a, b) => {
-            let valA, valB;
-
-            switch(column) {
-                case 'id':
-                    valA = a.id || '';
-                    valB = b.id || '';
-                    break;
-                case 'title':
-                    valA = a.title || '';
-                    valB = b.title || '';
-                    break;
-                case 'status':
-                    valA = a.status || '';
-                    valB = b.status || '';
-                    break;
-                case 'priority':
-                    const priorityOrder = { 'low': 1, 'medium': 2, 'high': 3, 'critical': 4 };
-                    valA = priorityOrder[a.priority] || 0;
-                    valB = priorityOrder[b.priority] || 0;
-                    break;
-                case 'estimated_hours':
-                    valA = a.estimated_hours || 0;
-                    valB = b.estimated_hours || 0;
-                    break;
-                case 'actual_hours':
-                    valA = a.actual_hours || 0;
-                    valB = b.actual_hours || 0;
-                    break;
-                case 'commits':
-                    valA = a.git_commits || 0;
-                    valB = b.git_commits || 0;
-                    break;
-                case 'prs':
-                    valA = a.pull_requests || 0;
-                    valB = b.pull_requests || 0;
-                    break;
-                case 'updated':
-                    valA = new Date(a.last_updated || 0);
-                    valB = new Date(b.last_updated || 0);
-                    break;
-                case 'assignee':
-                    valA = a.assignee || '';
-                    valB = b.assignee || '';
-                    break;
-                default:
-                    return 0;
-            }
 
-            // Compare values
-            if (valA < valB) return ascending ? -1 : 1;
-            if (valA > valB) return ascending ? 1 : -1;
-            return 0;
+        const indexes = currentSort.ascending ? ordering : [...ordering].reverse();
+        const fragment = document.createDocumentFragment();
+        indexes.forEach(index => {
+            const row = rowsByIndex.get(index);
+            if (row) fragment.appendChild(row);
         });
+        tbody.appendChild(fragment);
     }
 
     /**
@@ -268,8 +181,8 @@
         // Update sort indicators
         updateSortIndicators();
 
-        // Re-render table
-        renderTable();
+        // Reorder the existing rows
+        sortTable();
     }
 
     /**
@@ -0,0 +1,191 @@
+/**
+ * NextPM Virtual List
+ * Renders only the rows of a long list or table that are in view, plus a
+ * buffer above and below, and reuses a fixed pool of row elements while
+ * scrolling. All rows must have the same height.
+ *
+ * The caller keeps the data and its order; the list only asks it to fill a
+ * row element for a position:
+ *
+ *     const list = new NextPMVirtualList({
+ *         container: tbody,   // the list owns this element's children
+ *         rowTag: 'tr',
+ *         columns: 5,         // colspan of the spacer rows in a table
+ *         renderRow: (row, position) => { row.innerHTML = ...; }
+ *     });
+ *     list.setCount(specs.length);   // and again after a re-sort
+ *
+ * Scrolling and re-sorting therefore cost the same whatever the row count.
+ * Used by dashboard.js (spec table) and nextpm-search.js (search results).
+ */
+
+(function() {
+    'use strict';
+
+    // The search page loads this through extra_javascript, the dashboard also as a hashed asset
+    if (window.NextPMVirtualList) return;
+
+    // Rows rendered beyond each edge of the viewport, so fast scrolling doesn't show gaps
+    const DEFAULT_OVERSCAN = 10;
+    // Used until a rendered row can be measured (e.g. while the list is hidden)
+    const FALLBACK_ROW_HEIGHT = 40;
+
+    /**
+     * The list element and its ancestors that clip it (overflow other than
+     * visible). Only those
+     * that also limit its height hide rows, which visibleRange() works out
+     * from their size; .specs-table-container, for example, only scrolls
+     * sideways and grows with the table.
+     */
+    function clippingAncestorsOf(element) {
+        const ancestors = [];
+        for (let node = element; node && node !== document.body; node = node.parentElement) {
+            if (getComputedStyle(node).overflowY !== 'visible') ancestors.push(node);
+        }
+        return ancestors;
+    }
+
+    class NextPMVirtualList {
+        constructor({ container, renderRow, rowTag = 'div', columns = 1, rowHeight = 0,
+                      overscan = DEFAULT_OVERSCAN }) {
+            this.container = container;
+            this.renderRow = renderRow;
+            this.rowTag = rowTag;
+            this.rowHeight = rowHeight;
+            this.fixedHeight = rowHeight > 0;
+            this.overscan = overscan;
+            this.clippers = clippingAncestorsOf(container);
+            this.count = 0;
+            this.pool = [];
+            this.frame = 0;
+
+            this.topSpacer = this.createSpacer(columns);
+            this.bottomSpacer = this.createSpacer(columns);
+            this.container.replaceChildren(this.topSpacer, this.bottomSpacer);
+
+            this.onScroll = () => {
+                if (!this.frame) {
+                    this.frame = requestAnimationFrame(() => {
+                        this.frame = 0;
+                        this.update();
+                    });
+                }
+            };
+            // Scroll events don't bubble; capturing them on the document sees the
+            // page and any ancestor scrolling
+            document.addEventListener('scroll', this.onScroll, { capture: true, passive: true });
+            window.addEventListener('resize', this.onScroll);
+        }
+
+        createSpacer(columns) {
+            const spacer = document.createElement(this.rowTag);
+            spacer.className = 'virtual-spacer';
+            spacer.setAttribute('aria-hidden', 'true');
+            spacer.style.height = '0px';
+            if (this.rowTag === 'tr') {
+                const cell = document.createElement('td');
+                cell.colSpan = columns;
+                cell.style.padding = '0';
+                cell.style.border = '0';
+                spacer.style.border = '0';
+                spacer.appendChild(cell);
+            }
+            return spacer;
+        }
+
+        /**
+         * Set the number of rows and re-render the visible ones (their data or order changed)
+         */
+        setCount(count) {
+            this.count = count;
+            // Rows in view stay in place and only get new content
+            this.pool.forEach(row => { row.stale = true; });
+            this.update();
+        }
+
+        measureRowHeight() {
+            const row = this.createRow();
+            this.renderRow(row, 0);
+            this.container.insertBefore(row, this.bottomSpacer);
+            // Stays 0 while the list is hidden; measured again on the next update
+            this.rowHeight = row.getBoundingClientRect().height;
+            row.remove();
+        }
+
+        createRow() {
+            const row = document.createElement(this.rowTag);
+            row.position = -1;
+            if (this.fixedHeight) {
+                row.style.height = `${this.rowHeight}px`;
+                row.style.boxSizing = 'border-box';
+                row.style.overflow = 'hidden';
+            }
+            return row;
+        }
+
+        /**
+         * Visible part of the list as [top, bottom] in pixels from its first row
+         */
+        visibleRange() {
+            // The top spacer starts where the first row does, also when the list itself scrolls
+            const listTop = this.topSpacer.getBoundingClientRect().top;
+            let top = 0;
+            let bottom = window.innerHeight;
+            this.clippers.forEach(node => {
+                const nodeTop = node.getBoundingClientRect().top + node.clientTop;
+                top = Math.max(top, nodeTop);
+                bottom = Math.min(bottom, nodeTop + node.clientHeight);
+            });
+            return [top - listTop, Math.max(top, bottom) - listTop];
+        }
+
+        update() {
+            if (this.count > 0 && !this.rowHeight) this.measureRowHeight();
+            const height = this.rowHeight || FALLBACK_ROW_HEIGHT;
+
+            const [top, bottom] = this.visibleRange();
+            const first = Math.max(0, Math.min(this.count, Math.floor(top / height) - this.overscan));
+            const last = Math.max(first, Math.min(this.count, Math.ceil(bottom / height) + this.overscan));
+
+            // Enough rows for the viewport; a resize that needs more starts a new pool
+            const size = Math.ceil(Math.max(0, bottom - top) / height) + 2 * this.overscan + 1;
+            if (size > this.pool.length) {
+                this.pool.forEach(row => row.remove());
+                this.pool = Array.from({ length: size }, () => this.createRow());
+            }
+
+            // Each position has a fixed row in the pool, so scrolling by k rows
+            // re-renders and moves k rows while the others stay in place
+            const rowAt = position => this.pool[position % this.pool.length];
+            this.pool.forEach(row => {
+                if (row.isConnected && (row.position < first || row.position >= last)) row.remove();
+            });
+
+            let previous = this.topSpacer;
+            for (let position = first; position < last; position++) {
+                const row = rowAt(position);
+                if (row.position !== position || row.stale) {
+                    this.renderRow(row, position);
+                    row.position = position;
+                    row.stale = false;
+                }
+                if (previous.nextSibling !== row) {
+                    this.container.insertBefore(row, previous.nextSibling);
+                }
+                previous = row;
+            }
+
+            this.topSpacer.style.height = `${first * height}px`;
+            this.bottomSpacer.style.height = `${(this.count - last) * height}px`;
+        }
+
+        destroy() {
+            document.removeEventListener('scroll', this.onScroll, { capture: true });
+            window.removeEventListener('resize', this.onScroll);
+            if (this.frame) cancelAnimationFrame(this.frame);
+            this.container.replaceChildren();
+        }
+    }
+
+    window.NextPMVirtualList = NextPMVirtualList;
+})();
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Benchmark the spec build on synthetic repositories.
+Usage: python mkdocs-scripts/benchmark-specs.py [--sizes 100 1000 10000] [--threshold 0.25]
+                                                [--baseline PATH] [--save-baseline] [--jobs N]
+                                                [--check-backends] [--no-baseline]
+       python mkdocs-scripts/benchmark-specs.py --check-repo PATH
+
+For every size a throwaway git repository is generated with that many specs
+(nested `metadata:` frontmatter like the real specs), commits that reference
+`#<spec_id>`, and feature branches merged through "Merge pull request #N from
+..." commits. The history is written with `git fast-import`, so even the 10k
+spec corpus takes seconds to create.
+
+build-specs.py then runs twice in each repository: a cold build with empty
+caches and a warm build with nothing changed. Per-stage times come from its
+--profile report. The results are written as JSON and compared with a
+baseline from an earlier run; the benchmark fails when a stage got slower
+than the baseline by more than the threshold.
+
+The baseline defaults to mkdocs-scripts/benchmark-baseline.json, so it can be
+committed and the check run on a fresh clone. None is committed yet: timings
+only compare on similar hardware, so record it with --save-baseline on the
+machine that runs the check (e.g. the CI runner) and commit it, or point
+--baseline at another file. Without a baseline for the benchmarked sizes the
+run fails (exit status 2) unless --no-baseline skips the comparison.
+
+With --check-backends every repository is also read with both git history
+backends (git_history.HISTORY_BACKENDS), and the run fails unless they agree
+on every commit and on the commits, PRs and branches of every spec.
+--check-repo runs only that comparison, on an existing repository (CI runs it
+on its own clone, whose history comes in packfiles with deltas).
+"""
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+BENCHMARK_DIR = Path('.cache/nextpm/benchmark')
+# Committed, unlike the results and synthetic repositories under BENCHMARK_DIR
+BASELINE_PATH = Path('mkdocs-scripts/benchmark-baseline.json')
+RESULTS_PATH = BENCHMARK_DIR / 'results.json'
+RESULTS_VERSION = 1
+
+# A stage regresses when it is this much slower than the baseline (0.25 = 25%)...
+DEFAULT_THRESHOLD = 0.25
+# ...and at least this many seconds slower, so timer noise on tiny stages is ignored
+MIN_REGRESSION_SECONDS = 0.05
+
+# Files from this checkout that the build needs inside a synthetic repository
+SCAFFOLD_FILES = [
+    'mkdocs.yml',
+    'mkdocs-scripts/*.py',
+    'mkdocs-scripts/*.yml',
+    'mkdocs-docs/assets/js/*.js',
+    'mkdocs-docs/assets/js/vendor/*.js',
+    'mkdocs-docs/assets/css/*.css',
+]
+
+# Every third spec is implemented on a feature branch and merged through a PR
+PR_EVERY = 3
+# Feature branches left in place (the rest are deleted after merging, as on GitHub)
+OPEN_BRANCHES = 10
+# Average time between synthetic commits, so the newest ones count as recent activity
+COMMIT_INTERVAL = timedelta(minutes=20)
+
+STATUSES = ['draft', 'review', 'approved', 'in-progress', 'completed']
+PRIORITIES = ['low', 'medium', 'high']
+CATEGORIES = ['nextpm-feature', 'infrastructure', 'documentation', 'workflow']
+AUTHORS = [('Kang', 'kang@example.com'), ('Avery', 'avery@example.com'),
+           ('Jordan', 'jordan@example.com'), ('Sam', 'sam@example.com')]
+DEMONSTRATES = ['spec-driven-development', 'ai-assistance', 'visual-timeline', 'state-management',
+                'data-visualization', 'git-workflow-visualization', 'interactive-tables', 'automation']
+WORDS = ('spec build dashboard timeline commit branch merge review status priority search index '
+         'page section render cache history graph activity workflow metadata frontmatter template '
+         'navigation deploy azure static site markdown link badge table filter sort query token '
+         'shard manifest asset hash compress worker thread process profile stage pipeline output '
+         'feature implement design decision acceptance criteria risk estimate owner milestone').split()
+
+
+def make_spec(spec_id, title, date, rng, related):
+    """Render one synthetic spec roughly the size and shape of the real ones."""
+    author = rng.choice(AUTHORS)[0]
+    demonstrates = rng.sample(DEMONSTRATES, rng.randint(1, 4))
+    lines = [
+        '---',
+        'metadata:',
+        f'  spec_id: "{spec_id}"',
+        f'  title: "{title}"',
+        f'  status: "{rng.choice(STATUSES)}"',
+        f'  created_date: "{date:%Y-%m-%d}"',
+        f'  updated_date: "{date:%Y-%m-%d}"',
+        '  version: "1.0"',
+        f'  author: "{author}"',
+        f'  priority: "{rng.choice(PRIORITIES)}"',
+        f'  category: "{rng.choice(CATEGORIES)}"',
+        f'  estimated_hours: {rng.randint(2, 40)}',
+        f'  actual_hours: {rng.randint(0, 40)}',
+        '  demonstrates:',
+    ]
+    lines += [f'    - "{item}"' for item in demonstrates]
+    lines += ['  related_specs:'] + [f'    - "{item}"' for item in related]
+    lines += [
+        '---',
+        '',
+        f'# {spec_id}',
+        '',
+        f'**Date:** {date:%Y-%m-%d}',
+        '**Version:** 1.0',
+        '',
+    ]
+    if related:
+        lines += [f'> **Related:** See [{related[0]}]({related[0]}.md) and '
+                  '[the AI-native guide](../../AI-NATIVE.md).', '']
+
+    def paragraph():
+        return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 90))).capitalize() + '.'
+
+    for section in ['Overview', 'Problem', 'Solution', 'Implementation', 'Acceptance Criteria']:
+        lines += [f'## {section}', '', paragraph(), '']
+        for _ in range(rng.randint(1, 3)):
+            lines += [f'### {rng.choice(WORDS).title()} {rng.choice(WORDS)}', '', paragraph(), '']
+        lines += [f'- **{rng.choice(WORDS).title()}**: {paragraph()[:80]}' for _ in range(rng.randint(2, 5))]
+        lines.append('')
+
+    lines += ['```python', f'def build_{spec_id.replace("-", "_")}():', '    return True', '```', '',
+              '## References', '',
+              f'- [ADR](../meta/adr/{rng.randint(1, 9):03d}-decision.md)', '']
+    return '\n'.join(lines)
+
+
+class FastImport:
+    """Minimal writer for a `git fast-import` stream."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.next_mark = 1
+
+    def _data(self, payload):
+        payload = payload.encode('utf-8')
+        self.stream.write(b'data %d\n' % len(payload) + payload + b'\n')
+
+    def commit(self, ref, author, when, message, parents=(), files=None):
+        """Write a commit and return its mark. parents are marks; the first one is 'from'."""
+        mark = self.next_mark
+        self.next_mark += 1
+        name, email = author
+        stamp = f'{int(when.timestamp())} +0000'
+        self.stream.write(f'commit {ref}\nmark :{mark}\n'
+                          f'author {name} <{email}> {stamp}\ncommitter {name} <{email}> {stamp}\n'.encode('utf-8'))
+        self._data(message)
+        if parents:
+            self.stream.write(f'from :{parents[0]}\n'.encode('utf-8'))
+            for parent in parents[1:]:
+                self.stream.write(f'merge :{parent}\n'.encode('utf-8'))
+        for path, content in (files or {}).items():
+            self.stream.write(f'M 100644 inline {path}\n'.encode('utf-8'))
+            self._data(content)
+        self.stream.write(b'\n')
+        return mark
+
+
+def git(repo, *args):
+    subprocess.run(['git', *args], cwd=repo, check=True, stdout=subprocess.DEVNULL)
+
+
+def generate_repo(repo, size):
+    """Create a git repository with `size` synthetic specs and a matching history."""
+    rng = random.Random(size)
+    if repo.exists():
+        shutil.rmtree(repo)
+    repo.mkdir(parents=True)
+
+    git(repo, 'init', '-q')
+    git(repo, 'symbolic-ref', 'HEAD', 'refs/heads/master')
+
+    commit_count = size * 2 + (size // PR_EVERY) * 2
+    when = datetime.now() - COMMIT_INTERVAL * commit_count
+    first_day = datetime(2024, 1, 1)
+
+    process = subprocess.Popen(['git', 'fast-import', '--quiet'], cwd=repo, stdin=subprocess.PIPE)
+    writer = FastImport(process.stdin)
+    master = None
+    spec_ids = []
+    pr_number = 0
+    temporary_refs = set()
+
+    def tick():
+        nonlocal when
+        when += COMMIT_INTERVAL
+        return when
+
+    for number in range(size):
+        date = first_day + timedelta(days=number // 4)
+        spec_id = f'{date:%Y%m%d}-feature-{number:05d}'
+        title = f'Feature {number}: {" ".join(rng.sample(WORDS, 3))}'
+        related = rng.sample(spec_ids[-20:], min(len(spec_ids[-20:]), 2))
+        spec_ids.append(spec_id)
+        author = rng.choice(AUTHORS)
+        spec_path = f'engineering/specs/{spec_id}.md'
+
+        master = writer.commit('refs/heads/master', author, tick(), f'Add spec #{spec_id}: {title}\n',
+                               parents=[master] if master else [],
+                               files={spec_path: make_spec(spec_id, title, date, rng, related)})
+
+        if number % PR_EVERY == 0:
+            pr_number += 1
+            open_branch = number >= size - OPEN_BRANCHES * PR_EVERY
+            branch = f'dev/{spec_id}' if open_branch else 'benchmark-merged'
+            ref = f'refs/heads/{branch}'
+            if not open_branch:
+                temporary_refs.add(ref)
+
+            feature = writer.commit(ref, author, tick(), f'Implement {title} #{spec_id}\n',
+                                    parents=[master],
+                                    files={f'src/feature_{number:05d}.py': f'# {spec_id}\nVALUE = {number}\n'})
+            # PRs reference either the full spec ID or just its date part
+            reference = spec_id if pr_number % 2 else spec_id.split('-')[0]
+            reviewer = rng.choice(AUTHORS)
+            master = writer.commit('refs/heads/master', author, tick(),
+                                   f'Merge pull request #{pr_number} from kangxh75/{branch}\n\n'
+                                   f'{title}\n\nImplements #{reference}\n\n'
+                                   f'Co-authored-by: {reviewer[0]} <{reviewer[1]}>\n',
+                                   parents=[master, feature])
+
+        if number % 7 == 0:
+            master = writer.commit('refs/heads/master', author, tick(),
+                                   f'Update status for #{spec_id}\n', parents=[master],
+                                   files={f'notes/{spec_id}.txt': f'{spec_id} updated\n'})
+
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+
+    for ref in temporary_refs:
+        git(repo, 'update-ref', '-d', ref)
+    git(repo, 'reset', '-q', '--hard', 'master')
+
+    for pattern in SCAFFOLD_FILES:
+        for source in Path('.').glob(pattern):
+            target = repo / source
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+
+    return writer.next_mark - 1
+
+
+def run_build(repo, jobs):
+    """Run build-specs.py in repo with --profile and return (wall seconds, stage times)."""
+    profile_path = repo / 'build-profile.json'
+    log_path = repo / 'build.log'
+    started = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        result = subprocess.run([sys.executable, 'mkdocs-scripts/build-specs.py', '--profile', str(profile_path),
+                                 '--jobs', str(jobs)], cwd=repo, stdout=log, stderr=subprocess.STDOUT)
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        tail = log_path.read_text(encoding='utf-8').splitlines()[-20:]
+        raise RuntimeError("build-specs.py failed:\n" + '\n'.join(tail))
+
+    with open(profile_path, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+    stages = {stage['name']: stage['wall_seconds'] for stage in profile['stages']}
+    stages['total'] = profile['total']['wall_seconds']
+    return wall, stages, profile['process_peak_rss_bytes']
+
+
+def read_history(repo, backend_name):
+    """Scan repo with one history backend; return (seconds, commits, index, incremental scan)."""
+    import git_history
+
+    started = time.perf_counter()
+    backend = git_history.HISTORY_BACKENDS[backend_name](cwd=repo)
+    try:
+        head = backend.resolve_head()
+        commits = backend.scan(head)
+        git_history.add_changed_files(backend, commits)
+        index = git_history.GitHistoryIndex(commits, backend.list_branches(), now=datetime(2024, 1, 1))
+        # The same range a warm build scans after the history grew
+        incremental = backend.scan(head, exclude=commits[len(commits) // 2]['hash'])
+    finally:
+        backend.close()
+    return time.perf_counter() - started, commits, index, incremental
+
+
+def check_backends(repo):
+    """Fail unless every history backend reads repo exactly like the git CLI one."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import git_history
+
+    seconds, expected_commits, expected, expected_incremental = read_history(repo, 'cli')
+    print(f"  cli history backend: {seconds:.2f}s")
+    # Spec file names and every key a commit references, so real repositories are fully covered
+    spec_ids = sorted({path.stem for path in (repo / 'engineering/specs').glob('*.md')}
+                      | expected.commits_by_key.keys() | expected.prs_by_key.keys())
+
+    for name in sorted(git_history.HISTORY_BACKENDS):
+        if name == 'cli':
+            continue
+        seconds, commits, index, incremental = read_history(repo, name)
+        print(f"  {name} history backend: {seconds:.2f}s")
+
+        mismatches = []
+        if commits != expected_commits:
+            mismatches.append('commits')
+        if incremental != expected_incremental:
+            mismatches.append('incremental scan')
+        if index.branches != expected.branches:
+            mismatches.append('branches')
+        for spec_id in spec_ids:
+            for lookup in ('commits_for', 'pull_requests_for', 'branches_for', 'recent_activity_for'):
+                if getattr(index, lookup)(spec_id) != getattr(expected, lookup)(spec_id):
+                    mismatches.append(f'{lookup}({spec_id})')
+        if mismatches:
+            raise RuntimeError(f"{name} history backend differs from cli: {', '.join(mismatches[:10])}")
+
+
+def benchmark_size(size, jobs, repeat, keep, backends=False):
+    """Generate the corpus for one size and time a cold and a warm build."""
+    repo = (BENCHMARK_DIR / f'repo-{size}').resolve()
+    print(f"\n{size} specs: generating repository...")
+    started = time.perf_counter()
+    commits = generate_repo(repo, size)
+    print(f"  {commits} commits in {time.perf_counter() - started:.1f}s")
+
+    if backends:
+        check_backends(repo)
+
+    result = {'commits': commits}
+    for attempt in range(repeat):
+        shutil.rmtree(repo / '.cache', ignore_errors=True)
+        for mode in ('cold', 'warm'):
+            wall, stages, peak_rss = run_build(repo, jobs)
+            print(f"  {mode} build {attempt + 1}/{repeat}: {wall:.2f}s")
+            best = result.setdefault(mode, {'wall_seconds': wall, 'stages': stages, 'peak_rss_bytes': peak_rss})
+            # Keep the fastest run of each stage to damp noise
+            best['wall_seconds'] = min(best['wall_seconds'], wall)
+            best['stages'] = {name: min(seconds, best['stages'].get(name, seconds))
+                              for name, seconds in stages.items()}
+
+    if not keep:
+        shutil.rmtree(repo)
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Return the stages that got slower than the baseline by more than threshold."""
+    regressions = []
+    for size, current in results['sizes'].items():
+        previous = baseline.get('sizes', {}).get(size)
+        if not previous:
+            continue
+        for mode in ('cold', 'warm'):
+            for stage, seconds in current[mode]['stages'].items():
+                base = previous.get(mode, {}).get('stages', {}).get(stage)
+                if base is None:
+                    continue
+                if seconds > base * (1 + threshold) and seconds - base > MIN_REGRESSION_SECONDS:
+                    regressions.append((size, mode, stage, base, seconds))
+    return regressions
+
+
+def print_results(results, baseline):
+    stages = []
+    for current in results['sizes'].values():
+        for mode in ('cold', 'warm'):
+            stages += [name for name in current[mode]['stages'] if name not in stages]
+
+    sizes = list(results['sizes'])
+    header = f"{'stage':<20}" + ''.join(f"{f'{size} {mode}':>14}" for size in sizes for mode in ('cold', 'warm'))
+    print("\nStage wall time (seconds, change vs. baseline)")
+    print(header)
+    for stage in stages:
+        cells = []
+        for size in sizes:
+            for mode in ('cold', 'warm'):
+                seconds = results['sizes'][size][mode]['stages'].get(stage)
+                base = baseline.get('sizes', {}).get(size, {}).get(mode, {}).get('stages', {}).get(stage)
+                if seconds is None:
+                    cells.append(f"{'-':>14}")
+                elif base:
+                    cells.append(f"{f'{seconds:.3f} {(seconds - base) / base:+.0%}':>14}")
+                else:
+                    cells.append(f"{seconds:>14.3f}")
+        print(f"{stage:<20}" + ''.join(cells))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark build-specs.py on synthetic spec repositories.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="number of specs per synthetic repository (default: 100 1000 10000)")
+    parser.add_argument('--jobs', type=int, default=1, help="--jobs passed to build-specs.py")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="build each repository this many times and keep the fastest stage times")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH,
+                        help=f"baseline results to compare against (default: {BASELINE_PATH})")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store this run's results as the new baseline")
+    parser.add_argument('--no-baseline', action='store_true',
+                        help="don't compare with a baseline (otherwise a missing baseline fails the run)")
+    parser.add_argument('--output', type=Path, default=RESULTS_PATH,
+                        help=f"where to write this run's results (default: {RESULTS_PATH})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown per stage before the run fails (default: 0.25 = 25%%)")
+    parser.add_argument('--keep', action='store_true',
+                        help=f"keep the generated repositories under {BENCHMARK_DIR}")
+    parser.add_argument('--check-backends', action='store_true',
+                        help="fail unless the git history backends agree on every generated repository")
+    parser.add_argument('--check-repo', type=Path, metavar='PATH',
+                        help="only check that the git history backends agree on the repository at PATH")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.check_repo:
+        repo = args.check_repo.resolve()
+        print(f"Checking the git history backends on {repo}")
+        try:
+            check_backends(repo)
+        except (OSError, RuntimeError, subprocess.CalledProcessError) as e:
+            print(f"Backend check failed: {e}")
+            sys.exit(1)
+        print("All history backends agree")
+        return
+
+    # Change to project root
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+    os.chdir(project_root)
+
+    results = {
+        'version': RESULTS_VERSION,
+        'generated': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'jobs': args.jobs,
+        'sizes': {}
+    }
+
+    try:
+        for size in args.sizes:
+            results['sizes'][str(size)] = benchmark_size(size, args.jobs, max(args.repeat, 1), args.keep,
+                                                           args.check_backends)
+    except (OSError, RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"Benchmark failed: {e}")
+        sys.exit(1)
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(args.output, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if args.no_baseline:
+        print("Skipped the comparison with the baseline (--no-baseline)")
+        return
+    if not set(results['sizes']) & set(baseline.get('sizes', {})):
+        print(f"Error: No baseline for these sizes in {args.baseline} to compare against "
+              f"(run with --save-baseline to create one, or --no-baseline to skip the comparison)")
+        sys.exit(2)
+    if baseline.get('platform') != results['platform']:
+        print(f"Warning: The baseline was recorded on {baseline.get('platform')}, timings may not compare")
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) slower than the baseline by more than {args.threshold:.0%}:")
+        for size, mode, stage, base, seconds in regressions:
+            print(f"  {size} specs, {mode} build, {stage}: {base:.3f}s -> {seconds:.3f}s")
+        sys.exit(1)
+    print(f"\nNo stage slower than the baseline by more than {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
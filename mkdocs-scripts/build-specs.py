@@ -7,35 +7,142 @@ This script:
 2. Parses YAML frontmatter for spec state management
 3. Copies specs to mkdocs-docs/engineering/specs/ with enhanced processing
 4. Injects visual timeline data and animations
-5. Auto-generates navigation entries in mkdocs.yml with state indicators
+5. Auto-generates navigation entries with state indicators (added to the MkDocs nav by spec_hooks.py)
 6. Creates interactive dashboard with spec statistics
 7. Preserves existing non-spec navigation structure
 """
 
+import argparse
+import gzip
+import hashlib
+import heapq
+import html
+import itertools
 import os
 import shutil
 import re
+import sys
 from pathlib import Path
 import yaml
 import codecs
 import json
-from datetime import datetime
-from collections import defaultdict
-
-def extract_title_from_spec(spec_path):
-    """Extract the title from a spec file's first H1 heading."""
-    try:
-        with open(spec_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Look for first H1 heading
-            match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-            if match:
-                return match.group(1).strip()
-    except Exception as e:
-        print(f"Warning: Could not extract title from {spec_path}: {e}")
-
-    # Fallback: generate title from filename
-    filename = Path(spec_path).stem
+import threading
+from datetime import date, datetime, timedelta
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, wraps
+
+import build_profile
+import git_history
+import spec_frontmatter
+import stage_scheduler
+
+try:
+    import brotli
+except ImportError:  # In requirements.txt; without it no .br siblings are written (with a warning)
+    brotli = None
+
+try:  # Both come with mkdocs-minify-plugin; without them assets are published unminified
+    import csscompressor
+    import jsmin
+except ImportError:
+    csscompressor = jsmin = None
+
+LINK_REWRITES_PATH = Path(__file__).parent / 'link-rewrites.yml'
+PARENT_DIR_PATTERN = re.compile(r'^(?:\.\./)+')
+
+BUILD_CACHE_DIR = Path('.cache/nextpm')
+BUILD_MANIFEST_PATH = BUILD_CACHE_DIR / 'build-manifest.json'
+# Nav section that lists the spec pages (see insert_specs_nav)
+SPECS_NAV_TITLE = 'Specs'
+SPECS_INDEX_PAGE = 'engineering/specs/index.md'
+
+# Parsed and validated frontmatter by text hash
+FRONTMATTER_CACHE_PATH = BUILD_CACHE_DIR / 'frontmatter.json'
+# Rendered HTML fragments (timelines, timeline items, badges) by input hash
+FRAGMENT_CACHE_PATH = BUILD_CACHE_DIR / 'html-fragments.json'
+# Least recently used fragments beyond this are dropped when the cache is saved
+FRAGMENT_CACHE_LIMIT = 50000
+# Fingerprints and outputs of the build stages, so unchanged stages are skipped
+STAGE_STATE_PATH = BUILD_CACHE_DIR / 'stages.json'
+
+# Generated assets with content-hashed names (served with immutable cache headers)
+ASSET_BUILD_DIR = Path('mkdocs-docs/assets/build')
+
+# The activity timeline is split into one NDJSON file per month, listed by a small manifest
+TIMELINE_MANIFEST_PATH = Path('mkdocs-docs/assets/js/activity-timeline.json')
+TIMELINE_CHUNK_DIR = ASSET_BUILD_DIR / 'timeline'
+
+# Precomputed aggregates and table rows for dashboard.js
+DASHBOARD_STATS_PATH = Path('mkdocs-docs/assets/js/dashboard-stats.json')
+DASHBOARD_COLUMNS = ['id', 'url', 'status', 'priority', 'assignee', 'estimated_hours', 'actual_hours',
+                     'commits', 'prs', 'updated']
+PRIORITY_ORDER = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+# Sort keys of the sortable dashboard columns; dashboard.js reverses them for descending order
+DASHBOARD_SORT_KEYS = {
+    'id': lambda row: row['id'],
+    'status': lambda row: row['status'],
+    'priority': lambda row: PRIORITY_ORDER.get(row['priority'], 0),
+    'assignee': lambda row: row['assignee'],
+    'estimated_hours': lambda row: row['estimated_hours'],
+    'actual_hours': lambda row: row['actual_hours'],
+    'commits': lambda row: row['commits'],
+    'prs': lambda row: row['prs'],
+    'updated': lambda row: row['updated'],
+}
+CLOSED_STATUSES = {'completed', 'archived'}
+# Number of most recent weeks shown in the dashboard velocity table
+DASHBOARD_VELOCITY_WEEKS = 8
+
+# D3 modules used by the activity graph, bundled by vendor-d3.py; the CDN build
+# is only linked when the bundle hasn't been generated
+D3_VENDOR_PATH = Path('mkdocs-docs/assets/js/vendor/d3.min.js')
+# Pinned tarball hashes vendor-d3.py needs before it can bundle anything
+D3_INTEGRITY_PATH = Path('mkdocs-scripts/d3-integrity.json')
+D3_CDN_URL = 'https://d3js.org/d3.v7.min.js'
+
+# Dashboard data and loaders published under ASSET_BUILD_DIR. Each entry is
+# (source file, path the dashboard and loaders reference it by); data files come
+# before the loaders that fetch them so the loaders can be rewritten to the
+# hashed data URLs.
+PUBLISHED_ASSETS = [
+    (DASHBOARD_STATS_PATH, 'assets/js/dashboard-stats.json'),
+    (TIMELINE_MANIFEST_PATH, 'assets/js/activity-timeline.json'),
+    (Path('mkdocs-docs/assets/js/virtual-list.js'), 'assets/js/virtual-list.js'),
+    (Path('mkdocs-docs/assets/js/dashboard.js'), 'assets/js/dashboard.js'),
+    (Path('mkdocs-docs/assets/js/activity-graph.js'), 'assets/js/activity-graph.js'),
+    (D3_VENDOR_PATH, 'assets/js/vendor/d3.min.js'),
+    (Path('mkdocs-docs/assets/css/dashboard.css'), 'assets/css/dashboard.css'),
+]
+ASSET_HASH_LENGTH = 10
+
+# One timestamp per build, so specs processed in parallel don't get different times
+BUILD_TIMESTAMP = datetime.now().isoformat()
+
+H1_PATTERN = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+
+# Remove markdown formatting for better search
+PLAIN_TEXT_RULES = [
+    (re.compile(r'#+ '), ''),  # Remove headers
+    (re.compile(r'\*\*(.*?)\*\*'), r'\1'),  # Bold
+    (re.compile(r'\*(.*?)\*'), r'\1'),  # Italic
+    (re.compile(r'\[(.*?)\]\(.*?\)'), r'\1'),  # Links
+]
+
+# Inverted search index: terms are runs of letters/digits, weighted by the field they occur in
+SEARCH_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+SEARCH_FIELD_WEIGHTS = {'title': 10, 'demonstrates': 3, 'category': 3, 'body': 1}
+SEARCH_SHARD_TARGET_BYTES = 64 * 1024
+SEARCH_SUMMARY_LENGTH = 200
+# index.json keeps a fixed name; the shards it lists are content-hashed and precompressed
+SEARCH_INDEX_DIR = Path('mkdocs-static/js/search')
+SEARCH_SHARD_DIR = ASSET_BUILD_DIR / 'search'
+
+def get_title_from_filename(filename):
+    """Generate a readable title from a spec filename (used when a spec has no H1)."""
+    filename = Path(filename).stem
     # Handle special case for 0.00-project-start
     if filename == '0.00-project-start':
         return '0.00 Project Start'
@@ -84,31 +191,92 @@ def get_spec_sort_key(filename):
     # Fallback: use filename as-is
     return stem
 
-def parse_spec_frontmatter(spec_path):
-    """Parse YAML frontmatter from a spec file."""
+FRONTMATTER_PARSER = spec_frontmatter.FrontmatterParser()
+
+def load_frontmatter_cache():
+    """Reuse the frontmatter parsed by earlier builds."""
     try:
-        with open(spec_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Check if content starts with YAML frontmatter
-        if content.startswith('---\n'):
-            # Find the closing ---
-            end_marker = content.find('\n---\n', 4)
-            if end_marker != -1:
-                yaml_content = content[4:end_marker]
-                markdown_content = content[end_marker + 5:]
-                try:
-                    frontmatter = yaml.safe_load(yaml_content) or {}
-                    return frontmatter, markdown_content
-                except yaml.YAMLError as e:
-                    print(f"Warning: YAML parsing error in {spec_path}: {e}")
-
-        # No frontmatter found, return empty dict and full content
-        return {}, content
-    except Exception as e:
-        print(f"Warning: Could not parse frontmatter from {spec_path}: {e}")
-        with open(spec_path, 'r', encoding='utf-8') as f:
-            return {}, f.read()
+        with open(FRONTMATTER_CACHE_PATH, 'rb') as f:
+            data = f.read()
+        build_profile.record_read(len(data))
+        FRONTMATTER_PARSER.load(json.loads(data))
+    except (OSError, ValueError):
+        pass
+
+def save_frontmatter_cache():
+    """Store the frontmatter parsed for this build's specs."""
+    write_if_changed(FRONTMATTER_CACHE_PATH, json.dumps(FRONTMATTER_PARSER.dump(), separators=(',', ':')))
+
+class SpecDocument:
+    """A spec file read once and shared by every build stage.
+
+    The file is read and split into frontmatter and body on load. The parsed
+    frontmatter, title, headings and plain text are derived on first use and
+    cached, so no stage needs to open the file or re-run the same regexes.
+    Invalid frontmatter raises spec_frontmatter.FrontmatterError.
+    """
+
+    def __init__(self, path, raw):
+        self.path = Path(path)
+        self.filename = self.path.name
+        self.raw = raw
+        self.frontmatter_text, self.body = spec_frontmatter.split_frontmatter(raw, self.path)
+
+    @cached_property
+    def frontmatter(self):
+        return FRONTMATTER_PARSER.parse(self.frontmatter_text, self.path)
+
+    @cached_property
+    def source_hash(self):
+        return hash_content(self.raw)
+
+    @cached_property
+    def title(self):
+        # Look for first H1 heading
+        match = H1_PATTERN.search(self.body)
+        if match:
+            return match.group(1).strip()
+        return get_title_from_filename(self.filename)
+
+    @cached_property
+    def headings(self):
+        """(level, text) for every markdown heading outside fenced code blocks."""
+        headings = []
+        in_fence = False
+        for line in self.body.split('\n'):
+            if FENCE_PATTERN.match(line):
+                in_fence = not in_fence
+                continue
+            match = None if in_fence else HEADING_PATTERN.match(line)
+            if match:
+                headings.append((len(match.group(1)), match.group(2)))
+        return headings
+
+    @cached_property
+    def plain_text(self):
+        """Body text with markdown formatting removed, for search indexing."""
+        text = self.body
+        for pattern, replacement in PLAIN_TEXT_RULES:
+            text = pattern.sub(replacement, text)
+        return text
+
+def load_spec_document(spec_path):
+    """Read a spec file once into a SpecDocument."""
+    with open(spec_path, 'rb') as f:
+        data = f.read()
+    build_profile.record_read(len(data))
+    return SpecDocument(spec_path, data.decode('utf-8'))
+
+def get_spec_id(filename):
+    """Derive the spec ID from a spec filename."""
+    stem = Path(filename).stem
+    if stem == '0.00-project-start':
+        return '0.00'
+
+    match = re.match(r'^(\d{4}-\d{2}-\d{2}-\d{2})', stem)
+    if match:
+        return match.group(1)
+    return stem
 
 def process_spec_metadata(frontmatter, filename):
     """Process and enhance spec metadata."""
@@ -131,22 +299,78 @@ def process_spec_metadata(frontmatter, filename):
             metadata[key] = default_value
 
     # Extract spec ID from filename
-    stem = Path(filename).stem
-    if stem != '0.00-project-start':
-        match = re.match(r'^(\d{4}-\d{2}-\d{2}-\d{2})', stem)
-        if match:
-            metadata['spec_id'] = match.group(1)
-        else:
-            metadata['spec_id'] = stem
-    else:
-        metadata['spec_id'] = '0.00'
+    metadata['spec_id'] = get_spec_id(filename)
 
     # Add computed fields
     metadata['filename'] = filename
-    metadata['last_updated'] = datetime.now().isoformat()
+    metadata['last_updated'] = BUILD_TIMESTAMP
 
     return metadata
 
+class FragmentCache:
+    """Memoized HTML fragments, keyed by the renderer and a hash of its arguments.
+
+    A fragment is rendered once per distinct input: a commit timeline that
+    is rendered for both a spec page and its dev workflow summary, or a
+    commit that shows up in several timelines, is reused instead of being
+    built again. The cache is kept between builds, so when a spec gains a
+    commit only the new timeline item is rendered.
+    """
+
+    def __init__(self):
+        self.fragments = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def render(self, renderer, args, kwargs):
+        key = f'{renderer.__name__}:{hash_content([args, kwargs])}'
+        with self._lock:
+            fragment = self.fragments.get(key)
+            if fragment is not None:
+                self.fragments.move_to_end(key)
+                self.hits += 1
+                return fragment
+
+        fragment = renderer(*args, **kwargs)
+        with self._lock:
+            self.fragments[key] = fragment
+            self.misses += 1
+        return fragment
+
+    def load(self, generator):
+        """Load the fragments of earlier builds, unless the generator changed since."""
+        try:
+            with open(FRAGMENT_CACHE_PATH, 'rb') as f:
+                data = f.read()
+            build_profile.record_read(len(data))
+            cache = json.loads(data)
+        except (OSError, ValueError):
+            return
+        if cache.get('generator') == generator:
+            self.fragments = OrderedDict(cache.get('fragments', []))
+
+    def save(self, generator):
+        """Store the most recently used fragments for the next build."""
+        with self._lock:
+            while len(self.fragments) > FRAGMENT_CACHE_LIMIT:
+                self.fragments.popitem(last=False)
+            fragments = list(self.fragments.items())
+        write_if_changed(FRAGMENT_CACHE_PATH, json.dumps({
+            'generator': generator,
+            'fragments': fragments
+        }, separators=(',', ':')))
+
+FRAGMENT_CACHE = FragmentCache()
+
+def cached_fragment(renderer):
+    """Serve a renderer's output from FRAGMENT_CACHE; its arguments must be JSON data."""
+    @wraps(renderer)
+    def render(*args, **kwargs):
+        return FRAGMENT_CACHE.render(renderer, args, kwargs)
+    return render
+
+# Not a cached fragment: one short f-string renders faster than its cache key hashes
 def generate_state_badge_html(status, priority='medium'):
     """Generate HTML for animated state badge."""
     status_colors = {
@@ -193,6 +417,7 @@ def inject_timeline_data(content, metadata):
     # Generate commit timeline if available
     git_data = metadata.get('git_commits', {})
     commit_timeline = generate_commit_timeline_html(git_data)
+    timeline_attr = json.dumps(timeline_data).replace('"', '&quot;')
 
     # Inject at the beginning of content after the first header
     lines = content.split('\n')
@@ -204,7 +429,7 @@ def inject_timeline_data(content, metadata):
             lines.insert(i + 1, '')
             lines.insert(i + 2, state_badge)
             lines.insert(i + 3, '')
-            lines.insert(i + 4, f'<div class="spec-timeline" data-timeline="{json.dumps(timeline_data).replace('"', "&quot;")}"></div>')
+            lines.insert(i + 4, f'<div class="spec-timeline" data-timeline="{timeline_attr}"></div>')
             lines.insert(i + 5, '')
             if git_data.get('commits') or git_data.get('pull_requests'):
                 lines.insert(i + 6, commit_timeline)
@@ -213,63 +438,26 @@ def inject_timeline_data(content, metadata):
 
     return '\n'.join(lines)
 
-def collect_git_data(spec_id):
+def build_git_index(use_cache=True, backend='cli'):
+    """Scan the git history once and index it by spec reference for every later lookup."""
+    git_index = git_history.build_git_index(use_cache=use_cache, backend=backend)
+    print(f"Indexed {len(git_index.commits)} commits by {len(git_index.commits_by_key)} spec references")
+    return git_index
+
+def collect_git_data(spec_id, git_index):
     """Collect comprehensive git data for spec-commit linking."""
     try:
-        import subprocess
-
         git_data = {
-            'commits': [],
-            'branches': [],
+            'commits': git_index.commits_for(spec_id),
+            'branches': git_index.branches_for(spec_id),
             'pull_requests': [],
             'file_changes': [],
             'contributors': []
         }
 
-        # Get commits that reference this spec ID
-        cmd = ['git', 'log', '--grep', f'#{spec_id}', '--pretty=format:%H|%ad|%s|%an', '--date=iso']
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd='.')
-
-        if result.returncode == 0 and result.stdout.strip():
-            for line in result.stdout.strip().split('\n'):
-                parts = line.split('|', 3)
-                if len(parts) == 4:
-                    commit_hash = parts[0]
-
-                    # Get file changes for this commit
-                    files_cmd = ['git', 'diff-tree', '--no-commit-id', '--name-only', '-r', commit_hash]
-                    files_result = subprocess.run(files_cmd, capture_output=True, text=True, cwd='.')
-                    changed_files = files_result.stdout.strip().split('\n') if files_result.returncode == 0 else []
-
-                    git_data['commits'].append({
-                        'hash': parts[0][:8],  # Short hash
-                        'full_hash': parts[0],
-                        'date': parts[1],
-                        'message': parts[2],
-                        'author': parts[3],
-                        'files_changed': len(changed_files),
-                        'changed_files': changed_files[:10]  # Limit to first 10 files
-                    })
-
-        # Get branches that might be related (containing the spec ID in name)
-        branches_cmd = ['git', 'branch', '-a', '--list', f'*{spec_id}*']
-        branches_result = subprocess.run(branches_cmd, capture_output=True, text=True, cwd='.')
-        if branches_result.returncode == 0 and branches_result.stdout.strip():
-            git_data['branches'] = [branch.strip(' *') for branch in branches_result.stdout.strip().split('\n')]
-
         # Get recent activity (commits in last 30 days that might be related)
-        recent_cmd = ['git', 'log', '--since=30.days.ago', '--grep', spec_id, '--pretty=format:%H|%ad|%s', '--date=short']
-        recent_result = subprocess.run(recent_cmd, capture_output=True, text=True, cwd='.')
-        if recent_result.returncode == 0 and recent_result.stdout.strip():
-            recent_activity = []
-            for line in recent_result.stdout.strip().split('\n')[:5]:  # Last 5 recent commits
-                parts = line.split('|', 2)
-                if len(parts) == 3:
-                    recent_activity.append({
-                        'hash': parts[0][:8],
-                        'date': parts[1],
-                        'message': parts[2]
-                    })
+        recent_activity = git_index.recent_activity_for(spec_id)
+        if recent_activity:
             git_data['recent_activity'] = recent_activity
 
         # Get contributors for this spec
@@ -279,7 +467,7 @@ def collect_git_data(spec_id):
         git_data['contributors'] = list(contributors)
 
         # Collect PR data
-        git_data['pull_requests'] = collect_pr_data(spec_id)
+        git_data['pull_requests'] = collect_pr_data(spec_id, git_index)
 
         return git_data
 
@@ -295,102 +483,18 @@ def collect_git_data(spec_id):
             'error': str(e)
         }
 
-def collect_pr_data(spec_id):
+def collect_pr_data(spec_id, git_index):
     """Collect PR data for spec-PR linking via git merge commits."""
     try:
-        import subprocess
-        import re
-
-        pr_data = []
-
-        # Extract just the date part for searching (YYYYMMDD or YYYY-MM-DD-nn format)
-        # This allows matching both full spec IDs and shortened versions in commits
-        search_patterns = [f'#{spec_id}']
-
-        # If spec_id contains a dash and description (e.g., 20260213-spec-showcase),
-        # also search for just the date part (20260213)
-        if '-' in spec_id and not re.match(r'^\d{4}-\d{2}-\d{2}-\d{2}$', spec_id):
-            # Extract YYYYMMDD from YYYYMMDD-description format
-            date_part = spec_id.split('-')[0]
-            if len(date_part) == 8 and date_part.isdigit():
-                search_patterns.append(f'#{date_part}')
-
-        # Find merge commits that reference this spec
-        # Search for both full ID and date-only ID
-        all_results = []
-        for pattern in search_patterns:
-            cmd = [
-                'git', 'log',
-                '--grep', pattern,
-                '--merges',
-                '--pretty=format:%H|%ad|%s|%an|%b|||',  # ||| as body separator
-                '--date=iso'
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd='.')
-
-            if result.returncode == 0 and result.stdout.strip():
-                all_results.append(result.stdout.strip())
-
-        # Combine and deduplicate results
-        seen_hashes = set()
-        if all_results:
-            for result_text in all_results:
-                entries = result_text.split('|||')
-
-                for entry in entries:
-                    if not entry.strip():
-                        continue
-
-                    parts = entry.split('|', 4)
-                    if len(parts) >= 4:
-                        commit_hash = parts[0]
-
-                        # Skip if we've already processed this commit
-                        if commit_hash in seen_hashes:
-                            continue
-                        seen_hashes.add(commit_hash)
-
-                        merge_date = parts[1]
-                        subject = parts[2]
-                        author = parts[3]
-                        body = parts[4] if len(parts) > 4 else ""
-
-                        # Extract PR number from subject
-                        # Pattern: "Merge pull request #123 from..."
-                        pr_match = re.search(r'#(\d+)', subject)
-                        if pr_match:
-                            pr_number = pr_match.group(1)
-
-                            # Extract PR title (text after "from branch_name")
-                            title_match = re.search(r'from [^\s]+\s+(.+)', subject)
-                            pr_title = title_match.group(1).strip() if title_match else subject
-
-                            # Extract reviewers from body (Co-authored-by lines)
-                            reviewers = []
-                            co_author_pattern = r'Co-authored-by:\s*([^<\n]+)'
-                            reviewers = re.findall(co_author_pattern, body)
-
-                            # Get branch name
-                            branch_match = re.search(r'from ([^\s]+)', subject)
-                            branch = branch_match.group(1) if branch_match else "unknown"
-
-                            pr_data.append({
-                                'pr_number': pr_number,
-                                'title': pr_title,
-                                'merge_date': merge_date,
-                                'author': author,
-                                'reviewers': reviewers,
-                                'branch': branch,
-                                'merge_commit': commit_hash[:8],
-                                'github_url': f'https://github.com/kangxh75/NextPM/pull/{pr_number}'
-                            })
-
-        return pr_data
+        # Merge commits are indexed by both the full spec ID and its date part
+        # (e.g. #20260213 for 20260213-spec-showcase).
+        return git_index.pull_requests_for(spec_id)
 
     except Exception as e:
         print(f"Warning: Could not collect PR data for {spec_id}: {e}")
         return []
 
+@cached_fragment
 def generate_commit_item_html(commit, is_latest=False):
     """Generate HTML for a single commit timeline item."""
     timeline_class = 'timeline-item latest' if is_latest else 'timeline-item'
@@ -412,6 +516,7 @@ def generate_commit_item_html(commit, is_latest=False):
         </div>
 '''
 
+@cached_fragment
 def generate_pr_item_html(pr, is_latest=False):
     """Generate HTML for a single PR timeline item."""
     timeline_class = 'timeline-item latest' if is_latest else 'timeline-item'
@@ -441,9 +546,12 @@ def generate_pr_item_html(pr, is_latest=False):
 
 def generate_commit_timeline_html(git_data):
     """Generate HTML visualization for commit and PR timeline."""
-    commits = git_data.get('commits', [])
-    prs = git_data.get('pull_requests', [])
+    # Only commits and PRs are shown, so branches etc. don't split the cache
+    return render_commit_timeline_html(git_data.get('commits', []), git_data.get('pull_requests', []))
 
+@cached_fragment
+def render_commit_timeline_html(commits, prs):
+    """Render the commit and PR timeline; each item comes from the fragment cache."""
     if not commits and not prs:
         return '<div class="commit-timeline-empty">No commits or PRs linked to this spec yet.</div>'
 
@@ -484,7 +592,7 @@ def generate_commit_timeline_html(git_data):
     html += '    </div>\n</div>\n'
     return html
 
-def auto_generate_dev_workflow(spec_metadata):
+def auto_generate_dev_workflow(spec_metadata, documents):
     """Automatically generate dev workflow summaries for specs with commits."""
     dev_workflows_dir = Path('mkdocs-docs/engineering/dev-workflows')
     dev_workflows_dir.mkdir(parents=True, exist_ok=True)
@@ -509,7 +617,7 @@ def auto_generate_dev_workflow(spec_metadata):
             continue  # Skip existing workflows for now
 
         # Generate workflow content
-        title = extract_title_from_spec(Path('engineering/specs') / metadata['filename'])
+        title = documents[metadata['filename']].title
 
         workflow_content = f"""# {spec_id} Implementation Summary
 
@@ -546,348 +654,812 @@ _This section will be enhanced with AI-powered commit analysis in a future updat
 **Source**: Automated dev workflow generation from git commit data
 """
 
-        with open(workflow_path, 'w', encoding='utf-8') as f:
-            f.write(workflow_content)
+        write_if_changed(workflow_path, workflow_content)
 
         generated_workflows.append(workflow_filename)
         print(f"Generated dev workflow: {workflow_filename}")
 
     return generated_workflows
 
-def generate_activity_timeline(spec_metadata_collection):
-    """Generate timeline data for D3.js activity graph visualization."""
-    timeline_events = []
-
-    for metadata in spec_metadata_collection:
-        spec_id = metadata.get('spec_id', '')
-        if not spec_id:
-            continue
-
-        # Add spec creation event
-        spec_date = metadata.get('created_date', metadata.get('last_updated', ''))
-        if spec_date:
-            timeline_events.append({
-                'type': 'spec_created',
-                'date': spec_date,
-                'spec_id': spec_id,
-                'title': extract_title_from_spec(Path('engineering/specs') / metadata['filename']),
-                'status': metadata.get('status', 'draft'),
-                'priority': metadata.get('priority', 'medium')
-            })
-
-        # Add commit events
-        git_data = metadata.get('git_commits', {})
-        for commit in git_data.get('commits', []):
-            # Extract branch from commit message or default to feature branch
-            branch_match = re.search(r'(?:feat|fix|docs|style|refactor|test|chore)/([^\s]+)', commit.get('message', ''))
-            branch = branch_match.group(0) if branch_match else f"feat/{spec_id}"
-
-            timeline_events.append({
-                'type': 'commit',
-                'date': commit['date'][:10] if 'date' in commit else '',
-                'spec_id': spec_id,
-                'hash': commit.get('hash', ''),
-                'full_hash': commit.get('full_hash', ''),
-                'message': commit.get('message', ''),
-                'author': commit.get('author', ''),
-                'files_changed': commit.get('files_changed', 0),
-                'branch': branch
-            })
-
-        # Add PR events
-        for pr in git_data.get('pull_requests', []):
-            timeline_events.append({
-                'type': 'pr_merged',
-                'date': pr.get('merge_date', '')[:10] if pr.get('merge_date') else '',
-                'spec_id': spec_id,
-                'pr_number': pr.get('pr_number', 0),
-                'title': pr.get('title', ''),
-                'author': pr.get('author', ''),
-                'branch': pr.get('branch', ''),
-                'reviewers': pr.get('reviewers', []),
-                'github_url': pr.get('github_url', '')
-            })
-
-    # Sort all events by date
-    timeline_events.sort(key=lambda x: x.get('date', ''))
-
-    # Write timeline data to JSON file
-    timeline_path = Path('mkdocs-docs/assets/js/activity-timeline.json')
-    timeline_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(timeline_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'generated': datetime.now().isoformat(),
-            'total_events': len(timeline_events),
-            'events': timeline_events
-        }, f, indent=2)
-
-    print(f"Generated activity timeline with {len(timeline_events)} events")
-    return timeline_path
-
-def generate_search_index(spec_metadata_collection):
-    """Generate JSON search index for client-side search."""
-    search_index = []
-
-    for metadata in spec_metadata_collection:
-        # Read the original spec content for indexing
-        spec_path = Path('engineering/specs') / metadata['filename']
-        try:
-            with open(spec_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Remove YAML frontmatter for content indexing
-            if content.startswith('---\n'):
-                end_marker = content.find('\n---\n', 4)
-                if end_marker != -1:
-                    content = content[end_marker + 5:]
-
-            # Extract title
-            title = extract_title_from_spec(spec_path)
-
-            # Create searchable content
-            searchable_content = f"{title} {content}".lower()
-
-            # Remove markdown formatting for better search
-            import re
-            searchable_content = re.sub(r'#+ ', '', searchable_content)  # Remove headers
-            searchable_content = re.sub(r'\*\*(.*?)\*\*', r'\1', searchable_content)  # Bold
-            searchable_content = re.sub(r'\*(.*?)\*', r'\1', searchable_content)  # Italic
-            searchable_content = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', searchable_content)  # Links
-
-            search_entry = {
-                'id': metadata.get('spec_id', ''),
-                'filename': metadata['filename'],
-                'title': title,
-                'status': metadata.get('status', 'draft'),
-                'priority': metadata.get('priority', 'medium'),
-                'category': metadata.get('category', 'nextpm-feature'),
-                'assignee': metadata.get('assignee', ''),
-                'estimated_hours': metadata.get('estimated_hours', 0),
-                'actual_hours': metadata.get('actual_hours', 0),
-                'demonstrates': metadata.get('demonstrates', []),
-                'content': searchable_content[:1000],  # Limit content for index size
-                'last_updated': metadata.get('last_updated', ''),
-                'git_commits': len(metadata.get('git_commits', {}).get('commits', [])),
-                'pull_requests': len(metadata.get('git_commits', {}).get('pull_requests', [])),
-                'url': f'engineering/specs/{metadata["filename"]}'
-            }
-
-            search_index.append(search_entry)
-
-        except Exception as e:
-            print(f"Warning: Could not index {metadata['filename']}: {e}")
-
-    # Write search index to static file
-    search_index_path = Path('mkdocs-static/js/search-index.json')
-    search_index_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(search_index_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'generated': datetime.now().isoformat(),
-            'total_specs': len(search_index),
-            'index': search_index
-        }, f, indent=2)
-
-    print(f"Generated search index with {len(search_index)} entries")
-    return search_index_path
-
-def process_spec_content(content, filename):
-    """Process spec content to fix broken links for MkDocs compatibility."""
-    # Define link replacements/fixes
-    link_fixes = {
-        # Root project files that don't exist in MkDocs
-        r'\]\(\.\.\/\.\.\/AI-NATIVE\.md\)': '](https://github.com/kangxh75/NextPM/blob/master/AI-NATIVE.md)',
-        r'\]\(\.\.\/\.\.\/GETTING-STARTED\.md\)': '](https://github.com/kangxh75/NextPM/blob/master/GETTING-STARTED.md)',
-        r'\]\(\.\.\/\.\.\/mkdocs\.yml\)': '](https://github.com/kangxh75/NextPM/blob/master/mkdocs.yml)',
-
-        # AI context files
-        r'\]\(\.\.\/\.\.\/ai-context\/README\.md\)': '](https://github.com/kangxh75/NextPM/blob/master/ai-context/README.md)',
-        r'\]\(\.\.\/\.\.\/ai-context\/conventions\.md\)': '](https://github.com/kangxh75/NextPM/blob/master/ai-context/conventions.md)',
-
-        # Meta/ADR files
-        r'\]\(\.\.\/\.\.\/meta\/adr\/[^)]+\)': lambda m: f'](https://github.com/kangxh75/NextPM/blob/master/{m.group(0)[2:-1]})',
-        r'\]\(\.\.\/meta\/adr\/[^)]+\)': lambda m: f'](https://github.com/kangxh75/NextPM/blob/master/{m.group(0)[2:-1].replace("../", "")})',
-
-        # Project internal links that should go to GitHub
-        r'\]\(\.\.\/\.\.\/project\/[^)]+\)': lambda m: f'](https://github.com/kangxh75/NextPM/blob/master/{m.group(0)[2:-1]})',
-    }
-
-    processed_content = content
-
-    for pattern, replacement in link_fixes.items():
-        if callable(replacement):
-            processed_content = re.sub(pattern, replacement, processed_content)
-        else:
-            processed_content = re.sub(pattern, replacement, processed_content)
+def spec_timeline_events(metadata, document):
+    """Timeline events (creation, commits, merged PRs) of one spec, oldest first."""
+    spec_id = metadata.get('spec_id', '')
+    events = []
+
+    # Add spec creation event
+    spec_date = metadata.get('created_date', metadata.get('last_updated', ''))
+    if spec_date:
+        events.append({
+            'type': 'spec_created',
+            'date': spec_date,
+            'spec_id': spec_id,
+            'title': document.title,
+            'status': metadata.get('status', 'draft'),
+            'priority': metadata.get('priority', 'medium')
+        })
 
-    return processed_content
-    """Extract the title from a spec file's first H1 heading."""
-    try:
-        with open(spec_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Look for first H1 heading
-            match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-            if match:
-                return match.group(1).strip()
-    except Exception as e:
-        print(f"Warning: Could not extract title from {spec_path}: {e}")
+    # Add commit events
+    git_data = metadata.get('git_commits', {})
+    for commit in git_data.get('commits', []):
+        # Extract branch from commit message or default to feature branch
+        branch_match = re.search(r'(?:feat|fix|docs|style|refactor|test|chore)/([^\s]+)', commit.get('message', ''))
+        branch = branch_match.group(0) if branch_match else f"feat/{spec_id}"
 
-    # Fallback: generate title from filename
-    filename = Path(spec_path).stem
-    # Handle special case for 0.00-project-start
-    if filename == '0.00-project-start':
-        return '0.00 Project Start'
+        events.append({
+            'type': 'commit',
+            'date': commit['date'][:10] if 'date' in commit else '',
+            'spec_id': spec_id,
+            'hash': commit.get('hash', ''),
+            'full_hash': commit.get('full_hash', ''),
+            'message': commit.get('message', ''),
+            'author': commit.get('author', ''),
+            'files_changed': commit.get('files_changed', 0),
+            'branch': branch
+        })
 
-    # For YYYYMMDD format (new standard), create readable title
-    match = re.match(r'^(\d{8})-(.+)$', filename)
-    if match:
-        spec_id, name_part = match.groups()
-        # Convert kebab-case to Title Case
-        title_part = name_part.replace('-', ' ').title()
-        # Format date for readability: 20260213 -> 2026-02-13
-        formatted_date = f"{spec_id[:4]}-{spec_id[4:6]}-{spec_id[6:8]}"
-        return f"{formatted_date} {title_part}"
+    # Add PR events
+    for pr in git_data.get('pull_requests', []):
+        events.append({
+            'type': 'pr_merged',
+            'date': pr.get('merge_date', '')[:10] if pr.get('merge_date') else '',
+            'spec_id': spec_id,
+            'pr_number': pr.get('pr_number', 0),
+            'title': pr.get('title', ''),
+            'author': pr.get('author', ''),
+            'branch': pr.get('branch', ''),
+            'reviewers': pr.get('reviewers', []),
+            'github_url': pr.get('github_url', '')
+        })
 
-    # For legacy YYYY-MM-DD-nn format, create readable title
-    match = re.match(r'^(\d{4}-\d{2}-\d{2}-\d{2})-(.+)$', filename)
-    if match:
-        spec_id, name_part = match.groups()
-        # Convert kebab-case to Title Case
-        title_part = name_part.replace('-', ' ').title()
-        return f"{spec_id} {title_part}"
+    # git lists commits newest first; a spec only has a handful of events
+    events.sort(key=lambda event: str(event['date']))
+    return events
+
+def generate_activity_timeline(spec_metadata_collection, documents):
+    """Generate timeline data for D3.js activity graph visualization.
+
+    Events are produced by merging the date-ordered event streams of the
+    individual specs and written as one NDJSON chunk per month (content-hashed,
+    under assets/build/timeline/). activity-timeline.json is a small manifest
+    listing the chunks with their event counts and date ranges, so the graph
+    can fetch only the months it shows.
+    """
+    streams = [spec_timeline_events(metadata, documents[metadata['filename']])
+               for metadata in spec_metadata_collection if metadata.get('spec_id')]
+    timeline_events = heapq.merge(*streams, key=lambda event: str(event['date']))
+
+    TIMELINE_CHUNK_DIR.mkdir(parents=True, exist_ok=True)
+    chunks = []
+    for month, events in itertools.groupby(timeline_events, key=lambda event: str(event['date'])[:7]):
+        # Events without a date can't be placed on the timeline
+        if not month:
+            continue
 
-    # Final fallback
-    return filename.replace('-', ' ').title()
+        events = list(events)
+        content = ''.join(json.dumps(event, separators=(',', ':')) + '\n' for event in events)
+        data = content.encode('utf-8')
+        chunk_path = TIMELINE_CHUNK_DIR / f'{month}.{hash_content(data)[:ASSET_HASH_LENGTH]}.ndjson'
+        write_if_changed(chunk_path, data)
+        write_compressed_siblings(chunk_path, data)
+
+        chunks.append({
+            'month': month,
+            'file': chunk_path.name,
+            'events': len(events),
+            'first_date': str(events[0]['date'])[:10],
+            'last_date': str(events[-1]['date'])[:10]
+        })
 
-def get_spec_sort_key(filename):
-    """Generate sort key for spec files."""
-    stem = Path(filename).stem
+    # Drop chunks of earlier builds
+    current = {chunk['file'] for chunk in chunks}
+    for existing in TIMELINE_CHUNK_DIR.glob('*'):
+        if existing.name.removesuffix('.gz').removesuffix('.br') not in current:
+            existing.unlink()
+
+    total_events = sum(chunk['events'] for chunk in chunks)
+    write_if_changed(TIMELINE_MANIFEST_PATH, json.dumps({
+        'total_events': total_events,
+        'first_date': chunks[0]['first_date'] if chunks else None,
+        'last_date': chunks[-1]['last_date'] if chunks else None,
+        'chunk_base': f'{TIMELINE_CHUNK_DIR.relative_to("mkdocs-docs").as_posix()}/',
+        'chunks': chunks
+    }, separators=(',', ':')))
+
+    print(f"Generated activity timeline with {total_events} events in {len(chunks)} monthly chunks")
+    return TIMELINE_MANIFEST_PATH
+
+def generate_search_index(spec_metadata_collection, documents):
+    """Generate the inverted index used by nextpm-search.js; returns the path of its index.json."""
+    shard_count = write_search_shards(spec_metadata_collection, documents)
+    print(f"Generated search index for {len(spec_metadata_collection)} specs in {shard_count} shards")
+    return SEARCH_INDEX_DIR / 'index.json'
+
+def tokenize_search_text(text):
+    """Split text into lowercase search terms (letters and digits, at least two characters)."""
+    return [term for term in SEARCH_TOKEN_PATTERN.findall(text.lower()) if len(term) >= 2]
+
+def get_search_summary(document):
+    """Short plain-text preview of a spec for search results."""
+    text = ' '.join(document.plain_text.split())
+    if text.startswith(document.title):
+        text = text[len(document.title):].lstrip()
+    return text[:SEARCH_SUMMARY_LENGTH] + ('...' if len(text) > SEARCH_SUMMARY_LENGTH else '')
+
+def build_search_postings(spec_metadata_collection, documents):
+    """Build term -> [[doc number, weighted term frequency], ...] over full spec bodies."""
+    postings = defaultdict(list)
+
+    for doc_number, metadata in enumerate(spec_metadata_collection):
+        document = documents[metadata['filename']]
+        fields = [
+            (document.title, SEARCH_FIELD_WEIGHTS['title']),
+            (' '.join(metadata.get('demonstrates', [])), SEARCH_FIELD_WEIGHTS['demonstrates']),
+            (metadata.get('category', 'nextpm-feature'), SEARCH_FIELD_WEIGHTS['category']),
+            (document.plain_text, SEARCH_FIELD_WEIGHTS['body']),
+        ]
+
+        frequencies = defaultdict(int)
+        for text, weight in fields:
+            for term in tokenize_search_text(str(text)):
+                frequencies[term] += weight
+
+        for term in sorted(frequencies):
+            postings[term].append([doc_number, frequencies[term]])
+
+    return postings
+
+def split_search_shards(postings):
+    """Group postings into shards by term prefix.
+
+    Terms are grouped by their first character; a group whose postings would
+    exceed SEARCH_SHARD_TARGET_BYTES is split again by the first two
+    characters, so a query only downloads the postings near its own terms.
+    """
+    by_first_char = defaultdict(dict)
+    for term, term_postings in postings.items():
+        by_first_char[term[0]][term] = term_postings
+
+    shards = {}
+    for prefix, terms in by_first_char.items():
+        size = len(json.dumps(terms, separators=(',', ':')))
+        if size <= SEARCH_SHARD_TARGET_BYTES:
+            shards[prefix] = terms
+            continue
+        for term, term_postings in terms.items():
+            shards.setdefault(term[:2], {})[term] = term_postings
+
+    return shards
+
+def write_search_shards(spec_metadata_collection, documents):
+    """Write the sharded inverted index plus the small document metadata file.
+
+    Shards are named by their content hash under assets/build/search/, like the
+    other published assets, so a browser never combines a new index.json with
+    a cached shard of an earlier build.
+    """
+    SEARCH_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    SEARCH_SHARD_DIR.mkdir(parents=True, exist_ok=True)
+
+    shards = split_search_shards(build_search_postings(spec_metadata_collection, documents))
+
+    shard_files = {}
+    for prefix in sorted(shards):
+        terms = shards[prefix]
+        data = json.dumps({term: terms[term] for term in sorted(terms)}, separators=(',', ':')).encode('utf-8')
+        shard_path = SEARCH_SHARD_DIR / f'shard.{hash_content(data)[:ASSET_HASH_LENGTH]}.json'
+        write_if_changed(shard_path, data)
+        write_compressed_siblings(shard_path, data)
+        shard_files[prefix] = shard_path.name
+
+    # Document metadata only; bodies are searchable through the shards
+    docs = []
+    for metadata in spec_metadata_collection:
+        document = documents[metadata['filename']]
+        docs.append({
+            'id': metadata.get('spec_id', ''),
+            'title': document.title,
+            'url': f'engineering/specs/{metadata["filename"]}',
+            'status': metadata.get('status', 'draft'),
+            'priority': metadata.get('priority', 'medium'),
+            'category': metadata.get('category', 'nextpm-feature'),
+            'assignee': metadata.get('assignee', ''),
+            'estimated_hours': metadata.get('estimated_hours', 0),
+            'demonstrates': metadata.get('demonstrates', []),
+            'git_commits': len(metadata.get('git_commits', {}).get('commits', [])),
+            'summary': get_search_summary(document)
+        })
 
-    # Handle special case for 0.00-project-start (should be first)
-    if stem == '0.00-project-start':
-        return '0000-00-00-00'
+    # Relative to index.json, which is served at its repository path while the
+    # shards are under the docs root, so it works under any site prefix
+    shard_base = Path(os.path.relpath(SEARCH_SHARD_DIR.relative_to('mkdocs-docs'), SEARCH_INDEX_DIR)).as_posix() + '/'
+    write_if_changed(SEARCH_INDEX_DIR / 'index.json', json.dumps({
+        'version': 2,
+        'total_specs': len(docs),
+        'field_weights': SEARCH_FIELD_WEIGHTS,
+        'shard_base': shard_base,
+        'shards': shard_files,
+        'docs': docs
+    }, separators=(',', ':')))
+
+    # Drop shards of earlier builds (including the unhashed ones once written next to index.json)
+    current = set(shard_files.values())
+    for existing in SEARCH_SHARD_DIR.glob('*'):
+        if existing.name.removesuffix('.gz').removesuffix('.br') not in current:
+            existing.unlink()
+    for stale_file in SEARCH_INDEX_DIR.glob('shard-*.json'):
+        stale_file.unlink()
+
+    return len(shard_files)
+
+class LinkRewriter:
+    """Rewrites markdown link targets using one combined pattern built from declarative rules.
+
+    Each rule becomes a named alternative of a single regex, so a document is
+    scanned once regardless of the number of rules, and the matching rule is
+    looked up from the name of the group that matched.
+    """
+
+    def __init__(self, rules):
+        self.rules = {}
+        alternatives = []
+        for number, rule in enumerate(rules):
+            name = rule.get('name') or f'rule-{number + 1}'
+            try:
+                if re.compile(rule['pattern']).groupindex:
+                    raise ValueError("named groups are not allowed")
+                rule['replace'].format(target='', path='')
+            except (KeyError, IndexError, ValueError, re.error) as e:
+                raise ValueError(f"Invalid link rewrite rule '{name}': {e}") from e
+
+            group = f'rule{number}'
+            self.rules[group] = {'name': name, 'replace': rule['replace']}
+            alternatives.append(f'(?P<{group}>{rule["pattern"]})')
+
+        self.pattern = re.compile(r'\]\((?:' + '|'.join(alternatives) + r')\)') if alternatives else None
+        self.hits = {rule['name']: 0 for rule in self.rules.values()}
+        self._lock = threading.Lock()
+
+    def rewrite(self, content):
+        """Return content with every matching link target rewritten."""
+        if self.pattern is None:
+            return content
+
+        hits = defaultdict(int)
+
+        def replace(match):
+            rule = self.rules[match.lastgroup]
+            hits[rule['name']] += 1
+            target = match.group(match.lastgroup)
+            path = PARENT_DIR_PATTERN.sub('', target)
+            return '](' + rule['replace'].format(target=target, path=path) + ')'
+
+        content = self.pattern.sub(replace, content)
+
+        # Specs may be rewritten from several worker threads
+        with self._lock:
+            for name, count in hits.items():
+                self.hits[name] += count
+        return content
+
+def load_link_rewriter(rules_path=LINK_REWRITES_PATH):
+    """Compile the link rewrite rules file once for the whole build."""
+    try:
+        with open(rules_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    except OSError as e:
+        print(f"Warning: Could not read link rewrite rules: {e}")
+        config = {}
+
+    return LinkRewriter(config.get('rules') or [])
+
+def print_fragment_cache_stats():
+    """Print how many HTML fragments this build reused instead of rendering."""
+    total = FRAGMENT_CACHE.hits + FRAGMENT_CACHE.misses
+    if total:
+        print(f"\nHTML fragments: reused {FRAGMENT_CACHE.hits} of {total}, rendered {FRAGMENT_CACHE.misses}")
+
+def print_link_rewrite_hits(link_rewriter):
+    """Print how many links each rewrite rule fixed in the specs processed so far."""
+    if not link_rewriter.hits:
+        return
+    print("Link rewrites:")
+    for name, count in link_rewriter.hits.items():
+        print(f"  {name}: {count}")
+
+def process_spec_content(content, link_rewriter):
+    """Process spec content to fix broken links for MkDocs compatibility."""
+    return link_rewriter.rewrite(content)
+
+def hash_content(data):
+    """Return a stable SHA-256 hex digest for bytes, text or JSON-serializable data."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    elif not isinstance(data, bytes):
+        data = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+def write_if_changed(path, content):
+    """Atomically write text or bytes to path, leaving the file untouched if the bytes are identical.
+
+    Returns True if the file was (re)written.
+    """
+    path = Path(path)
+    stage_scheduler.record_output(path)
+    data = content if isinstance(content, bytes) else content.encode('utf-8')
+    try:
+        existing = path.read_bytes()
+        build_profile.record_read(len(existing))
+        if existing == data:
+            return False
+    except OSError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f'.{path.name}.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    build_profile.record_write(len(data))
+    os.replace(temp_path, path)
+    return True
+
+def write_compressed_siblings(path, data):
+    """Write precompressed .gz (and .br when brotli is available) copies next to path."""
+    # mtime=0 keeps the gzip output identical for identical input
+    write_if_changed(path.with_name(path.name + '.gz'), gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli:
+        write_if_changed(path.with_name(path.name + '.br'), brotli.compress(data))
+
+def minify_asset(source, text):
+    """Minify a JS or CSS asset (already minified .min.js files and JSON are left as they are)."""
+    if source.name.endswith('.min.js') or source.suffix not in ('.js', '.css') or jsmin is None:
+        return text
+    if source.suffix == '.css':
+        return csscompressor.compress(text)
+    # Template literals hold the HTML the loaders render, so their whitespace is kept
+    return jsmin.jsmin(text, quote_chars="'\"`")
+
+def publish_assets():
+    """Copy the dashboard data and loaders to content-hashed names under assets/build/.
+
+    References to already published assets are rewritten inside each file
+    (e.g. the JSON URL fetched by dashboard.js), so new data also gives its
+    loader a new name. Scripts and stylesheets are minified. Returns
+    {reference path: hashed path} for the dashboard.
+    """
+    if jsmin is None:
+        print("Warning: jsmin/csscompressor are not installed, publishing scripts and stylesheets unminified "
+              "(pip install -r requirements.txt)")
+    if brotli is None:
+        print("Warning: brotli is not installed, no .br copies are written (pip install -r requirements.txt)")
+    published = {}
+    for source, reference in PUBLISHED_ASSETS:
+        try:
+            text = source.read_text(encoding='utf-8')
+        except OSError as e:
+            print(f"Warning: Could not publish {source}: {e}")
+            continue
+        build_profile.record_read(len(text.encode('utf-8')))
+
+        for original, hashed in published.items():
+            text = text.replace(original, hashed)
+
+        data = minify_asset(source, text).encode('utf-8')
+        stem, suffix = os.path.splitext(source.name)
+        target = ASSET_BUILD_DIR / f'{stem}.{hash_content(data)[:ASSET_HASH_LENGTH]}{suffix}'
+        if write_if_changed(target, data):
+            print(f"Published {reference} as {target.name}")
+        write_compressed_siblings(target, data)
+        published[reference] = f'assets/build/{target.name}'
+
+    # Drop hashed copies from earlier builds
+    current = {Path(hashed).name for hashed in published.values()}
+    for existing in ASSET_BUILD_DIR.glob('*'):
+        if existing.is_file() and existing.name.removesuffix('.gz').removesuffix('.br') not in current:
+            existing.unlink()
+
+    return published
+
+def get_generator_fingerprint():
+    """Hash the build scripts and link rules so a change to the generator invalidates cached outputs."""
+    script_dir = Path(__file__).parent
+    sources = [script_dir / 'build-specs.py', script_dir / 'git_history.py', script_dir / 'git_session.py',
+               script_dir / 'git_repository.py', script_dir / 'spec_frontmatter.py',
+               script_dir / 'stage_scheduler.py', script_dir / 'build_profile.py', LINK_REWRITES_PATH]
+    return hash_content(b''.join(source.read_bytes() for source in sources))
+
+def load_build_manifest(generator):
+    """Load the per-spec build manifest, discarding it if the generator changed."""
+    try:
+        with open(BUILD_MANIFEST_PATH, 'rb') as f:
+            data = f.read()
+        build_profile.record_read(len(data))
+        manifest = json.loads(data)
+    except (OSError, ValueError):
+        return {}
+
+    if manifest.get('generator') != generator:
+        print("Build scripts changed, rebuilding all specs")
+        return {}
+    return manifest.get('specs', {})
+
+def save_build_manifest(generator, specs):
+    """Store the per-spec build manifest for the next incremental build."""
+    write_if_changed(BUILD_MANIFEST_PATH, json.dumps({
+        'generator': generator,
+        'specs': specs
+    }, indent=2, sort_keys=True, default=str))
+
+def map_in_pool(func, items, jobs=1):
+    """Apply func to every item, using a thread pool when jobs > 1; results keep input order."""
+    if jobs <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(func, items))
+
+def read_output(path):
+    """Read a previously generated file, counting the bytes for --profile."""
+    data = path.read_bytes()
+    build_profile.record_read(len(data))
+    return data
+
+def render_spec_page(markdown, metadata, link_rewriter):
+    """Final markdown of a spec page: links rewritten, state badge and commit timeline injected."""
+    return inject_timeline_data(process_spec_content(markdown, link_rewriter), metadata)
+
+def build_spec(spec_file, target_dir, git_index, link_rewriter, entry, write_page=True):
+    """Build one spec page, reusing its manifest entry if none of its inputs changed.
+
+    Returns (document, metadata, new manifest entry, whether the spec was rebuilt),
+    or the FrontmatterError if the spec's frontmatter is invalid, so the
+    errors of all specs can be reported together. With write_page=False only
+    the metadata is built; the page is rendered later by render_spec_page().
+    """
+    with build_profile.spec(spec_file.name):
+        try:
+            return _build_spec(spec_file, target_dir, git_index, link_rewriter, entry, write_page)
+        except spec_frontmatter.FrontmatterError as e:
+            return e
+
+def raise_frontmatter_errors(results):
+    """Raise one FrontmatterError listing the problems of every spec that failed."""
+    errors = [error for result in results if isinstance(result, spec_frontmatter.FrontmatterError)
+              for error in result.errors]
+    if errors:
+        raise spec_frontmatter.FrontmatterError(errors)
+
+def _build_spec(spec_file, target_dir, git_index, link_rewriter, entry, write_page):
+    document = load_spec_document(spec_file)
+    source_hash = document.source_hash
+    target_file = target_dir / spec_file.name
+
+    # Collect git data for this spec
+    git_data = collect_git_data(get_spec_id(spec_file.name), git_index)
+    git_hash = hash_content(git_data)
+
+    up_to_date = (
+        entry is not None
+        and entry.get('source_hash') == source_hash
+        and entry.get('git_hash') == git_hash
+        and (not write_page or (target_file.exists()
+                                and hash_content(read_output(target_file)) == entry.get('output_hash')))
+    )
 
-    # For YYYYMMDD format (new standard)
-    match = re.match(r'^(\d{8})', stem)
-    if match:
-        # Convert YYYYMMDD to YYYY-MM-DD for sorting
-        spec_id = match.group(1)
-        return f"{spec_id[:4]}-{spec_id[4:6]}-{spec_id[6:8]}"
+    if up_to_date:
+        metadata = dict(entry['metadata'])
+        metadata['git_commits'] = git_data
+        output_hash = entry['output_hash']
+    else:
+        metadata = process_spec_metadata(document.frontmatter, spec_file.name)
+        metadata['git_commits'] = git_data
 
-    # For legacy YYYY-MM-DD-nn format
-    match = re.match(r'^(\d{4}-\d{2}-\d{2}-\d{2})', stem)
-    if match:
-        return match.group(1)
+        if write_page:
+            # Fix links, inject timeline data and visualizations
+            enhanced_content = render_spec_page(document.body, metadata, link_rewriter)
 
-    # Fallback: use filename as-is
-    return stem
+            # Write the processed content to target (only if the bytes differ)
+            write_if_changed(target_file, enhanced_content)
+            output_hash = hash_content(enhanced_content)
+        else:
+            output_hash = None
 
-def process_spec_content(content, filename):
-    """Process spec content to fix broken links for MkDocs compatibility."""
-    # Define link replacements/fixes
-    link_fixes = {
-        # Root project files that don't exist in MkDocs
-        r'\]\(\.\.\/\.\.\/AI-NATIVE\.md\)': '](https://github.com/kangxh75/NextPM/blob/master/AI-NATIVE.md)',
-        r'\]\(\.\.\/\.\.\/GETTING-STARTED\.md\)': '](https://github.com/kangxh75/NextPM/blob/master/GETTING-STARTED.md)',
-        r'\]\(\.\.\/\.\.\/mkdocs\.yml\)': '](https://github.com/kangxh75/NextPM/blob/master/mkdocs.yml)',
-
-        # AI context files
-        r'\]\(\.\.\/\.\.\/ai-context\/README\.md\)': '](https://github.com/kangxh75/NextPM/blob/master/ai-context/README.md)',
-        r'\]\(\.\.\/\.\.\/ai-context\/conventions\.md\)': '](https://github.com/kangxh75/NextPM/blob/master/ai-context/conventions.md)',
-
-        # Meta/ADR files
-        r'\]\(\.\.\/\.\.\/meta\/adr\/[^)]+\)': lambda m: f'](https://github.com/kangxh75/NextPM/blob/master/{m.group(0)[2:-1]})',
-        r'\]\(\.\.\/meta\/adr\/[^)]+\)': lambda m: f'](https://github.com/kangxh75/NextPM/blob/master/{m.group(0)[2:-1].replace("../", "")})',
-
-        # Project internal links that should go to GitHub
-        r'\]\(\.\.\/\.\.\/project\/[^)]+\)': lambda m: f'](https://github.com/kangxh75/NextPM/blob/master/{m.group(0)[2:-1]})',
+    new_entry = {
+        'source_hash': source_hash,
+        'git_hash': git_hash,
+        'output_hash': output_hash,
+        'metadata': {key: value for key, value in metadata.items() if key != 'git_commits'}
     }
+    return document, metadata, new_entry, not up_to_date
 
-    processed_content = content
+def list_spec_sources():
+    """Return the spec source files (everything but README.md), sorted by filename."""
+    source_dir = Path('engineering/specs')
+    if not source_dir.exists():
+        raise FileNotFoundError(f"Source directory {source_dir} does not exist")
 
-    for pattern, replacement in link_fixes.items():
-        if callable(replacement):
-            processed_content = re.sub(pattern, replacement, processed_content)
-        else:
-            processed_content = re.sub(pattern, replacement, processed_content)
+    return sorted(spec_file for spec_file in source_dir.glob('*.md')
+                  if spec_file.name.lower() != 'readme.md')
 
-    return processed_content
+def copy_specs_to_docs(use_cache=True, jobs=1, git_index=None, link_rewriter=None, write_pages=True):
+    """Copy spec files from engineering/specs/ to mkdocs-docs/engineering/specs/ with enhanced processing.
 
-def copy_specs_to_docs():
-    """Copy spec files from engineering/specs/ to mkdocs-docs/engineering/specs/ with enhanced processing."""
-    source_dir = Path('engineering/specs')
+    Returns the spec filenames, their metadata and their parsed SpecDocuments.
+    Only specs whose source or git data changed since the last build are
+    re-parsed and rewritten; outputs of removed specs are pruned one by one.
+    With jobs > 1 the per-spec work runs on a thread pool. With
+    write_pages=False the pages aren't written (MkDocs hooks render them).
+    """
     target_dir = Path('mkdocs-docs/engineering/specs')
-
-    if not source_dir.exists():
-        raise FileNotFoundError(f"Source directory {source_dir} does not exist")
+    source_files = list_spec_sources()
 
     # Create target directory if it doesn't exist
     target_dir.mkdir(parents=True, exist_ok=True)
 
-    # Remove all existing files in target directory (clean rebuild)
-    for file in target_dir.glob('*.md'):
-        file.unlink()
+    generator = get_generator_fingerprint()
+    manifest = load_build_manifest(generator) if use_cache else {}
+    new_manifest = {}
 
     # Copy all .md files except README.md with enhanced processing
     spec_files = []
     spec_metadata_collection = []
+    documents = {}
+
+    # Walk the git history once for all specs instead of once per spec
+    if git_index is None:
+        git_index = build_git_index(use_cache=use_cache)
+
+    if link_rewriter is None:
+        link_rewriter = load_link_rewriter()
+
+    results = map_in_pool(
+        lambda spec_file: build_spec(spec_file, target_dir, git_index, link_rewriter,
+                                     manifest.get(spec_file.name), write_pages),
+        source_files, jobs)
+    raise_frontmatter_errors(results)
+
+    # Results come back in source order, so logs, nav and indexes don't depend on --jobs
+    rebuilt = 0
+    for spec_file, (document, metadata, entry, was_rebuilt) in zip(source_files, results):
+        if was_rebuilt:
+            rebuilt += 1
+            print(f"Copied and enhanced: {spec_file.name} (Status: {metadata.get('status', 'draft')})")
 
-    for spec_file in source_dir.glob('*.md'):
-        if spec_file.name.lower() != 'readme.md':
-            # Parse frontmatter and content
-            frontmatter, content = parse_spec_frontmatter(spec_file)
-            metadata = process_spec_metadata(frontmatter, spec_file.name)
-
-            # Collect git data for this spec
-            git_data = collect_git_data(metadata.get('spec_id', ''))
-            metadata['git_commits'] = git_data
-
-            # Process the content to fix links
-            processed_content = process_spec_content(content, spec_file.name)
+        new_manifest[spec_file.name] = entry
+        spec_files.append(spec_file.name)
+        spec_metadata_collection.append(metadata)
+        documents[spec_file.name] = document
 
-            # Inject timeline data and visualizations
-            enhanced_content = inject_timeline_data(processed_content, metadata)
+    # Prune outputs of specs that no longer exist (index.md is generated separately)
+    for target_file in sorted(target_dir.glob('*.md')):
+        if target_file.name not in new_manifest and target_file.name != 'index.md':
+            target_file.unlink()
+            print(f"Removed stale spec output: {target_file.name}")
 
-            # Write the processed content to target
-            target_file = target_dir / spec_file.name
-            with open(target_file, 'w', encoding='utf-8') as f:
-                f.write(enhanced_content)
+    if use_cache:
+        save_build_manifest(generator, new_manifest)
 
-            spec_files.append(spec_file.name)
-            spec_metadata_collection.append(metadata)
-            print(f"Copied and enhanced: {spec_file.name} (Status: {metadata.get('status', 'draft')})")
+    print(f"Rebuilt {rebuilt} of {len(spec_files)} specs ({len(spec_files) - rebuilt} unchanged)")
+    return spec_files, spec_metadata_collection, documents
 
-    return spec_files, spec_metadata_collection
+def get_hours(value):
+    """Frontmatter hours as a number (0 if missing or not numeric)."""
+    try:
+        hours = float(value or 0)
+    except (TypeError, ValueError):
+        return 0
+    return int(hours) if hours.is_integer() else hours
+
+def get_spec_created_date(metadata):
+    """Creation date of a spec: created_date from the frontmatter, else the date in its ID."""
+    created = str(metadata.get('created_date') or '')[:10]
+    if created:
+        return created
+    spec_id = metadata.get('spec_id', '')
+    if len(spec_id) >= 8 and spec_id[:8].isdigit():
+        return f"{spec_id[:4]}-{spec_id[4:6]}-{spec_id[6:8]}"
+    return ''
 
-def generate_spec_dashboard(spec_metadata_collection):
-    """Generate interactive dashboard with spec statistics."""
-    dashboard_path = Path('mkdocs-docs/engineering/dashboard.md')
-    dashboard_path.parent.mkdir(parents=True, exist_ok=True)
+def get_week_start(date_string):
+    """Monday of the ISO week containing a YYYY-MM-DD date, or None if it doesn't parse."""
+    try:
+        day = date.fromisoformat(date_string[:10])
+    except ValueError:
+        return None
+    return (day - timedelta(days=day.weekday())).isoformat()
 
-    # Calculate statistics
-    total_specs = len(spec_metadata_collection)
+def compute_dashboard_stats(spec_metadata_collection):
+    """Aggregate the spec metadata into the data set behind the dashboard page."""
     status_counts = defaultdict(int)
     priority_counts = defaultdict(int)
     category_counts = defaultdict(int)
+    hours_by_status = defaultdict(lambda: {'estimated': 0, 'actual': 0})
+    assignees = {}
+    weeks = defaultdict(lambda: {'specs': 0, 'commits': set(), 'prs': set()})
+    rows = []
     total_commits = 0
     total_prs = 0
 
     for metadata in spec_metadata_collection:
-        status_counts[metadata.get('status', 'draft')] += 1
+        status = metadata.get('status', 'draft')
+        git_data = metadata.get('git_commits', {})
+        commits = git_data.get('commits', [])
+        prs = git_data.get('pull_requests', [])
+        estimated = get_hours(metadata.get('estimated_hours'))
+        actual = get_hours(metadata.get('actual_hours'))
+        assignee = metadata.get('assignee', '')
+
+        status_counts[status] += 1
         priority_counts[metadata.get('priority', 'medium')] += 1
         category_counts[metadata.get('category', 'nextpm-feature')] += 1
-        total_commits += len(metadata.get('git_commits', {}).get('commits', []))
-        total_prs += len(metadata.get('git_commits', {}).get('pull_requests', []))
+        total_commits += len(commits)
+        total_prs += len(prs)
+        hours_by_status[status]['estimated'] += estimated
+        hours_by_status[status]['actual'] += actual
+
+        load = assignees.setdefault(assignee, {'assignee': assignee, 'specs': 0, 'open_specs': 0,
+                                               'estimated_hours': 0, 'actual_hours': 0})
+        load['specs'] += 1
+        load['open_specs'] += status not in CLOSED_STATUSES
+        load['estimated_hours'] += estimated
+        load['actual_hours'] += actual
+
+        # Weekly velocity; a commit or PR linked to several specs is counted once
+        week = get_week_start(get_spec_created_date(metadata))
+        if week:
+            weeks[week]['specs'] += 1
+        for commit in commits:
+            week = get_week_start(commit.get('date', ''))
+            if week:
+                weeks[week]['commits'].add(commit.get('full_hash') or commit.get('hash'))
+        for pr in prs:
+            week = get_week_start(pr.get('merge_date', ''))
+            if week:
+                weeks[week]['prs'].add(pr.get('pr_number'))
+
+        rows.append({
+            'id': metadata.get('spec_id', ''),
+            'url': f'engineering/specs/{metadata["filename"]}',
+            'status': status,
+            'priority': metadata.get('priority', 'medium'),
+            'assignee': assignee,
+            'estimated_hours': estimated,
+            'actual_hours': actual,
+            'commits': len(commits),
+            'prs': len(prs),
+            'updated': metadata.get('last_updated', '')
+        })
+
+    return {
+        'totals': {
+            'specs': len(rows),
+            'commits': total_commits,
+            'prs': total_prs,
+            'estimated_hours': sum(row['estimated_hours'] for row in rows),
+            'actual_hours': sum(row['actual_hours'] for row in rows)
+        },
+        'status_counts': dict(status_counts),
+        'priority_counts': dict(priority_counts),
+        'category_counts': dict(category_counts),
+        'hours_by_status': dict(hours_by_status),
+        'assignees': sorted(assignees.values(), key=lambda load: (-load['open_specs'], load['assignee'])),
+        'velocity': [{
+            'week': week,
+            'specs': weeks[week]['specs'],
+            'commits': len(weeks[week]['commits']),
+            'prs': len(weeks[week]['prs'])
+        } for week in sorted(weeks)],
+        'columns': DASHBOARD_COLUMNS,
+        'rows': [[row[column] for column in DASHBOARD_COLUMNS] for row in rows],
+        # Ascending row order per sortable column
+        'orderings': {column: sorted(range(len(rows)), key=lambda i: key(rows[i]))
+                      for column, key in DASHBOARD_SORT_KEYS.items()}
+    }
 
-    # Get recent activity
-    recent_specs = sorted(spec_metadata_collection,
-                         key=lambda x: x.get('last_updated', ''),
-                         reverse=True)[:5]
+def generate_dashboard_stats(spec_metadata_collection):
+    """Write dashboard-stats.json so the dashboard doesn't need the full search index."""
+    stats = compute_dashboard_stats(spec_metadata_collection)
+    write_if_changed(DASHBOARD_STATS_PATH, json.dumps(stats, separators=(',', ':')))
+    print(f"Generated dashboard stats for {stats['totals']['specs']} specs "
+          f"over {len(stats['velocity'])} weeks")
+    return stats
+
+def format_dashboard_date(date_string):
+    """Format a YYYY-MM-DD[THH:MM...] date as e.g. 'Oct 5, 2025' for the dashboard table."""
+    if not date_string:
+        return '-'
+    try:
+        day = date.fromisoformat(date_string[:10])
+    except ValueError:
+        return html.escape(date_string)
+    return f"{day:%b} {day.day}, {day.year}"
+
+def render_dashboard_summary(stats):
+    """Render the totals cards, assignee load and recent velocity as HTML."""
+    totals = stats['totals']
+    cards = [
+        ('Specs', totals['specs']),
+        ('Commits', totals['commits']),
+        ('Pull Requests', totals['prs']),
+        ('Hours (actual / est.)', f"{totals['actual_hours']} / {totals['estimated_hours']}")
+    ]
+    card_html = ''.join(f"""
+        <div class="summary-card">
+            <div class="summary-value">{value}</div>
+            <div class="summary-label">{label}</div>
+        </div>""" for label, value in cards)
+
+    assignee_rows = ''.join(f"""
+                <tr><td>{html.escape(str(load['assignee'] or '-'))}</td><td>{load['open_specs']} / {load['specs']}</td><td>{load['actual_hours']} / {load['estimated_hours']}</td></tr>"""
+                            for load in stats['assignees'])
+    velocity_rows = ''.join(f"""
+                <tr><td>{week['week']}</td><td>{week['specs']}</td><td>{week['commits']}</td><td>{week['prs']}</td></tr>"""
+                            for week in reversed(stats['velocity'][-DASHBOARD_VELOCITY_WEEKS:]))
+
+    return f"""<div id="dashboard-summary" class="dashboard-summary">
+    <div class="summary-cards">{card_html}
+    </div>
+    <div class="summary-tables">
+        <table class="summary-table">
+            <thead><tr><th>Assignee</th><th>Open / Specs</th><th>Hours (actual / est.)</th></tr></thead>
+            <tbody>{assignee_rows}
+            </tbody>
+        </table>
+        <table class="summary-table">
+            <thead><tr><th>Week of</th><th>New Specs</th><th>Commits</th><th>PRs</th></tr></thead>
+            <tbody>{velocity_rows}
+            </tbody>
+        </table>
+    </div>
+</div>"""
+
+def render_dashboard_rows(stats):
+    """Render the spec table rows, newest first.
+
+    Each row carries its index into stats['rows'] so dashboard.js can show
+    the rows in the precomputed orderings.
+    """
+    columns = {column: i for i, column in enumerate(stats['columns'])}
+    lines = []
+    for index in reversed(stats['orderings']['updated']):
+        row = stats['rows'][index]
+        spec_id = html.escape(row[columns['id']])
+        badge = generate_state_badge_html(row[columns['status']], row[columns['priority']])
+        lines.append(
+            f'<tr class="spec-row" data-index="{index}" data-spec-id="{spec_id}">'
+            f'<td class="spec-id"><a href="../../{html.escape(row[columns["url"]])}">{spec_id}</a></td>'
+            f'<td class="spec-status">{" ".join(badge.split())}</td>'
+            f'<td class="spec-commits">{row[columns["commits"]]}</td>'
+            f'<td class="spec-prs">{row[columns["prs"]]}</td>'
+            f'<td class="spec-updated">{format_dashboard_date(row[columns["updated"]])}</td>'
+            f'</tr>')
+    return '\n            '.join(lines)
+
+def generate_spec_dashboard(stats, assets=None):
+    """Generate the spec dashboard with its summary and table rendered in place.
+
+    stats is the data set written to dashboard-stats.json (see
+    compute_dashboard_stats). assets maps asset reference paths to their
+    content-hashed names (see publish_assets); unpublished assets are linked by
+    their source path.
+    """
+    assets = assets or {}
+    dashboard_path = Path('mkdocs-docs/engineering/dashboard.md')
+    dashboard_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Generate dashboard content with simplified table view
+    d3_reference = 'assets/js/vendor/d3.min.js'
+    if d3_reference in assets:
+        d3_url = f'../../{assets[d3_reference]}'
+    else:
+        print(f"Warning: No vendored D3 bundle, linking {D3_CDN_URL} instead "
+              f"(run mkdocs-scripts/vendor-d3.py)")
+        d3_url = D3_CDN_URL
+
+    # The table is complete without JavaScript; dashboard.js adds sorting and
+    # keeps only the visible rows in the page
     content = f"""# 📊 NextPM Spec Dashboard
 
+{render_dashboard_summary(stats)}
+
 ## 📋 Spec Table
 
 <div class="specs-table-container">
@@ -898,11 +1470,11 @@ def generate_spec_dashboard(spec_metadata_collection):
                 <th data-sort="status" class="sortable">Status</th>
                 <th data-sort="commits" class="sortable">Commits</th>
                 <th data-sort="prs" class="sortable">PRs</th>
-                <th data-sort="updated" class="sortable">Last Updated</th>
+                <th data-sort="updated" class="sortable sort-desc">Last Updated</th>
             </tr>
         </thead>
         <tbody id="specs-table-body">
-            <!-- Table rows will be populated by JavaScript from search-index.json -->
+            {render_dashboard_rows(stats)}
         </tbody>
     </table>
 </div>
@@ -916,19 +1488,20 @@ def generate_spec_dashboard(spec_metadata_collection):
 </div>
 
 <!-- Dashboard Styles and JavaScript -->
-<link rel="stylesheet" href="../../assets/css/dashboard.css?v=10">
-<script src="../../assets/js/dashboard.js?v=6"></script>
-<script src="https://d3js.org/d3.v7.min.js"></script>
-<script src="../../assets/js/activity-graph.js?v=3"></script>
+<link rel="stylesheet" href="../../{assets.get('assets/css/dashboard.css', 'assets/css/dashboard.css')}">
+<script src="../../{assets.get('assets/js/virtual-list.js', 'assets/js/virtual-list.js')}"></script>
+<script src="../../{assets.get('assets/js/dashboard.js', 'assets/js/dashboard.js')}"></script>
+<script src="{d3_url}"></script>
+<script src="../../{assets.get('assets/js/activity-graph.js', 'assets/js/activity-graph.js')}"></script>
 """
 
-    with open(dashboard_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    print("Generated interactive dashboard")
+    if write_if_changed(dashboard_path, content):
+        print("Generated interactive dashboard")
+    else:
+        print("Dashboard unchanged")
     return dashboard_path
 
-def generate_spec_navigation(spec_files, spec_metadata_collection):
+def generate_spec_navigation(spec_files, spec_metadata_collection, documents):
     """Generate navigation entries for specs with status indicators."""
     nav_entries = []
 
@@ -939,8 +1512,7 @@ def generate_spec_navigation(spec_files, spec_metadata_collection):
     sorted_files = sorted(spec_files, key=get_spec_sort_key)
 
     for filename in sorted_files:
-        source_path = Path('engineering/specs') / filename
-        title = extract_title_from_spec(source_path)
+        title = documents[filename].title
 
         # Add status indicator to navigation title
         metadata = metadata_map.get(filename, {})
@@ -963,40 +1535,28 @@ def generate_spec_navigation(spec_files, spec_metadata_collection):
 
     return nav_entries
 
-def update_mkdocs_nav(spec_nav_entries):
-    """Update mkdocs.yml with new spec navigation using simple replacement."""
-    mkdocs_file = Path('mkdocs.yml')
-
-    if not mkdocs_file.exists():
-        raise FileNotFoundError("mkdocs.yml not found")
-
-    # Read the entire file
-    with open(mkdocs_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Build the specs navigation section
-    specs_nav_lines = [
-        "      - Specs:",
-        "          - Overview: engineering/specs/index.md"
-    ]
-
-    for entry in spec_nav_entries:
-        for title, path in entry.items():
-            specs_nav_lines.append(f"          - {title}: {path}")
-
-    specs_section = "\n".join(specs_nav_lines)
-
-    # Replace just the Specs section content
-    # Find the pattern: "      - Specs:" followed by its content until the next section
-    specs_pattern = r'      - Specs:.*?(?=\n      - PM Workflows \(Legacy\):)'
-
-    updated_content = re.sub(specs_pattern, specs_section, content, flags=re.DOTALL)
-
-    # Write back to file
-    with open(mkdocs_file, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
-
-    print("Updated mkdocs.yml navigation")
+def insert_specs_nav(nav, spec_nav_entries):
+    """Return a copy of an MkDocs nav with the Specs section filled in, and whether it was found.
+
+    The Specs section of mkdocs.yml only lists the overview page; the spec
+    entries are added in memory by spec_hooks.py when MkDocs loads its config.
+    """
+    found = False
+
+    def fill(items):
+        nonlocal found
+        filled = []
+        for item in items:
+            if isinstance(item, dict):
+                item = {title: fill(value) if isinstance(value, list) else value
+                        for title, value in item.items()}
+                if isinstance(item.get(SPECS_NAV_TITLE), list):
+                    item[SPECS_NAV_TITLE] = [{'Overview': SPECS_INDEX_PAGE}] + spec_nav_entries
+                    found = True
+            filled.append(item)
+        return filled
+
+    return fill(nav), found
 
 def create_specs_index():
     """Create an index page for the specs section."""
@@ -1026,81 +1586,228 @@ This section contains the complete PM specifications for NextPM features. These
 All specs automatically track related commits and pull requests in their development timeline.
 """
 
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    print("Created specs index page")
-
-def update_mkdocs_nav(spec_nav_entries):
-    """Update mkdocs.yml with new spec navigation using simple replacement."""
-    mkdocs_file = Path('mkdocs.yml')
-
-    if not mkdocs_file.exists():
-        raise FileNotFoundError("mkdocs.yml not found")
-
-    # Read the entire file
-    with open(mkdocs_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Build the specs navigation section
-    specs_nav_lines = [
-        "      - Specs:",
-        "          - Overview: engineering/specs/index.md"
+    if write_if_changed(index_path, content):
+        print("Created specs index page")
+    else:
+        print("Specs index page unchanged")
+    return index_path
+
+def parse_args():
+    """Parse command line options for the spec build."""
+    parser = argparse.ArgumentParser(description="Build NextPM specs into the MkDocs site.")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore and don't update the build caches under .cache/nextpm/")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="number of specs to process in parallel (0 = one per CPU)")
+    parser.add_argument('--profile', nargs='?', const=str(build_profile.PROFILE_PATH), metavar='PATH',
+                        help="report time, subprocesses, I/O and memory per stage and per spec, "
+                             f"and write the report as JSON (default: {build_profile.PROFILE_PATH})")
+    parser.add_argument('--critical-path', action='store_true',
+                        help="print the longest chain of dependent build stages and how long it took")
+    parser.add_argument('--git-backend', choices=sorted(git_history.HISTORY_BACKENDS), default='cli',
+                        help="read the git history by running git (cli, the default) or by reading "
+                             ".git directly without starting any process (python)")
+    args = parser.parse_args()
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+def fingerprint_stage_input(value):
+    """hash_content() for stage inputs; a SpecDocument counts as the hash of its source."""
+    if isinstance(value, (str, bytes)):
+        return hash_content(value)
+    return hash_content(json.dumps(value, sort_keys=True, default=lambda obj: (
+        obj.source_hash if isinstance(obj, SpecDocument) else str(obj))))
+
+def source_stages(use_cache, jobs, git_backend, in_memory):
+    """Stages that read the git history and the spec sources (they keep caches of their own)."""
+    def build_spec_pages(git_index):
+        if use_cache:
+            FRAGMENT_CACHE.load(get_generator_fingerprint())
+            load_frontmatter_cache()
+        link_rewriter = load_link_rewriter()
+        spec_files, spec_metadata, documents = copy_specs_to_docs(use_cache=use_cache, jobs=jobs,
+                                                                  git_index=git_index,
+                                                                  link_rewriter=link_rewriter,
+                                                                  write_pages=not in_memory)
+        if use_cache:
+            save_frontmatter_cache()
+        print(f"Processed {len(spec_files)} spec files with state management")
+        print_link_rewrite_hits(link_rewriter)
+        return link_rewriter, spec_files, spec_metadata, documents
+
+    return [
+        stage_scheduler.Stage(
+            'git history', 'Reading git history',
+            lambda: build_git_index(use_cache=use_cache, backend=git_backend),
+            outputs=['git_index'], cache=False),
+        stage_scheduler.Stage(
+            'spec pages', 'Copying and processing spec files', build_spec_pages,
+            inputs=['git_index'], outputs=['link_rewriter', 'spec_files', 'spec_metadata', 'documents'],
+            cache=False),
     ]
 
-    for entry in spec_nav_entries:
-        for title, path in entry.items():
-            specs_nav_lines.append(f"          - {title}: {path}")
-
-    specs_section = "\n".join(specs_nav_lines)
-
-    # Replace just the Specs section content
-    # Find the pattern: "      - Specs:" followed by its content until the next section
-    specs_pattern = r'      - Specs:.*?(?=\n      - PM Workflows \(Legacy\):)'
-
-    updated_content = re.sub(specs_pattern, specs_section, content, flags=re.DOTALL)
-
-    # Write back to file
-    with open(mkdocs_file, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
-
-    print("Updated mkdocs.yml navigation")
-
-def create_specs_index():
-    """Create an index page for the specs section."""
-    index_path = Path('mkdocs-docs/engineering/specs/index.md')
-    index_path.parent.mkdir(parents=True, exist_ok=True)
-
-    content = """# Specifications
-
-This section contains the complete PM specifications for NextPM features. These are the single source of truth for all feature planning and requirements.
-
-## About These Specs
-
-- **Source**: Files are automatically published from `engineering/specs/` directory
-- **Format**: Each spec follows the NextPM specification template
-- **Workflow**: PMs work directly on these files - no manual copying required
-- **Navigation**: This page and navigation are auto-generated during build
-
-## Spec Naming Convention
+def corpus_stages():
+    """Stages that turn the processed specs into the navigation, indexes and dashboard."""
+    def generate_dev_workflows(spec_metadata, documents):
+        generated_workflows = auto_generate_dev_workflow(spec_metadata, documents)
+        if generated_workflows:
+            print(f"Generated {len(generated_workflows)} dev workflow summaries")
+        else:
+            print("No dev workflows generated (no commits found)")
+        return generated_workflows
 
-- **Format**: `YYYYMMDD-short-description.md`
-- **Example**: `20260213-authentication.md`
+    def generate_search(spec_metadata, documents):
+        search_index_path = generate_search_index(spec_metadata, documents)
+        print(f"Search index available at: {search_index_path}")
+        return str(search_index_path)
 
-**Legacy Format (Deprecated)**: `YYYY-MM-DD-nn-long-descriptive-name.md`
+    def generate_timeline(spec_metadata, documents):
+        timeline_path = generate_activity_timeline(spec_metadata, documents)
+        print(f"Activity timeline available at: {timeline_path}")
+        return str(timeline_path)
+
+    return [
+        stage_scheduler.Stage(
+            'navigation', 'Generating enhanced navigation', generate_spec_navigation,
+            inputs=['spec_files', 'spec_metadata', 'documents'], outputs=['nav']),
+        stage_scheduler.Stage(
+            'specs index', 'Creating specs index', lambda: str(create_specs_index()),
+            outputs=['specs_index']),
+        stage_scheduler.Stage(
+            'dev workflows', 'Generating automated dev workflows', generate_dev_workflows,
+            inputs=['spec_metadata', 'documents'], outputs=['dev_workflows']),
+        stage_scheduler.Stage(
+            'search index', 'Generating search index', generate_search,
+            inputs=['spec_metadata', 'documents'], outputs=['search_index']),
+        stage_scheduler.Stage(
+            'activity timeline', 'Generating activity timeline', generate_timeline,
+            inputs=['spec_metadata', 'documents'], outputs=['timeline']),
+        stage_scheduler.Stage(
+            'dashboard stats', 'Generating dashboard stats', generate_dashboard_stats,
+            inputs=['spec_metadata'], outputs=['dashboard_stats']),
+        # publish_assets() reads the stats and timeline files, and the loaders next to them
+        stage_scheduler.Stage(
+            'assets', 'Publishing dashboard assets', lambda stats, timeline: publish_assets(),
+            inputs=['dashboard_stats', 'timeline'], outputs=['assets'],
+            files=[source for source, _ in PUBLISHED_ASSETS]),
+        stage_scheduler.Stage(
+            'dashboard', 'Generating interactive dashboard',
+            lambda stats, assets: str(generate_spec_dashboard(stats, assets)),
+            inputs=['dashboard_stats', 'assets'], outputs=['dashboard']),
+    ]
 
-## Implementation Tracking
+def run_stages(stages, use_cache, values=None, critical_path=False):
+    """Run build stages through the scheduler and return all their values."""
+    scheduler = stage_scheduler.StageScheduler(
+        stages, state_path=STAGE_STATE_PATH if use_cache else None,
+        generator=get_generator_fingerprint(), fingerprint=fingerprint_stage_input)
+    values = scheduler.run(values)
+    if critical_path:
+        scheduler.print_critical_path()
+    return values
+
+def run_build(use_cache=True, jobs=1, git_backend='cli', in_memory=False, critical_path=False):
+    """Run every build stage and return the in-memory build state.
+
+    The stages (see source_stages and corpus_stages) run as soon as their
+    inputs are ready, so independent ones overlap, and stages whose inputs are
+    unchanged since the last build are skipped. critical_path prints the
+    longest chain of dependent stages afterwards.
+
+    The returned state (specs, parsed documents, git index, nav) is what
+    rebuild_specs() needs to update single specs without a full rebuild.
+    in_memory is for the MkDocs hooks (spec_hooks.py): spec pages are
+    rendered while MkDocs builds them instead of being written to disk.
+    The nav is never written; the hooks add it to the MkDocs config.
+    """
+    values = run_stages(source_stages(use_cache, jobs, git_backend, in_memory) + corpus_stages(),
+                        use_cache, critical_path=critical_path)
+
+    print_fragment_cache_stats()
+    if use_cache:
+        FRAGMENT_CACHE.save(get_generator_fingerprint())
+
+    return {
+        'use_cache': use_cache,
+        'in_memory': in_memory,
+        'git_index': values['git_index'],
+        'link_rewriter': values['link_rewriter'],
+        'spec_files': values['spec_files'],
+        'spec_metadata': values['spec_metadata'],
+        'documents': values['documents'],
+        'nav': values['nav']
+    }
 
-All specs automatically track related commits and pull requests in their development timeline.
-"""
+def rebuild_specs(state, changed_files):
+    """Rebuild only the given spec files and refresh the corpus-wide outputs from memory.
 
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    Used by the serve.py watch mode: parsed specs and the git index stay in
+    memory, so an edit re-processes the touched spec only. The corpus stages
+    (dashboard, search index, timeline, ...) run again on the in-memory
+    metadata, and the navigation is refreshed in the state for the hooks to
+    pick up.
+    A spec with invalid frontmatter keeps its previous output; its errors are
+    raised once everything else is up to date.
+    """
+    global BUILD_TIMESTAMP
+    BUILD_TIMESTAMP = datetime.now().isoformat()
 
-    print("Created specs index page")
+    source_dir = Path('engineering/specs')
+    target_dir = Path('mkdocs-docs/engineering/specs')
+    git_index = state['git_index']
+    documents = state['documents']
+    metadata_by_file = {metadata['filename']: metadata for metadata in state['spec_metadata']}
+
+    generator = get_generator_fingerprint()
+    manifest = load_build_manifest(generator) if state['use_cache'] else {}
+
+    failed = []
+    for filename in sorted(changed_files):
+        spec_path = source_dir / filename
+        if spec_path.exists():
+            result = build_spec(spec_path, target_dir, git_index, state['link_rewriter'], manifest.get(filename),
+                                write_page=not state['in_memory'])
+            if isinstance(result, spec_frontmatter.FrontmatterError):
+                failed.append(result)
+                continue
+            document, metadata, entry, was_rebuilt = result
+            documents[filename] = document
+            metadata_by_file[filename] = metadata
+            manifest[filename] = entry
+            if was_rebuilt:
+                print(f"Rebuilt: {filename} (Status: {metadata.get('status', 'draft')})")
+        else:
+            documents.pop(filename, None)
+            metadata_by_file.pop(filename, None)
+            manifest.pop(filename, None)
+            target_file = target_dir / filename
+            if target_file.exists():
+                target_file.unlink()
+                print(f"Removed stale spec output: {filename}")
+
+    state['spec_files'] = sorted(metadata_by_file)
+    state['spec_metadata'] = [metadata_by_file[filename] for filename in state['spec_files']]
+    if state['use_cache']:
+        save_build_manifest(generator, manifest)
+
+    values = run_stages(corpus_stages(), state['use_cache'], values={
+        'spec_files': state['spec_files'],
+        'spec_metadata': state['spec_metadata'],
+        'documents': documents
+    })
+    state['nav'] = values['nav']
+    if state['use_cache']:
+        FRAGMENT_CACHE.save(generator)
+        save_frontmatter_cache()
+
+    raise_frontmatter_errors(failed)
+    return state
 
 def main():
     """Enhanced build process with state management and dashboard generation."""
+    args = parse_args()
+
     print("NextPM Enhanced Spec Build Process")
     print("=" * 40)
 
@@ -1112,44 +1819,13 @@ def main():
 
         print(f"Working directory: {os.getcwd()}")
 
-        # Step 1: Copy specs to docs directory with enhanced processing
-        print("\n1. Copying and processing spec files...")
-        spec_files, spec_metadata = copy_specs_to_docs()
-        print(f"Processed {len(spec_files)} spec files with state management")
-
-        # Step 2: Generate dashboard
-        print("\n2. Generating interactive dashboard...")
-        generate_spec_dashboard(spec_metadata)
+        if args.profile:
+            build_profile.enable()
 
-        # Step 3: Generate navigation with status indicators
-        print("\n3. Generating enhanced navigation...")
-        spec_nav = generate_spec_navigation(spec_files, spec_metadata)
-
-        # Step 4: Update mkdocs.yml
-        print("\n4. Updating mkdocs.yml...")
-        update_mkdocs_nav(spec_nav)
-
-        # Step 5: Create index page
-        print("\n5. Creating specs index...")
-        create_specs_index()
-
-        # Step 6: Generate automated dev workflows
-        print("\n6. Generating automated dev workflows...")
-        generated_workflows = auto_generate_dev_workflow(spec_metadata)
-        if generated_workflows:
-            print(f"Generated {len(generated_workflows)} dev workflow summaries")
-        else:
-            print("No dev workflows generated (no commits found)")
-
-        # Step 7: Generate search index for client-side search
-        print("\n7. Generating search index...")
-        search_index_path = generate_search_index(spec_metadata)
-        print(f"Search index available at: {search_index_path}")
-
-        # Step 8: Generate activity timeline for D3.js visualization
-        print("\n8. Generating activity timeline...")
-        timeline_path = generate_activity_timeline(spec_metadata)
-        print(f"Activity timeline available at: {timeline_path}")
+        state = run_build(use_cache=not args.no_cache, jobs=args.jobs, git_backend=args.git_backend,
+                          critical_path=args.critical_path)
+        spec_files = state['spec_files']
+        spec_metadata = state['spec_metadata']
 
         print("\nEnhanced build completed successfully!")
         print(f"Published {len(spec_files)} specifications with visual timelines")
@@ -1164,9 +1840,16 @@ def main():
         for status, count in status_counts.items():
             print(f"  {status.replace('-', ' ').title()}: {count}")
 
+        if args.profile:
+            build_profile.report(args.profile, jobs=args.jobs, use_cache=not args.no_cache,
+                                 spec_count=len(spec_files))
+
+    except spec_frontmatter.FrontmatterError as e:
+        print(f"\nBuild failed: {e}")
+        sys.exit(1)
     except Exception as e:
         print(f"\nBuild failed: {e}")
         raise
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,39 +1,37 @@
 #!/usr/bin/env python3
 """
-Build wrapper that runs build-specs.py before building the site.
+Build wrapper that builds the site, specs included.
 Usage: python mkdocs-scripts/build.py [additional mkdocs build arguments]
+
+MkDocs runs in this process. The specs are built by the hooks in
+spec_hooks.py (enabled in mkdocs.yml) while MkDocs loads its config, so no
+separate build-specs.py run is needed first.
 """
 
-import subprocess
 import sys
 import os
 from pathlib import Path
 
+from mkdocs.__main__ import cli
+
 def main():
     # Change to project root
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     os.chdir(project_root)
 
-    print("Building specifications...")
-    try:
-        # Run build-specs.py
-        result = subprocess.run([sys.executable, "mkdocs-scripts/build-specs.py"], check=True)
-        print("Specifications built successfully!")
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to build specifications: {e}")
-        sys.exit(1)
-
-    print("\nBuilding MkDocs site...")
+    print("Building MkDocs site with specifications...")
     # Build mkdocs with any additional arguments passed to this script
-    mkdocs_args = ["mkdocs", "build"] + sys.argv[1:]
+    mkdocs_args = ["build"] + sys.argv[1:]
 
     try:
-        result = subprocess.run(mkdocs_args, check=True)
-        print("Site built successfully!")
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to build site: {e}")
-        sys.exit(1)
+        cli.main(args=mkdocs_args, prog_name="mkdocs")
+    except SystemExit as e:
+        # The mkdocs command line always exits; a non-zero code (or message) means the build failed
+        if e.code:
+            print(f"Failed to build site: {e.code}")
+            sys.exit(1)
+    print("Site built successfully!")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,248 @@
+"""
+Optional profiling for the NextPM spec build (build-specs.py --profile).
+
+Build stages and individual specs are measured with the `stage()` and
+`spec()` context managers. The git wrappers and file helpers report their
+subprocess time and bytes read/written through `record_subprocess()`,
+`record_read()` and `record_write()`. All of these are no-ops until
+`enable()` is called, so an unprofiled build pays nothing for them.
+
+Everything that happens while a stage is running (on any thread) counts
+towards it; stages that the scheduler runs concurrently (see
+stage_scheduler.py) therefore share the work done while they overlap. Specs
+may be built in parallel, so their counters only pick up work done on the
+spec's own thread, and their CPU time is thread CPU time.
+
+Memory is only known for the whole process (its peak RSS), so a stage or spec
+reports how much it raised that peak ("rss growth"); work that fits in memory
+the process already reached shows as 0. The process peak itself is reported
+once for the build.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is then not reported
+    resource = None
+
+PROFILE_PATH = Path('.cache/nextpm/build-profile.json')
+PROFILE_VERSION = 2
+
+# Number of slowest specs shown in the printed report (the JSON has all of them)
+REPORT_SPEC_LIMIT = 15
+
+_profiler = None
+
+
+def _peak_rss():
+    """Peak resident set size of this process so far, in bytes (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+class _Record:
+    """Counters for one stage or spec."""
+
+    def __init__(self, name, cpu_clock):
+        self.name = name
+        self.cpu_clock = cpu_clock
+        self.subprocess_count = 0
+        self.subprocess_seconds = 0.0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.rss_growth = None
+        self._wall_start = time.perf_counter()
+        self._cpu_start = cpu_clock()
+        self._rss_start = _peak_rss()
+
+    def finish(self):
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.cpu_seconds = self.cpu_clock() - self._cpu_start
+        peak = _peak_rss()
+        if peak is not None:
+            self.rss_growth = peak - self._rss_start
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'wall_seconds': round(self.wall_seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'subprocess_count': self.subprocess_count,
+            'subprocess_seconds': round(self.subprocess_seconds, 6),
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'peak_rss_growth_bytes': self.rss_growth
+        }
+
+
+class BuildProfiler:
+    """Collects per-stage and per-spec measurements for one build."""
+
+    def __init__(self):
+        self.stages = []
+        self.specs = []
+        self.total = _Record('total', time.process_time)
+        self._open_stages = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _targets(self):
+        """Records that work on the current thread counts towards."""
+        return [self.total] + self._open_stages + getattr(self._local, 'specs', [])
+
+    def add(self, **counters):
+        with self._lock:
+            for record in self._targets():
+                for name, value in counters.items():
+                    setattr(record, name, getattr(record, name) + value)
+
+    @contextmanager
+    def stage(self, name):
+        record = _Record(name, time.process_time)
+        with self._lock:
+            self._open_stages.append(record)
+            # Listed in start order; concurrent stages finish in any order
+            self.stages.append(record)
+        try:
+            yield record
+        finally:
+            record.finish()
+            with self._lock:
+                self._open_stages.remove(record)
+
+    @contextmanager
+    def spec(self, name):
+        record = _Record(name, time.thread_time)
+        if not hasattr(self._local, 'specs'):
+            self._local.specs = []
+        specs = self._local.specs
+        specs.append(record)
+        try:
+            yield record
+        finally:
+            record.finish()
+            specs.remove(record)
+            with self._lock:
+                self.specs.append(record)
+
+    def to_dict(self, **details):
+        self.total.finish()
+        return {
+            'version': PROFILE_VERSION,
+            'generated': datetime.now().isoformat(),
+            **details,
+            'process_peak_rss_bytes': _peak_rss(),
+            'total': self.total.to_dict(),
+            'stages': [record.to_dict() for record in self.stages],
+            'specs': [record.to_dict() for record in sorted(self.specs, key=lambda r: r.name)]
+        }
+
+
+def enable():
+    """Start profiling the current build."""
+    global _profiler
+    _profiler = BuildProfiler()
+    return _profiler
+
+
+@contextmanager
+def stage(name):
+    """Measure a build stage (no-op unless profiling is enabled)."""
+    if _profiler is None:
+        yield None
+    else:
+        with _profiler.stage(name) as record:
+            yield record
+
+
+@contextmanager
+def spec(name):
+    """Measure the work for one spec on the current thread (no-op unless profiling is enabled)."""
+    if _profiler is None:
+        yield None
+    else:
+        with _profiler.spec(name) as record:
+            yield record
+
+
+def record_subprocess(seconds):
+    """Count one finished subprocess and the wall time it took."""
+    if _profiler is not None:
+        _profiler.add(subprocess_count=1, subprocess_seconds=seconds)
+
+
+def record_read(size):
+    if _profiler is not None:
+        _profiler.add(bytes_read=size)
+
+
+def record_write(size):
+    if _profiler is not None:
+        _profiler.add(bytes_written=size)
+
+
+def _format_bytes(size):
+    if size is None:
+        return '-'
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GB'
+
+
+def _print_table(title, rows):
+    headers = [title, 'wall s', 'cpu s', 'procs', 'proc s', 'read', 'written', 'rss growth']
+    lines = [[
+        row['name'],
+        f"{row['wall_seconds']:.3f}",
+        f"{row['cpu_seconds']:.3f}",
+        str(row['subprocess_count']),
+        f"{row['subprocess_seconds']:.3f}",
+        _format_bytes(row['bytes_read']),
+        _format_bytes(row['bytes_written']),
+        _format_bytes(row['peak_rss_growth_bytes'])
+    ] for row in rows]
+
+    widths = [max(len(line[i]) for line in [headers] + lines) for i in range(len(headers))]
+    for line in [headers] + lines:
+        print('  '.join(cell.ljust(widths[i]) if i == 0 else cell.rjust(widths[i])
+                        for i, cell in enumerate(line)))
+
+
+def report(path=PROFILE_PATH, **details):
+    """Print the profile tables and write them as JSON to path."""
+    if _profiler is None:
+        return None
+
+    profile = _profiler.to_dict(**details)
+
+    print("\nBuild profile")
+    print("-" * 40)
+    _print_table('Stage', profile['stages'] + [profile['total']])
+    print(f"Process peak RSS: {_format_bytes(profile['process_peak_rss_bytes'])}")
+
+    slowest = sorted(profile['specs'], key=lambda row: row['wall_seconds'], reverse=True)
+    if slowest:
+        print()
+        shown = slowest[:REPORT_SPEC_LIMIT]
+        _print_table(f'Spec ({len(shown)} of {len(slowest)}, slowest first)', shown)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    print(f"\nProfile written to {path}")
+    return profile
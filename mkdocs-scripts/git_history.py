@@ -0,0 +1,556 @@
+"""
+Single-pass git history index for the NextPM spec build.
+
+Instead of asking git about every spec separately (one `git log --grep` per
+spec, one `git diff-tree` per matching commit, plus branch and merge lookups),
+the build walks the history once and indexes every commit by the spec IDs its
+message references. All per-spec lookups are then served from memory, so the
+cost of a build scales with the size of the history once rather than with
+history size x spec count.
+
+`git log` is read with -z and NUL-separated fields. A commit message can't
+contain NUL, so no subject or body can break the parsing the way the old
+`|||` markers could. The scan doesn't ask for changed files (--name-only
+makes git diff every commit in the history). They are only shown for commits
+that reference a spec, so those are fetched afterwards in one batch through a
+persistent `git diff-tree --stdin` process (see git_session.py).
+
+The history is read through a backend. CliHistoryBackend runs git itself.
+PythonHistoryBackend reads the objects and refs under .git directly (see
+git_repository.py) and never starts a process. Both produce the same commits,
+changed files and branch names, so everything built from them is identical.
+
+The scanned commits are also cached on disk together with the HEAD they were
+read at, so the next build only has to walk the commits that landed since.
+"""
+
+import heapq
+import itertools
+import json
+import os
+import re
+import subprocess
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import build_profile
+from git_repository import GitRepository
+from git_session import GitSession
+
+# `git log -z` output is split on NUL, which separates both the fields of a
+# commit and the commits themselves
+LOG_FIELDS = ['%H', '%P', '%ct', '%ad', '%an', '%s', '%b']
+LOG_FORMAT = '%x00'.join(LOG_FIELDS)
+
+# A spec reference is '#' followed by spec ID characters, e.g. #20260213-build-flow
+SPEC_REF_PATTERN = re.compile(r'#([\w.-]+)')
+# Points inside a reference where a shorter key ends, e.g. #20260213-build-flow.
+# also references 20260213 and 20260213-build-flow
+REF_KEY_BOUNDARY_PATTERN = re.compile(r'[-.]')
+
+# GitHub merge commits: "Merge pull request #12 from owner/branch"
+MERGE_PR_PATTERN = re.compile(r'^Merge pull request #(\d+) from (\S+)\s*(.*)$')
+CO_AUTHOR_PATTERN = re.compile(r'^Co-authored-by:\s*([^<\n]+?)\s*(?:<[^>\n]*>)?\s*$',
+                               re.MULTILINE | re.IGNORECASE)
+
+LEGACY_SPEC_ID_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}-\d{2}$')
+
+RECENT_ACTIVITY_DAYS = 30
+RECENT_ACTIVITY_LIMIT = 5
+
+# Only the first few changed files of a commit are ever displayed
+CHANGED_FILES_LIMIT = 10
+
+GIT_CACHE_PATH = Path('.cache/nextpm/git-index.json')
+GIT_CACHE_VERSION = 3
+
+
+def run_git(args, cwd='.'):
+    """Run a git command and return its stdout, or None if it failed."""
+    started = time.perf_counter()
+    result = subprocess.run(['git'] + args, capture_output=True, text=True,
+                            encoding='utf-8', errors='replace', cwd=cwd)
+    build_profile.record_subprocess(time.perf_counter() - started)
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _iter_fields(stream, chunk_size=65536):
+    """Yield the NUL-separated fields of a text stream without buffering it all."""
+    pending = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        pending += chunk
+        fields = pending.split('\0')
+        pending = fields.pop()
+        yield from fields
+    # The last field isn't followed by a NUL (and may be an empty body)
+    yield pending
+
+
+def _iter_commits(fields):
+    """Group `git log -z --pretty=format:LOG_FORMAT` fields into commit dicts."""
+    fields = iter(fields)
+    for commit_hash in fields:
+        values = [commit_hash] + list(itertools.islice(fields, len(LOG_FIELDS) - 1))
+        if len(values) < len(LOG_FIELDS):
+            break
+
+        _, parents, timestamp, date, author, subject, body = values
+        yield {
+            'hash': commit_hash,
+            'parents': parents.split(),
+            'timestamp': int(timestamp) if timestamp.isdigit() else 0,
+            'date': date,
+            'author': author,
+            'subject': subject,
+            'body': body.strip('\n'),
+        }
+
+
+def scan_history(rev_range='HEAD', cwd='.'):
+    """Stream `git log` once and return every commit as a dict, newest first."""
+    cmd = ['git', 'log', rev_range, '-z', f'--pretty=format:{LOG_FORMAT}', '--date=iso']
+    started = time.perf_counter()
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True, encoding='utf-8', errors='replace', cwd=cwd)
+    commits = list(_iter_commits(_iter_fields(process.stdout)))
+    process.stdout.close()
+
+    returncode = process.wait()
+    build_profile.record_subprocess(time.perf_counter() - started)
+    if returncode != 0:
+        raise RuntimeError(f"git log {rev_range} failed")
+
+    return commits
+
+
+def list_branches(cwd='.'):
+    """List local and remote branches the same way `git branch -a` prints them."""
+    output = run_git(['branch', '-a'], cwd=cwd)
+    if not output:
+        return []
+    return [line.strip(' *') for line in output.strip().split('\n') if line.strip()]
+
+
+def spec_search_keys(spec_id):
+    """Return the reference keys that link a merge commit to a spec.
+
+    PRs may reference either the full spec ID (#20260213-spec-showcase) or just
+    its date part (#20260213); legacy YYYY-MM-DD-nn IDs only match in full.
+    """
+    keys = [spec_id]
+    if '-' in spec_id and not LEGACY_SPEC_ID_PATTERN.match(spec_id):
+        date_part = spec_id.split('-')[0]
+        if len(date_part) == 8 and date_part.isdigit():
+            keys.append(date_part)
+    return keys
+
+
+def parse_pull_request(commit):
+    """Build a PR entry from a GitHub merge commit, or None if it isn't one."""
+    match = MERGE_PR_PATTERN.match(commit['subject'])
+    if not match:
+        return None
+    pr_number, branch, title = match.groups()
+
+    # GitHub puts the PR title on the first line of the body
+    if not title:
+        title = commit['body'].split('\n', 1)[0].strip() or commit['subject']
+
+    return {
+        'pr_number': pr_number,
+        'title': title,
+        'merge_date': commit['date'],
+        'author': commit['author'],
+        'reviewers': CO_AUTHOR_PATTERN.findall(commit['body']),
+        'branch': branch,
+        'merge_commit': commit['hash'][:8],
+        'github_url': f'https://github.com/kangxh75/NextPM/pull/{pr_number}'
+    }
+
+
+def reference_keys(message):
+    """Return every key a commit message references as '#<key>'.
+
+    Besides the full reference, every prefix ending at a '-' or '.' is a key,
+    so #20260213-spec-showcase also references 20260213 and a trailing '.'
+    after a spec ID doesn't hide it.
+    """
+    keys = set()
+    for match in SPEC_REF_PATTERN.finditer(message):
+        token = match.group(1)
+        keys.add(token)
+        for boundary in REF_KEY_BOUNDARY_PATTERN.finditer(token):
+            if boundary.start():
+                keys.add(token[:boundary.start()])
+    return keys
+
+
+class GitHistoryIndex:
+    """In-memory reference key -> commits / PRs index built from one history scan.
+
+    Every commit is indexed once by all the keys its message references, and
+    every merge commit is parsed into a PR once, so looking up a spec (including
+    one added after the index was built) is a dictionary lookup.
+    """
+
+    def __init__(self, commits, branches, now=None):
+        self.commits = commits
+        self.branches = branches
+        self.commits_by_key = {}
+        self.prs_by_key = {}
+
+        since = ((now or datetime.now()) - timedelta(days=RECENT_ACTIVITY_DAYS)).timestamp()
+        self.recent_commits = [commit for commit in commits if commit['timestamp'] >= since]
+
+        for position, commit in enumerate(commits):
+            keys = reference_keys(commit['subject'] + '\n' + commit['body'])
+            if not keys:
+                continue
+            for key in keys:
+                self.commits_by_key.setdefault(key, []).append(commit)
+
+            pr = parse_pull_request(commit) if len(commit['parents']) > 1 else None
+            if pr:
+                for key in keys:
+                    self.prs_by_key.setdefault(key, []).append((position, pr))
+
+    def commits_for(self, spec_id):
+        """Commits whose message references #<spec_id>, newest first."""
+        return [{
+            'hash': commit['hash'][:8],  # Short hash
+            'full_hash': commit['hash'],
+            'date': commit['date'],
+            'message': commit['subject'],
+            'author': commit['author'],
+            'files_changed': commit.get('files_changed', 0),
+            'changed_files': commit.get('files', [])  # Limited to the first 10 files
+        } for commit in self.commits_by_key.get(spec_id, [])]
+
+    def pull_requests_for(self, spec_id):
+        """Merged PRs whose merge commit references the spec ID or its date part, newest first."""
+        prs = {}
+        for key in spec_search_keys(spec_id):
+            prs.update(self.prs_by_key.get(key, []))
+        return [prs[position] for position in sorted(prs)]
+
+    def branches_for(self, spec_id):
+        """Branches containing the spec ID in their name."""
+        return [branch for branch in self.branches if spec_id in branch]
+
+    def recent_activity_for(self, spec_id):
+        """Up to five commits from the last 30 days that mention the spec ID."""
+        recent = []
+        for commit in self.recent_commits:
+            if spec_id in commit['subject'] or spec_id in commit['body']:
+                recent.append({
+                    'hash': commit['hash'][:8],
+                    'date': commit['date'][:10],
+                    'message': commit['subject']
+                })
+                if len(recent) == RECENT_ACTIVITY_LIMIT:
+                    break
+        return recent
+
+
+class CliHistoryBackend:
+    """Reads the history by running git."""
+
+    def __init__(self, cwd='.'):
+        self.cwd = cwd
+        self.session = GitSession(cwd=cwd)
+
+    def resolve_head(self):
+        return self.session.resolve('HEAD')
+
+    def is_ancestor(self, ancestor, commit):
+        return run_git(['merge-base', '--is-ancestor', ancestor, commit], cwd=self.cwd) is not None
+
+    def scan(self, head, exclude=None):
+        """Commits reachable from head but not from exclude, newest first."""
+        return scan_history(f'{exclude}..{head}' if exclude else head, cwd=self.cwd)
+
+    def changed_files(self, commit_ids):
+        return self.session.changed_files(commit_ids)
+
+    def list_branches(self):
+        return list_branches(cwd=self.cwd)
+
+    def close(self):
+        self.session.close()
+
+
+def _decode(data, encoding):
+    try:
+        return data.decode(encoding, 'replace')
+    except LookupError:
+        return data.decode('utf-8', 'replace')
+
+
+def _parse_ident(ident):
+    """Split an 'author'/'committer' header into (name, timestamp, timezone)."""
+    name, _, rest = ident.partition('<')
+    _, _, when = rest.rpartition('>')
+    timestamp, _, timezone = when.strip().partition(' ')
+    return (name.rstrip(),
+            int(timestamp) if timestamp.isdigit() else 0,
+            int(timezone) if timezone.lstrip('+-').isdigit() else 0)
+
+
+def _format_iso_date(timestamp, timezone):
+    """Format a timestamp like `git log --date=iso`, e.g. 2026-02-14 10:00:00 -0500."""
+    hours, minutes = divmod(abs(timezone), 100)
+    offset = timedelta(hours=hours, minutes=minutes) * (-1 if timezone < 0 else 1)
+    local = datetime(1970, 1, 1) + timedelta(seconds=timestamp) + offset
+    return f'{local:%Y-%m-%d %H:%M:%S} {timezone:+05d}'
+
+
+def _split_message(message):
+    """Return (%s, %b) of a commit message the way `git log` formats them.
+
+    The subject is the first paragraph with its lines joined by spaces; the
+    body is everything after the blank lines that follow it.
+    """
+    lines = message.split('\n')
+    position = 0
+    while position < len(lines) and not lines[position].strip():
+        position += 1
+    subject = []
+    while position < len(lines) and lines[position].strip():
+        subject.append(lines[position].rstrip())
+        position += 1
+    while position < len(lines) and not lines[position].strip():
+        position += 1
+    return ' '.join(subject), '\n'.join(lines[position:])
+
+
+class PythonHistoryBackend:
+    """Reads the history straight from .git, without starting any process."""
+
+    def __init__(self, cwd='.'):
+        self.repo = GitRepository(cwd)
+        self._commits = {}
+
+    def _commit(self, oid):
+        """The scan dict for a commit (the same fields scan_history() returns)."""
+        commit = self._commits.get(oid)
+        if commit is None:
+            headers, message = self.repo.read_commit(oid)
+            encoding = headers.get('encoding', [b'utf-8'])[0].decode('ascii', 'replace')
+            author, author_time, author_timezone = _parse_ident(_decode(headers['author'][0], encoding))
+            _, commit_time, _ = _parse_ident(_decode(headers['committer'][0], encoding))
+            subject, body = _split_message(_decode(message, encoding))
+            commit = {
+                'hash': oid,
+                # Shallow clones end at commits whose parents weren't fetched
+                'parents': [] if oid in self.repo.shallow else
+                           [parent.decode('ascii') for parent in headers.get('parent', [])],
+                'timestamp': commit_time,
+                'date': _format_iso_date(author_time, author_timezone),
+                'author': author,
+                'subject': subject,
+                'body': body.strip('\n'),
+                'tree': headers['tree'][0].decode('ascii'),
+            }
+            self._commits[oid] = commit
+        return commit
+
+    def resolve_head(self):
+        return self.repo.resolve_ref('HEAD')
+
+    def _walk(self, heads, hidden_heads=()):
+        """Yield commits reachable from heads but not from hidden_heads, newest commit time first.
+
+        This is the order `git log` lists commits in: a priority queue on
+        commit time, ties broken in insertion order. The walk stops once only
+        hidden commits are left in the queue.
+        """
+        queue = []
+        counter = itertools.count()
+        seen = set()
+        hidden = set()
+        queued = set()
+        interesting = 0
+
+        def push(oid, is_hidden):
+            nonlocal interesting
+            if is_hidden and oid not in hidden:
+                hidden.add(oid)
+                if oid in queued:
+                    interesting -= 1
+            if oid in seen:
+                return
+            seen.add(oid)
+            queued.add(oid)
+            if oid not in hidden:
+                interesting += 1
+            heapq.heappush(queue, (-self._commit(oid)['timestamp'], next(counter), oid))
+
+        for oid in hidden_heads:
+            push(oid, True)
+        for oid in heads:
+            push(oid, False)
+
+        while queue and interesting:
+            _, _, oid = heapq.heappop(queue)
+            queued.discard(oid)
+            is_hidden = oid in hidden
+            if not is_hidden:
+                interesting -= 1
+            commit = self._commit(oid)
+            for parent in commit['parents']:
+                push(parent, is_hidden)
+            if not is_hidden:
+                yield commit
+
+    def is_ancestor(self, ancestor, commit):
+        return any(walked['hash'] == ancestor for walked in self._walk([commit]))
+
+    def scan(self, head, exclude=None):
+        """Commits reachable from head but not from exclude, newest first."""
+        return [{key: value for key, value in commit.items() if key != 'tree'}
+                for commit in self._walk([head], [exclude] if exclude else [])]
+
+    def changed_files(self, commit_ids):
+        """Files each commit changed, like `git diff-tree -r --root --name-only` (nothing for merges)."""
+        files = {}
+        for oid in commit_ids:
+            commit = self._commit(oid)
+            if len(commit['parents']) > 1:
+                files[oid] = []
+                continue
+            parent_tree = self._commit(commit['parents'][0])['tree'] if commit['parents'] else None
+            files[oid] = [path.decode('utf-8', 'replace')
+                          for path in self.repo.diff_tree_paths(parent_tree, commit['tree'])]
+        return files
+
+    def list_branches(self):
+        """Branch names as `git branch -a` prints them (a detached HEAD isn't listed)."""
+        branches = [name[len('refs/heads/'):] for name, _ in self.repo.iter_refs('refs/heads/')]
+        for name, value in self.repo.iter_refs('refs/remotes/'):
+            if value.startswith('ref:'):
+                target = value[len('ref:'):].strip()
+                branches.append(f"{name[len('refs/'):]} -> {target.removeprefix('refs/remotes/')}")
+            else:
+                branches.append(name[len('refs/'):])
+        return branches
+
+    def close(self):
+        self.repo.close()
+        self._commits = {}
+
+
+HISTORY_BACKENDS = {
+    'cli': CliHistoryBackend,
+    'python': PythonHistoryBackend,
+}
+
+
+def _read_history_cache(cache_path):
+    """Load the cached commit list, or None if it is missing or unusable."""
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+        build_profile.record_read(len(data))
+        cache = json.loads(data)
+    except (OSError, ValueError):
+        return None
+
+    if cache.get('version') != GIT_CACHE_VERSION or not cache.get('head'):
+        return None
+    return cache
+
+
+def _write_history_cache(cache_path, head, commits):
+    """Atomically store the scanned commits along with the HEAD they were read at."""
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = cache_path.with_name(cache_path.name + '.tmp')
+    data = json.dumps({
+        'version': GIT_CACHE_VERSION,
+        'head': head,
+        'generated': datetime.now().isoformat(),
+        'commits': commits
+    }, separators=(',', ':')).encode('utf-8')
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    build_profile.record_write(len(data))
+    os.replace(temp_path, cache_path)
+
+
+def add_changed_files(backend, commits):
+    """Attach the changed files to the commits that reference a spec, in one batch."""
+    referencing = [commit for commit in commits
+                   if reference_keys(commit['subject'] + '\n' + commit['body'])]
+    if not referencing:
+        return
+
+    files = backend.changed_files([commit['hash'] for commit in referencing])
+    for commit in referencing:
+        commit['files_changed'] = len(files[commit['hash']])
+        commit['files'] = files[commit['hash']][:CHANGED_FILES_LIMIT]
+
+
+def load_history(backend, cache_path=GIT_CACHE_PATH, use_cache=True):
+    """Return all commits reachable from HEAD, reusing the on-disk cache when possible.
+
+    If the cached HEAD is still an ancestor of the current HEAD, only
+    `cached..HEAD` is scanned and prepended to the cached commits. A full scan
+    only happens on the first build or after history was rewritten. Changed
+    files are only fetched for the newly scanned commits; older ones have
+    them in the cache.
+    """
+    head = backend.resolve_head()
+    if not head:
+        raise RuntimeError("could not resolve HEAD")
+
+    cache = _read_history_cache(cache_path) if use_cache else None
+
+    if cache and cache['head'] == head:
+        print("Git history unchanged since last build, using cache")
+        return cache['commits']
+
+    if cache and backend.is_ancestor(cache['head'], head):
+        new_commits = backend.scan(head, exclude=cache['head'])
+        add_changed_files(backend, new_commits)
+        commits = new_commits + cache['commits']
+        print(f"Scanned {len(new_commits)} new commits since last build")
+    else:
+        if cache:
+            print("Git history was rewritten, rescanning from scratch")
+        commits = backend.scan(head)
+        add_changed_files(backend, commits)
+        print(f"Scanned {len(commits)} commits")
+
+    if use_cache:
+        _write_history_cache(cache_path, head, commits)
+    return commits
+
+
+def build_git_index(use_cache=True, cwd='.', backend='cli'):
+    """Index the history reachable from HEAD by the spec references in its messages.
+
+    backend names one of HISTORY_BACKENDS.
+    """
+    try:
+        history = HISTORY_BACKENDS[backend](cwd=cwd)
+    except Exception as e:
+        print(f"Warning: Could not open git repository: {e}")
+        return GitHistoryIndex([], [])
+
+    try:
+        commits = load_history(history, use_cache=use_cache)
+        branches = history.list_branches()
+    except Exception as e:
+        print(f"Warning: Could not scan git history: {e}")
+        commits = []
+        branches = []
+    finally:
+        history.close()
+
+    return GitHistoryIndex(commits, branches)
@@ -0,0 +1,396 @@
+"""
+Pure-Python reader for the objects and refs of a git repository.
+
+Used by the `python` history backend (build-specs.py --git-backend python) to
+read the history without starting any git process. It understands:
+
+- refs: loose files under refs/ and packed-refs, following symbolic refs
+- loose objects under objects/xx/
+- packfiles through their version 2 .idx files, both memory-mapped, with
+  OFS_DELTA and REF_DELTA objects resolved in Python
+- object directories listed in objects/info/alternates, linked worktrees
+  (a .git file) and shallow clones
+
+Only SHA-1 repositories are supported. Commit graphs, multi-pack indexes and
+bitmaps are optional accelerators for git and are ignored here.
+"""
+
+import mmap
+import re
+import struct
+import zlib
+from pathlib import Path
+
+OBJECT_TYPES = {1: 'commit', 2: 'tree', 3: 'blob', 4: 'tag'}
+OFS_DELTA = 6
+REF_DELTA = 7
+
+IDX_SIGNATURE = b'\xfftOc'
+IDX_VERSION = 2
+OID_SIZE = 20
+
+TREE_MODE = b'40000'
+# A tree is "<mode> <name>\0<20 byte object ID>" repeated
+TREE_ENTRY_PATTERN = re.compile(rb'\d+ [^\0]*\0.{20}', re.DOTALL)
+
+OBJECT_FORMAT_PATTERN = re.compile(r'^\s*objectformat\s*=\s*(\S+)', re.MULTILINE | re.IGNORECASE)
+
+# Bounded caches of resolved delta bases and parsed trees; neighbouring
+# commits share most of their trees and delta chains
+BASE_CACHE_SIZE = 1024
+TREE_CACHE_SIZE = 8192
+
+
+def _map_file(path):
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def apply_delta(base, delta):
+    """Rebuild an object from its delta base and a git pack delta."""
+    def read_size(pos):
+        size = shift = 0
+        while True:
+            byte = delta[pos]
+            pos += 1
+            size |= (byte & 0x7f) << shift
+            shift += 7
+            if not byte & 0x80:
+                return size, pos
+
+    base_size, pos = read_size(0)
+    result_size, pos = read_size(pos)
+    if base_size != len(base):
+        raise ValueError("delta base size mismatch")
+
+    result = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            # Copy a range of the base
+            offset = size = 0
+            for i in range(4):
+                if opcode & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if opcode & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            result += base[offset:offset + (size or 0x10000)]
+        elif opcode:
+            # Insert the next opcode bytes literally
+            result += delta[pos:pos + opcode]
+            pos += opcode
+        else:
+            raise ValueError("invalid delta opcode 0")
+
+    if len(result) != result_size:
+        raise ValueError("delta result size mismatch")
+    return bytes(result)
+
+
+class PackFile:
+    """A packfile and its version 2 index, both memory-mapped."""
+
+    def __init__(self, idx_path):
+        self.idx_path = idx_path
+        self.pack_path = idx_path.with_suffix('.pack')
+        self.idx = _map_file(idx_path)
+        self.data = _map_file(self.pack_path)
+
+        if self.idx[:4] != IDX_SIGNATURE or struct.unpack_from('>I', self.idx, 4)[0] != IDX_VERSION:
+            raise ValueError(f"{idx_path.name}: unsupported pack index version")
+
+        self.fanout = struct.unpack_from('>256I', self.idx, 8)
+        count = self.fanout[255]
+        self._names = 8 + 256 * 4
+        self._offsets = self._names + count * (OID_SIZE + 4)  # Names, then CRC32s
+        self._large_offsets = self._offsets + count * 4
+
+    def find(self, oid):
+        """Offset of an object (20 raw bytes) in the pack, or None."""
+        low = self.fanout[oid[0] - 1] if oid[0] else 0
+        high = self.fanout[oid[0]]
+        while low < high:
+            middle = (low + high) // 2
+            start = self._names + middle * OID_SIZE
+            name = self.idx[start:start + OID_SIZE]
+            if name < oid:
+                low = middle + 1
+            elif name > oid:
+                high = middle
+            else:
+                offset = struct.unpack_from('>I', self.idx, self._offsets + middle * 4)[0]
+                if offset & 0x80000000:
+                    offset = struct.unpack_from('>Q', self.idx,
+                                                self._large_offsets + (offset & 0x7fffffff) * 8)[0]
+                return offset
+        return None
+
+    def entry_header(self, offset):
+        """Return (type number, inflated size, position of the entry data)."""
+        byte = self.data[offset]
+        kind = (byte >> 4) & 7
+        size = byte & 0x0f
+        shift = 4
+        while byte & 0x80:
+            offset += 1
+            byte = self.data[offset]
+            size |= (byte & 0x7f) << shift
+            shift += 7
+        return kind, size, offset + 1
+
+    def delta_base_offset(self, offset, position):
+        """Decode the negative base offset of an OFS_DELTA entry."""
+        byte = self.data[position]
+        distance = byte & 0x7f
+        while byte & 0x80:
+            position += 1
+            byte = self.data[position]
+            distance = ((distance + 1) << 7) | (byte & 0x7f)
+        return offset - distance, position + 1
+
+    def inflate(self, position, size):
+        """Inflate the zlib stream starting at position."""
+        decompressor = zlib.decompressobj()
+        chunks = []
+        chunk_size = max(size + 64, 4096)
+        while not decompressor.eof:
+            compressed = self.data[position:position + chunk_size]
+            if not compressed:
+                raise ValueError(f"{self.pack_path.name}: truncated object")
+            chunks.append(decompressor.decompress(compressed))
+            position += len(compressed)
+        return b''.join(chunks)
+
+    def close(self):
+        self.idx.close()
+        self.data.close()
+
+
+def parse_commit(data):
+    """Split a raw commit into {header: [values]} and the message bytes."""
+    header_block, _, message = data.partition(b'\n\n')
+    headers = {}
+    for line in header_block.split(b'\n'):
+        if line.startswith(b' '):
+            continue  # Continuation of a multi-line header such as gpgsig
+        key, _, value = line.partition(b' ')
+        headers.setdefault(key.decode('ascii', 'replace'), []).append(value)
+    return headers, message
+
+
+def find_git_dir(path):
+    """Locate the .git directory for a working tree path (or a bare repository)."""
+    path = Path(path).resolve()
+    for directory in [path] + list(path.parents):
+        dot_git = directory / '.git'
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            # Linked worktrees and submodules: "gitdir: <path>"
+            target = dot_git.read_text(encoding='utf-8').strip()
+            if target.startswith('gitdir:'):
+                return (directory / target[len('gitdir:'):].strip()).resolve()
+        if (directory / 'HEAD').is_file() and (directory / 'objects').is_dir():
+            return directory
+    raise FileNotFoundError(f"not a git repository: {path}")
+
+
+class GitRepository:
+    """Read-only access to the objects and refs under a .git directory."""
+
+    def __init__(self, path='.'):
+        self.git_dir = find_git_dir(path)
+        commondir = self.git_dir / 'commondir'
+        if commondir.is_file():
+            self.common_dir = (self.git_dir / commondir.read_text(encoding='utf-8').strip()).resolve()
+        else:
+            self.common_dir = self.git_dir
+
+        config = self.common_dir / 'config'
+        if config.is_file():
+            object_format = OBJECT_FORMAT_PATTERN.search(config.read_text(encoding='utf-8', errors='replace'))
+            if object_format and object_format.group(1).lower() != 'sha1':
+                raise ValueError(f"{object_format.group(1)} repositories are not supported")
+
+        self.object_dirs = [self.common_dir / 'objects']
+        alternates = self.common_dir / 'objects' / 'info' / 'alternates'
+        if alternates.is_file():
+            for line in alternates.read_text(encoding='utf-8').splitlines():
+                if line.strip() and not line.startswith('#'):
+                    self.object_dirs.append((self.object_dirs[0] / line.strip()).resolve())
+
+        shallow = self.common_dir / 'shallow'
+        self.shallow = set(shallow.read_text(encoding='ascii').split()) if shallow.is_file() else set()
+
+        self._packs = None
+        self._bases = {}
+        self._trees = {}
+
+    # Refs
+
+    def _packed_refs(self):
+        refs = {}
+        try:
+            lines = (self.common_dir / 'packed-refs').read_text(encoding='utf-8').splitlines()
+        except OSError:
+            return refs
+        for line in lines:
+            if line and not line.startswith(('#', '^')):
+                oid, _, name = line.partition(' ')
+                refs[name] = oid
+        return refs
+
+    def read_ref(self, name):
+        """Raw value of a ref: 'ref: <target>' for symbolic refs, else an object ID (or None)."""
+        for directory in (self.git_dir, self.common_dir):
+            try:
+                return (directory / name).read_text(encoding='utf-8').strip()
+            except (OSError, ValueError):
+                continue
+        return self._packed_refs().get(name)
+
+    def resolve_ref(self, name):
+        """Object ID a ref points at after following symbolic refs, or None."""
+        for _ in range(10):
+            value = self.read_ref(name)
+            if not value or not value.startswith('ref:'):
+                return value
+            name = value[len('ref:'):].strip()
+        return None
+
+    def iter_refs(self, prefix='refs/'):
+        """Yield (ref name, raw value) for every ref under prefix, sorted by name."""
+        refs = {name: oid for name, oid in self._packed_refs().items() if name.startswith(prefix)}
+        root = self.common_dir / prefix
+        if root.is_dir():
+            for path in root.rglob('*'):
+                if path.is_file() and path.suffix != '.lock':
+                    name = prefix + path.relative_to(root).as_posix()
+                    refs[name] = path.read_text(encoding='utf-8').strip()
+        for name in sorted(refs, key=lambda name: name.encode('utf-8')):
+            yield name, refs[name]
+
+    # Objects
+
+    @property
+    def packs(self):
+        if self._packs is None:
+            self._packs = [PackFile(idx_path) for object_dir in self.object_dirs
+                           for idx_path in sorted((object_dir / 'pack').glob('*.idx'))
+                           if idx_path.with_suffix('.pack').is_file()]
+        return self._packs
+
+    def _read_loose(self, oid):
+        for object_dir in self.object_dirs:
+            try:
+                raw = zlib.decompress((object_dir / oid[:2] / oid[2:]).read_bytes())
+            except OSError:
+                continue
+            header, _, data = raw.partition(b'\0')
+            return header.split(b' ')[0].decode('ascii'), data
+        return None
+
+    def _read_packed(self, pack, offset):
+        """Read an object from a pack, applying its delta chain."""
+        chain = []
+        while True:
+            cached = self._bases.get((pack.pack_path, offset))
+            if cached:
+                object_type, data = cached
+                break
+            kind, size, position = pack.entry_header(offset)
+            if kind == OFS_DELTA:
+                base_offset, position = pack.delta_base_offset(offset, position)
+                chain.append((pack, offset, pack.inflate(position, size)))
+                offset = base_offset
+            elif kind == REF_DELTA:
+                base_oid = pack.data[position:position + OID_SIZE].hex()
+                chain.append((pack, offset, pack.inflate(position + OID_SIZE, size)))
+                object_type, data = self.read_object(base_oid)
+                break
+            elif kind in OBJECT_TYPES:
+                object_type, data = OBJECT_TYPES[kind], pack.inflate(position, size)
+                break
+            else:
+                raise ValueError(f"{pack.pack_path.name}: unknown object type {kind} at {offset}")
+
+        for delta_pack, delta_offset, delta in reversed(chain):
+            data = apply_delta(data, delta)
+            if len(self._bases) >= BASE_CACHE_SIZE:
+                self._bases.clear()
+            self._bases[(delta_pack.pack_path, delta_offset)] = (object_type, data)
+        return object_type, data
+
+    def read_object(self, oid):
+        """Return (type, content bytes) of an object; KeyError if it doesn't exist."""
+        raw_oid = bytes.fromhex(oid)
+        for attempt in range(2):
+            for pack in self.packs:
+                offset = pack.find(raw_oid)
+                if offset is not None:
+                    return self._read_packed(pack, offset)
+
+            loose = self._read_loose(oid)
+            if loose:
+                return loose
+            # A repack may have moved the object into a pack listed after ours
+            self.close()
+        raise KeyError(oid)
+
+    def read_commit(self, oid):
+        """Parsed headers and message of a commit object."""
+        object_type, data = self.read_object(oid)
+        if object_type != 'commit':
+            raise ValueError(f"{oid} is a {object_type}, not a commit")
+        return parse_commit(data)
+
+    def read_tree(self, oid):
+        """The raw entries of a tree, as a set.
+
+        Two trees are diffed by the set difference of their entries, so the
+        unchanged parts of big trees are never looked at one by one.
+        """
+        entries = self._trees.get(oid)
+        if entries is None:
+            object_type, data = self.read_object(oid)
+            if object_type != 'tree':
+                raise ValueError(f"{oid} is a {object_type}, not a tree")
+            entries = frozenset(TREE_ENTRY_PATTERN.findall(data))
+            if len(self._trees) >= TREE_CACHE_SIZE:
+                self._trees.clear()
+            self._trees[oid] = entries
+        return entries
+
+    def diff_tree_paths(self, old_tree, new_tree, prefix=b''):
+        """Paths that differ between two trees (either may be None), like `git diff-tree -r --name-only`."""
+        if old_tree == new_tree:
+            return
+        old = self.read_tree(old_tree) if old_tree else frozenset()
+        new = self.read_tree(new_tree) if new_tree else frozenset()
+
+        # name -> [old object ID, new object ID] of the entries that differ.
+        # Subtree names get a trailing '/', which sorts them the way git orders
+        # tree entries and keeps a file and a directory of the same name apart.
+        changed = {}
+        for side, entries in ((0, old - new), (1, new - old)):
+            for entry in entries:
+                mode, _, name = entry[:-OID_SIZE - 1].partition(b' ')
+                if mode == TREE_MODE:
+                    name += b'/'
+                changed.setdefault(name, [None, None])[side] = entry[-OID_SIZE:].hex()
+
+        for name in sorted(changed):
+            if name.endswith(b'/'):
+                yield from self.diff_tree_paths(*changed[name], prefix + name)
+            else:
+                yield prefix + name
+
+    def close(self):
+        """Unmap the packfiles (they are mapped again on the next read)."""
+        for pack in self._packs or []:
+            pack.close()
+        self._packs = None
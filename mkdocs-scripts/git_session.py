@@ -0,0 +1,133 @@
+"""
+Long-lived git processes for the NextPM spec build.
+
+GitSession keeps one `git cat-file --batch` and one `git diff-tree --stdin`
+process open while the build reads the history. Requests are written to their stdin and the
+answers read back from their stdout, so looking up an object or the files a
+commit changed costs a pipe round trip instead of starting a new git process.
+Answers are cached for the lifetime of the session.
+
+Sessions may be shared between the threads of a parallel build; requests are
+serialized with a lock.
+"""
+
+import subprocess
+import threading
+import time
+
+import build_profile
+
+
+def _read_field(stream):
+    """Read one NUL-terminated field from a buffered binary stream."""
+    chunks = []
+    while True:
+        data = stream.peek(1)
+        if not data:
+            raise EOFError("git closed its output")
+        end = data.find(b'\0')
+        if end >= 0:
+            chunks.append(stream.read(end + 1)[:-1])
+            return b''.join(chunks)
+        chunks.append(stream.read(len(data)))
+
+
+class GitSession:
+    """Persistent `git cat-file --batch` and `git diff-tree --stdin` processes."""
+
+    def __init__(self, cwd='.'):
+        self.cwd = cwd
+        self._processes = {}
+        self._objects = {}
+        self._changed_files = {}
+        self._lock = threading.Lock()
+
+    def _process(self, args):
+        """Return the running git process for args, starting it on first use."""
+        key = tuple(args)
+        process = self._processes.get(key)
+        if process is None:
+            started = time.perf_counter()
+            process = subprocess.Popen(['git'] + args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       stderr=subprocess.DEVNULL, cwd=self.cwd)
+            build_profile.record_subprocess(time.perf_counter() - started)
+            self._processes[key] = process
+        return process
+
+    def read_object(self, rev):
+        """Return (object id, type, content bytes) for a revision or object ID, or None if missing."""
+        with self._lock:
+            if rev in self._objects:
+                return self._objects[rev]
+
+            process = self._process(['cat-file', '--batch'])
+            process.stdin.write(rev.encode('utf-8') + b'\n')
+            process.stdin.flush()
+
+            # "<oid> <type> <size>" followed by the content, or "<rev> missing"
+            header = process.stdout.readline().decode('utf-8', 'replace').split()
+            if len(header) != 3:
+                return None
+            object_id, object_type, size = header
+            data = process.stdout.read(int(size))
+            process.stdout.read(1)  # Newline after the content
+
+            result = (object_id, object_type, data)
+            # Names like HEAD can move, object IDs can't
+            self._objects[object_id] = result
+            return result
+
+    def resolve(self, rev):
+        """Object ID a revision (e.g. HEAD) points at, or None."""
+        result = self.read_object(rev)
+        return result[0] if result else None
+
+    def _write_commits(self, process, commit_ids):
+        # A blank line after every commit is echoed back verbatim and marks the
+        # end of that commit's output (merges and empty commits print nothing)
+        process.stdin.write(b''.join(commit_id.encode('ascii') + b'\n\n' for commit_id in commit_ids))
+        process.stdin.flush()
+
+    def _read_changed_files(self, stream):
+        """Read the `diff-tree -z --name-only` output for one commit up to its blank-line marker."""
+        first = stream.read(1)
+        if first in (b'\n', b''):
+            return []
+        _read_field(stream)  # Rest of the commit ID line
+
+        files = []
+        while True:
+            first = stream.read(1)
+            if first in (b'\n', b''):
+                return files
+            files.append((first + _read_field(stream)).decode('utf-8', 'replace'))
+
+    def changed_files(self, commit_ids):
+        """Return {commit ID: paths the commit changed}; renames count as a delete and an add.
+
+        Commits not seen before are written to diff-tree in one batch while a
+        writer thread feeds its stdin, so the whole batch costs one round trip.
+        """
+        with self._lock:
+            missing = [commit_id for commit_id in dict.fromkeys(commit_ids)
+                       if commit_id not in self._changed_files]
+            if missing:
+                process = self._process(['diff-tree', '--stdin', '-r', '--root', '--name-only', '-z'])
+                writer = threading.Thread(target=self._write_commits, args=(process, missing))
+                writer.start()
+                for commit_id in missing:
+                    self._changed_files[commit_id] = self._read_changed_files(process.stdout)
+                writer.join()
+            return {commit_id: self._changed_files[commit_id] for commit_id in commit_ids}
+
+    def close(self):
+        """Stop the git processes (they are restarted if the session is used again)."""
+        with self._lock:
+            processes, self._processes = self._processes, {}
+        for process in processes.values():
+            try:
+                process.stdin.close()
+                process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+            process.stdout.close()
@@ -1,45 +1,47 @@
 #!/usr/bin/env python3
 """
-Development server wrapper that runs build-specs.py before starting MkDocs serve.
-Usage: python mkdocs-scripts/serve.py [additional mkdocs serve arguments]
+Development server wrapper that runs MkDocs serve with the specs built in-process.
+Usage: python mkdocs-scripts/serve.py [--no-watch] [additional mkdocs serve arguments]
+
+The specs are built by the hooks in spec_hooks.py (enabled in mkdocs.yml)
+while MkDocs loads its config. engineering/specs/ is on MkDocs' live-reload
+watch list: editing a spec makes MkDocs reload, the hooks regenerate only the
+touched spec (plus the dashboard, search index and timeline), and the browser
+refreshes. --no-watch turns live reload off.
 """
 
-import subprocess
 import sys
 import os
 from pathlib import Path
 
+from mkdocs.__main__ import cli
+
 def main():
     # Change to project root
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     os.chdir(project_root)
 
-    print("Building specifications...")
-    try:
-        # Run build-specs.py
-        result = subprocess.run([sys.executable, "mkdocs-scripts/build-specs.py"], check=True)
-        print("Specifications built successfully!")
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to build specifications: {e}")
-        sys.exit(1)
-
-    print("\nStarting MkDocs development server...")
+    serve_args = sys.argv[1:]
+    if '--no-watch' in serve_args:
+        serve_args = [arg for arg in serve_args if arg != '--no-watch'] + ['--no-livereload']
+
+    print("Starting MkDocs development server (specifications are built on startup)...")
     # Start mkdocs serve with any additional arguments passed to this script
     # Default to port 8002 to avoid common caching issues with 8000
-    mkdocs_args = ["mkdocs", "serve"]
-    if not any(arg.startswith(('-a', '--dev-addr')) for arg in sys.argv[1:]):
+    mkdocs_args = ["serve"]
+    if not any(arg.startswith(('-a', '--dev-addr')) for arg in serve_args):
         mkdocs_args.extend(["-a", "localhost:8002"])
-    mkdocs_args.extend(sys.argv[1:])
+    mkdocs_args.extend(serve_args)
 
     try:
-        subprocess.run(mkdocs_args, check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to start MkDocs server: {e}")
-        sys.exit(1)
+        cli.main(args=mkdocs_args, prog_name="mkdocs")
+    except SystemExit as e:
+        if e.code:
+            print(f"Failed to start MkDocs server: {e.code}")
+            sys.exit(1)
     except KeyboardInterrupt:
         print("\nDevelopment server stopped.")
-        sys.exit(0)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
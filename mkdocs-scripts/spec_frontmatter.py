@@ -0,0 +1,274 @@
+"""
+Spec frontmatter parsing and validation for the NextPM spec build.
+
+A spec may start with a YAML block between two `---` lines. It is parsed
+with PyYAML's libyaml-based CSafeLoader when PyYAML was built with libyaml,
+and with the pure-Python SafeLoader otherwise.
+
+Specs written from the newer template nest their fields under a `metadata:`
+key. That block is flattened, so both layouts produce the same fields.
+
+The fields are checked against FRONTMATTER_SCHEMA, which is compiled once
+into one validator per field. Every problem in a spec is collected instead of
+stopping at the first, and FrontmatterError carries the whole list, so a
+build can report the problems of all specs at once and fail. Fields the
+schema doesn't know are passed through unchecked. Dates are normalized to
+YYYY-MM-DD strings whether or not they were quoted in the YAML.
+
+Parsed frontmatter is cached by the hash of its text. build-specs.py also
+stores the cache between builds; saved results are discarded whenever this
+file changes.
+"""
+
+import hashlib
+import re
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # Optional: PyYAML without libyaml falls back to the pure-Python loader
+    from yaml import SafeLoader
+
+# The block opens on the first line and closes at the next line that is only '---'
+FRONTMATTER_PATTERN = re.compile(r'\A---[ \t]*\r?\n(.*?)^---[ \t]*(?:\r?\n|\Z)', re.DOTALL | re.MULTILINE)
+FRONTMATTER_START_PATTERN = re.compile(r'\A---[ \t]*\r?\n')
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Specs from the newer template keep their fields under this key
+NESTED_METADATA_KEY = 'metadata'
+
+STATUSES = ['draft', 'review', 'approved', 'in-progress', 'completed', 'archived']
+PRIORITIES = ['low', 'medium', 'high', 'critical']
+
+# Field name -> rule. A rule has a type (string, date, hours, list, mapping),
+# optionally the allowed choices of a string, the rule for the items of a
+# list, or the rules for the fields of a mapping
+FRONTMATTER_SCHEMA = {
+    'status': {'type': 'string', 'choices': STATUSES},
+    'priority': {'type': 'string', 'choices': PRIORITIES},
+    'created_date': {'type': 'date'},
+    'updated_date': {'type': 'date'},
+    'estimated_hours': {'type': 'hours'},
+    'actual_hours': {'type': 'hours'},
+    'title': {'type': 'string'},
+    'author': {'type': 'string'},
+    'assignee': {'type': 'string'},
+    'category': {'type': 'string'},
+    'demonstrates': {'type': 'list', 'items': {'type': 'string'}},
+    'related_specs': {'type': 'list', 'items': {'type': 'string'}},
+    'state_history': {'type': 'list', 'items': {'type': 'mapping', 'fields': {
+        'state': {'type': 'string', 'choices': STATUSES},
+        'date': {'type': 'date'},
+        'author': {'type': 'string'},
+        'notes': {'type': 'string'},
+    }}},
+}
+
+# Parsed results of an older version of this file may differ, so they aren't reused
+PARSER_FINGERPRINT = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+class FrontmatterError(ValueError):
+    """One or more invalid frontmatter blocks; errors lists every problem found."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__(f"{len(self.errors)} frontmatter error(s):\n" +
+                         '\n'.join(f"  {error}" for error in self.errors))
+
+
+def _check_string(value):
+    return (value, None) if isinstance(value, str) else (value, "must be a string")
+
+
+def _check_date(value):
+    """Accept a YAML date or a YYYY-MM-DD string; both come back as the string."""
+    if isinstance(value, datetime):
+        return value.date().isoformat(), None
+    if isinstance(value, date):
+        return value.isoformat(), None
+    if isinstance(value, str) and DATE_PATTERN.match(value):
+        try:
+            date.fromisoformat(value)
+            return value, None
+        except ValueError:
+            pass
+    return value, f"must be a YYYY-MM-DD date (got {value!r})"
+
+
+def _check_hours(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0:
+        return value, None
+    return value, f"must be a number of hours >= 0 (got {value!r})"
+
+
+def compile_rule(rule):
+    """Turn a schema rule into a function(value, field) -> (normalized value, [errors])."""
+    kind = rule['type']
+
+    if kind in ('string', 'date', 'hours'):
+        check = {'string': _check_string, 'date': _check_date, 'hours': _check_hours}[kind]
+        choices = rule.get('choices')
+        allowed = set(choices or ())
+
+        def validate(value, field):
+            value, error = check(value)
+            if error is None and choices and value not in allowed:
+                error = f"must be one of {', '.join(choices)} (got {value!r})"
+            return value, [f"{field}: {error}"] if error else []
+        return validate
+
+    if kind == 'list':
+        validate_item = compile_rule(rule['items'])
+
+        def validate(value, field):
+            if not isinstance(value, list):
+                return value, [f"{field}: must be a list"]
+            items, errors = [], []
+            for number, item in enumerate(value):
+                item, item_errors = validate_item(item, f"{field}[{number}]")
+                items.append(item)
+                errors += item_errors
+            return items, errors
+        return validate
+
+    if kind == 'mapping':
+        validate_fields = compile_schema(rule['fields'])
+
+        def validate(value, field):
+            if not isinstance(value, dict):
+                return value, [f"{field}: must be a mapping"]
+            return validate_fields(value, f"{field}.")
+        return validate
+
+    raise ValueError(f"Unknown frontmatter rule type: {kind}")
+
+
+def compile_schema(schema):
+    """Turn {field: rule} into a function(fields, prefix) -> (normalized fields, [errors])."""
+    validators = {field: compile_rule(rule) for field, rule in schema.items()}
+
+    def validate(fields, prefix=''):
+        normalized, errors = {}, []
+        for field, value in fields.items():
+            validator = validators.get(field)
+            if validator is None:
+                normalized[field] = value  # Unknown fields pass through
+                continue
+            if value is None:
+                continue  # An empty value counts as missing, so the default applies
+            normalized[field], field_errors = validator(value, f"{prefix}{field}")
+            errors += field_errors
+        return normalized, errors
+    return validate
+
+
+validate_frontmatter = compile_schema(FRONTMATTER_SCHEMA)
+
+
+def split_frontmatter(content, source='<spec>'):
+    """Split spec content into (YAML frontmatter text or None, markdown content)."""
+    match = FRONTMATTER_PATTERN.match(content)
+    if match:
+        return match.group(1), content[match.end():]
+    if FRONTMATTER_START_PATTERN.match(content):
+        raise FrontmatterError([f"{source}: frontmatter starts with '---' but has no closing '---' line"])
+    # No frontmatter found, the whole file is markdown
+    return None, content
+
+
+def flatten_metadata(fields):
+    """Merge a nested `metadata:` block into the top level; returns (fields, [errors])."""
+    nested = fields.get(NESTED_METADATA_KEY)
+    if nested is None:
+        return fields, []
+    if not isinstance(nested, dict):
+        return fields, [f"{NESTED_METADATA_KEY}: must be a mapping"]
+
+    flattened = {key: value for key, value in fields.items() if key != NESTED_METADATA_KEY}
+    errors = [f"{key}: set both at the top level and under {NESTED_METADATA_KEY}:"
+              for key in nested if key in flattened]
+    flattened.update((key, value) for key, value in nested.items() if key not in flattened)
+    return flattened, errors
+
+
+def _is_json_data(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return True
+    if isinstance(value, list):
+        return all(_is_json_data(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_json_data(item) for key, item in value.items())
+    return False
+
+
+class FrontmatterParser:
+    """Parses, flattens and validates frontmatter, caching the results by text hash."""
+
+    def __init__(self):
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+        self._used = set()
+        self._lock = threading.Lock()
+
+    def parse(self, text, source='<spec>'):
+        """Validated fields of a frontmatter block ({} for None); raises FrontmatterError."""
+        if text is None:
+            return {}
+
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        with self._lock:
+            fields = self.cache.get(key)
+            if fields is not None:
+                self.hits += 1
+                self._used.add(key)
+                return dict(fields)
+
+        fields = self._parse(text, source)
+        with self._lock:
+            self.cache[key] = fields
+            self.misses += 1
+            self._used.add(key)
+        return dict(fields)
+
+    def _parse(self, text, source):
+        try:
+            fields = yaml.load(text, Loader=SafeLoader)
+        except yaml.YAMLError as e:
+            mark = getattr(e, 'problem_mark', None)
+            # The YAML starts on line 2 of the spec, after the opening '---'
+            where = f" (line {mark.line + 2})" if mark is not None else ''
+            problem = getattr(e, 'problem', None) or str(e)
+            raise FrontmatterError([f"{source}: invalid YAML{where}: {problem}"]) from e
+
+        if fields is None:
+            return {}
+        if not isinstance(fields, dict):
+            raise FrontmatterError([f"{source}: frontmatter must be a mapping, not {type(fields).__name__}"])
+
+        fields, errors = flatten_metadata(fields)
+        fields, field_errors = validate_frontmatter(fields)
+        errors += field_errors
+        if errors:
+            raise FrontmatterError(f"{source}: {error}" for error in errors)
+        return fields
+
+    def load(self, cache):
+        """Add the results saved by an earlier build, unless they came from another parser version."""
+        if cache.get('parser') == PARSER_FINGERPRINT:
+            with self._lock:
+                self.cache.update(cache.get('frontmatter', {}))
+
+    def dump(self):
+        """The results used by this build, as JSON data for load() (others stay in memory only)."""
+        with self._lock:
+            return {
+                'parser': PARSER_FINGERPRINT,
+                'frontmatter': {key: self.cache[key] for key in sorted(self._used)
+                                if _is_json_data(self.cache[key])}
+            }
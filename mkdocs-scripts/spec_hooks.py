@@ -0,0 +1,187 @@
+"""
+MkDocs hooks that run the NextPM spec build inside `mkdocs build` and `mkdocs serve`.
+Enabled in mkdocs.yml:
+
+    hooks:
+      - mkdocs-scripts/spec_hooks.py
+
+- on_config runs the build-specs.py pipeline in the MkDocs process: a full
+  build the first time, then (while serving) only the specs whose source
+  changed since the previous build. It then fills the Specs section of the
+  nav with the spec entries, so mkdocs.yml itself is never rewritten, and
+  reports when the dashboard has to fall back to the D3 CDN.
+- on_files replaces the spec pages with virtual files holding the parsed spec
+  bodies, so no page is written to mkdocs-docs/ just to be read back.
+- on_page_markdown rewrites the links of a spec page and injects its state
+  badge and commit timeline while MkDocs renders it.
+- on_serve adds engineering/specs/ to the live-reload watch list, so editing
+  a spec rebuilds it through MkDocs' own reload.
+
+Setting NEXTPM_PROFILE=<path> profiles the first (full) spec build like
+build-specs.py --profile <path>, so CI profiles the build it deploys.
+
+The dashboard, search index, timeline data and other generated files are
+still written to mkdocs-docs/ as before. MkDocs re-executes hooks files every
+time it loads the config, so the build state lives on the build-specs module,
+which is only loaded once per process.
+"""
+
+import importlib.util
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+from mkdocs.exceptions import PluginError
+from mkdocs.structure.files import File
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SPEC_SOURCE_DIR = Path('engineering/specs')
+SPEC_PAGE_DIR = 'engineering/specs/'
+PROFILE_ENV = 'NEXTPM_PROFILE'
+
+# Under 'mkdocs' so warnings show up in the build log and fail --strict builds
+log = logging.getLogger('mkdocs.plugins.spec_hooks')
+
+
+def load_build_specs():
+    """Import build-specs.py once per process (serve.py and the hooks share it)."""
+    module = sys.modules.get('build_specs')
+    if module is None:
+        # MkDocs only has the hooks directory on sys.path while it loads this file,
+        # build-specs.py imports its helper modules (build_profile, git_history...) from it
+        if str(SCRIPT_DIR) not in sys.path:
+            sys.path.insert(0, str(SCRIPT_DIR))
+        spec = importlib.util.spec_from_file_location('build_specs', SCRIPT_DIR / 'build-specs.py')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules['build_specs'] = module
+    return module
+
+
+def snapshot_specs(source_dir):
+    """Map each spec source file to its (mtime, size) for change detection."""
+    snapshot = {}
+    for spec_file in source_dir.glob('*.md'):
+        if spec_file.name.lower() == 'readme.md':
+            continue
+        try:
+            stat = spec_file.stat()
+        except OSError:
+            continue
+        snapshot[spec_file.name] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+class SpecSite:
+    """The spec build state shared by every config reload of one MkDocs process."""
+
+    def __init__(self, build_specs):
+        self.build_specs = build_specs
+        self.state = None
+        self.snapshot = {}
+        self.pages = {}
+
+    def update(self):
+        """Build all specs the first time, afterwards only those that changed."""
+        current = snapshot_specs(SPEC_SOURCE_DIR)
+        try:
+            if self.state is None:
+                profile_path = os.environ.get(PROFILE_ENV)
+                if profile_path:
+                    self.build_specs.build_profile.enable()
+                self.state = self.build_specs.run_build(in_memory=True)
+                if profile_path:
+                    self.build_specs.build_profile.report(profile_path, jobs=1, use_cache=True,
+                                                          spec_count=len(self.state['spec_files']))
+            else:
+                changed = {name for name in current.keys() | self.snapshot.keys()
+                           if current.get(name) != self.snapshot.get(name)}
+                if not changed:
+                    return
+                started = time.perf_counter()
+                print(f"\nSpec change detected: {', '.join(sorted(changed))}")
+                self.build_specs.rebuild_specs(self.state, changed)
+                print(f"Specs rebuilt in {time.perf_counter() - started:.2f}s")
+        finally:
+            # A failed rebuild still updates the specs that were valid
+            if self.state is not None:
+                self.pages = {SPEC_PAGE_DIR + metadata['filename']: metadata
+                              for metadata in self.state['spec_metadata']}
+        # Only after a successful build, so failed specs are retried on the next reload
+        self.snapshot = current
+
+
+def get_site():
+    build_specs = load_build_specs()
+    site = getattr(build_specs, 'spec_site', None)
+    if site is None:
+        site = build_specs.spec_site = SpecSite(build_specs)
+    return site
+
+
+def on_config(config):
+    # build-specs.py works with paths relative to the project root
+    os.chdir(Path(config.config_file_path).resolve().parent)
+    try:
+        get_site().update()
+    except Exception as e:
+        raise PluginError(f"Spec build failed: {e}") from e
+    add_specs_nav(config)
+    warn_cdn_d3()
+    return config
+
+
+def warn_cdn_d3():
+    """The dashboard only loads D3 from the CDN when the vendored bundle is missing.
+
+    Once the tarball hashes are pinned the bundle can always be built, so a
+    missing one is a MkDocs warning (failing --strict); before that it can't
+    be, and the fallback is only reported.
+    """
+    build_specs = load_build_specs()
+    if build_specs.D3_VENDOR_PATH.exists():
+        return
+    message = (f"No vendored D3 bundle at {build_specs.D3_VENDOR_PATH}, the dashboard loads "
+               f"{build_specs.D3_CDN_URL} instead")
+    if build_specs.D3_INTEGRITY_PATH.exists():
+        log.warning(f"{message} (run mkdocs-scripts/vendor-d3.py)")
+    else:
+        log.info(f"{message} (no {build_specs.D3_INTEGRITY_PATH} yet, see vendor-d3.py --update-lock)")
+
+
+def add_specs_nav(config):
+    """Fill the Specs section of the nav loaded from mkdocs.yml with the spec pages."""
+    if config.nav is None:
+        return  # No nav configured, MkDocs lists every page by itself
+    build_specs = load_build_specs()
+    nav, found = build_specs.insert_specs_nav(config.nav, get_site().state['nav'])
+    if found:
+        config.nav = nav
+    else:
+        print(f"Warning: mkdocs.yml nav has no '{build_specs.SPECS_NAV_TITLE}' section, spec pages are not listed")
+
+
+def on_files(files, config):
+    site = get_site()
+    for filename, document in site.state['documents'].items():
+        src_uri = SPEC_PAGE_DIR + filename
+        existing = files.get_file_from_path(src_uri)
+        if existing is not None:
+            files.remove(existing)  # Output of an earlier standalone build-specs.py run
+        files.append(File.generated(config, src_uri, content=document.body))
+    return files
+
+
+def on_page_markdown(markdown, page, config, files):
+    site = get_site()
+    metadata = site.pages.get(page.file.src_uri)
+    if metadata is None:
+        return markdown
+    return site.build_specs.render_spec_page(markdown, metadata, site.state['link_rewriter'])
+
+
+def on_serve(server, config, builder):
+    server.watch(str(SPEC_SOURCE_DIR.resolve()))
+    return server
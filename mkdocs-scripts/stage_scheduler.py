@@ -0,0 +1,306 @@
+"""
+Dependency-graph scheduler for the NextPM spec build stages.
+
+Each Stage declares the values it reads (inputs) and produces (outputs). The
+scheduler starts a stage as soon as every stage producing one of its inputs
+has finished, so stages that don't depend on each other run concurrently on
+a thread pool and the build takes about as long as its longest dependency
+chain (the critical path) rather than the sum of its stages.
+
+A stage is skipped when its fingerprint matches the previous run: a hash of
+the generator, its input values and the contents of the files it declares it
+reads, provided every file it wrote last time still has the content it wrote
+(a file restored from git or edited by hand makes the stage run again). Its
+outputs are then restored from the saved state, so they must be JSON data. Files written
+through write_if_changed() in build-specs.py are recorded with
+record_output(); stages with caches of their own (cache=False) always run.
+
+Stages may print as they go; the output of each stage is buffered and
+printed in one block, in stage order, so concurrent stages don't interleave.
+"""
+
+import json
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from io import StringIO
+from pathlib import Path
+
+import build_profile
+
+STATE_VERSION = 2
+
+_local = threading.local()
+
+
+class Stage:
+    """One build step: run(*input values) returns its output value (a tuple for several)."""
+
+    def __init__(self, name, title, run, inputs=(), outputs=(), files=(), cache=True):
+        self.name = name
+        self.title = title
+        self.run = run
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.files = tuple(Path(path) for path in files)
+        self.cache = cache
+
+
+class StageResult:
+    """How one stage went in the last run: its timing and whether it was skipped."""
+
+    def __init__(self, stage, number):
+        self.stage = stage
+        self.number = number
+        self.seconds = 0.0
+        self.skipped = False
+
+
+class _StageOutput:
+    """sys.stdout replacement that buffers what a stage thread prints."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        buffer = getattr(_local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        if getattr(_local, 'buffer', None) is None:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def record_output(path):
+    """Note a file written by the stage running on this thread (no-op outside a stage)."""
+    written = getattr(_local, 'written', None)
+    if written is not None:
+        written.add(Path(path).as_posix())
+
+
+def sort_stages(stages, values=()):
+    """Return stages in dependency order; raises ValueError for missing or circular inputs."""
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producers or output in values:
+                raise ValueError(f"Stage output '{output}' is produced twice")
+            producers[output] = stage
+
+    ordered, visiting, done = [], set(), set()
+
+    def visit(stage):
+        if stage.name in done:
+            return
+        if stage.name in visiting:
+            raise ValueError(f"Stage '{stage.name}' depends on itself")
+        visiting.add(stage.name)
+        for name in stage.inputs:
+            if name in producers:
+                visit(producers[name])
+            elif name not in values:
+                raise ValueError(f"Stage '{stage.name}' needs '{name}', which no stage produces")
+        visiting.discard(stage.name)
+        done.add(stage.name)
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage)
+    return ordered
+
+
+class StageScheduler:
+    """Runs stages concurrently in dependency order, skipping those whose inputs are unchanged."""
+
+    def __init__(self, stages, state_path=None, generator='', fingerprint=None, workers=None):
+        self.stages = list(stages)
+        self.state_path = Path(state_path) if state_path else None
+        self.generator = generator
+        self.fingerprint = fingerprint
+        self.workers = workers or len(self.stages) or 1
+        self.results = []
+
+    def _load_state(self):
+        if self.state_path is None:
+            return {}
+        try:
+            state = json.loads(self.state_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+        if state.get('version') != STATE_VERSION or state.get('generator') != self.generator:
+            return {}
+        return state.get('stages', {})
+
+    def _save_state(self, saved):
+        if self.state_path is None:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.state_path.with_name(f'.{self.state_path.name}.tmp')
+        temp_path.write_text(json.dumps({
+            'version': STATE_VERSION,
+            'generator': self.generator,
+            'stages': saved
+        }, indent=2, sort_keys=True), encoding='utf-8')
+        temp_path.replace(self.state_path)
+
+    def _stage_fingerprint(self, stage, values, digests):
+        """Hash of the stage's input values and declared files, or None if it can't be skipped."""
+        if not stage.cache or self.fingerprint is None or self.state_path is None:
+            return None
+        parts = [stage.name]
+        for name in stage.inputs:
+            if name not in digests:
+                digests[name] = self.fingerprint(values[name])
+            parts.append(digests[name])
+        for path in stage.files:
+            try:
+                parts.append(self.fingerprint(path.read_bytes()))
+            except OSError:
+                parts.append(None)
+        return self.fingerprint(parts)
+
+    def _hash_files(self, paths):
+        """{path: content hash} of the files a stage wrote (missing ones are left out)."""
+        hashes = {}
+        for path in sorted(paths):
+            try:
+                hashes[path] = self.fingerprint(Path(path).read_bytes())
+            except OSError:
+                pass
+        return hashes
+
+    def _outputs_unchanged(self, files):
+        """True if every file a stage wrote still has the content it was written with."""
+        for path, digest in files.items():
+            try:
+                if self.fingerprint(Path(path).read_bytes()) != digest:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _run_stage(self, stage, inputs, previous, fingerprint):
+        """Run (or skip) one stage on a worker thread; returns (outputs, saved state, output text)."""
+        _local.buffer = StringIO()
+        _local.written = set()
+        try:
+            with build_profile.stage(stage.name):
+                if (fingerprint is not None and previous.get('fingerprint') == fingerprint
+                        and self._outputs_unchanged(previous.get('files', {}))):
+                    print("Skipped (inputs unchanged since the last build)")
+                    return previous.get('outputs', {}), previous, _local.buffer.getvalue(), True
+
+                result = stage.run(*inputs)
+                if len(stage.outputs) == 1:
+                    result = (result,)
+                outputs = dict(zip(stage.outputs, result or ()))
+                saved = None
+                if fingerprint is not None:
+                    saved = {'fingerprint': fingerprint, 'outputs': outputs,
+                             'files': self._hash_files(_local.written)}
+                return outputs, saved, _local.buffer.getvalue(), False
+        except BaseException as e:
+            e.stage_output = _local.buffer.getvalue()
+            raise
+        finally:
+            _local.buffer = None
+            _local.written = None
+
+    def run(self, values=None):
+        """Run every stage and return the dict of all values (the given ones plus all outputs)."""
+        values = dict(values or {})
+        self.stages = sort_stages(self.stages, values)
+        numbers = {stage.name: number for number, stage in enumerate(self.stages, 1)}
+        results = {stage.name: StageResult(stage, numbers[stage.name]) for stage in self.stages}
+        self.results = list(results.values())
+
+        previous_state = self._load_state()
+        saved_state = {}
+        digests = {}
+        pending = list(self.stages)
+        running = {}
+        failure = None
+        # Finished stages' output, printed in stage order once every earlier stage has finished
+        blocks = {}
+        next_number = 1
+
+        stdout = sys.stdout
+        sys.stdout = _StageOutput(stdout)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                while pending or running:
+                    ready = [] if failure else [stage for stage in pending
+                                                if all(name in values for name in stage.inputs)]
+                    for stage in ready:
+                        pending.remove(stage)
+                        fingerprint = self._stage_fingerprint(stage, values, digests)
+                        inputs = [values[name] for name in stage.inputs]
+                        future = executor.submit(self._run_stage, stage, inputs,
+                                                 previous_state.get(stage.name, {}), fingerprint)
+                        running[future] = (stage, time.perf_counter())
+                    if not running:
+                        break
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        stage, started = running.pop(future)
+                        result = results[stage.name]
+                        result.seconds = time.perf_counter() - started
+                        try:
+                            outputs, saved, text, result.skipped = future.result()
+                        except Exception as e:
+                            blocks[result.number] = f"\n{result.number}. {stage.title}...\n" + \
+                                getattr(e, 'stage_output', '')
+                            failure = failure or e
+                            continue
+                        blocks[result.number] = f"\n{result.number}. {stage.title}...\n{text}"
+                        values.update(outputs)
+                        if saved is not None:
+                            saved_state[stage.name] = saved
+
+                    while next_number in blocks:
+                        stdout.write(blocks.pop(next_number))
+                        next_number += 1
+        finally:
+            sys.stdout = stdout
+            # After a failure, later stages may have finished before earlier ones
+            for number in sorted(blocks):
+                stdout.write(blocks[number])
+
+        if failure:
+            raise failure
+        # Keep the saved results of stages that didn't run this time (e.g. in a partial rebuild)
+        for name, saved in previous_state.items():
+            saved_state.setdefault(name, saved)
+        self._save_state(saved_state)
+        return values
+
+    def critical_path(self):
+        """(stages on the longest dependency chain of the last run, its length in seconds)."""
+        producers = {output: stage.name for stage in self.stages for output in stage.outputs}
+        by_name = {result.stage.name: result for result in self.results}
+        finish, chain = {}, {}
+        for stage in self.stages:  # Dependency order, so every producer comes first
+            if stage.name not in by_name:
+                continue
+            before = [producers[name] for name in stage.inputs if producers.get(name) in finish]
+            longest = max(before, key=lambda name: finish[name], default=None)
+            finish[stage.name] = by_name[stage.name].seconds + (finish[longest] if longest else 0.0)
+            chain[stage.name] = (chain[longest] if longest else []) + [by_name[stage.name]]
+        if not finish:
+            return [], 0.0
+        last = max(finish, key=finish.get)
+        return chain[last], finish[last]
+
+    def print_critical_path(self):
+        """Print the longest dependency chain of the last run against the sum of all stages."""
+        path, seconds = self.critical_path()
+        total = sum(result.seconds for result in self.results)
+        print(f"\nCritical path: {seconds:.2f}s (all stages together: {total:.2f}s)")
+        for result in path:
+            note = ' (skipped)' if result.skipped else ''
+            print(f"  {result.number}. {result.stage.name:<20} {result.seconds:7.3f}s{note}")
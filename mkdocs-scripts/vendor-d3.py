@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Vendor the D3 modules used by the activity graph into one local script.
+Usage: python mkdocs-scripts/vendor-d3.py [--force] [--update-lock]
+
+activity-graph.js is scanned for the `d3.<name>` functions it calls, and each
+one is mapped to the D3 module that provides it. Those modules and their d3-*
+dependencies are downloaded from the npm registry at the versions pinned
+below (the ones d3 v7 resolves to). Their UMD builds all attach to the same
+global `d3` object, so concatenating them in dependency order gives a `d3`
+that has only the modules the graph uses. The bundle is written to
+mkdocs-docs/assets/js/vendor/d3.min.js, and build-specs.py publishes it under
+a content-hashed name like the other dashboard assets.
+
+The download only happens when the set of modules changes (or with --force);
+tarballs are cached in .cache/nextpm/d3. Every tarball, downloaded or cached,
+must match the sha512 integrity pinned for it in d3-integrity.json before it
+is extracted. --update-lock records the registry's dist.integrity for the
+pinned versions there; run it after changing D3_VERSIONS and commit the file.
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import tarfile
+import urllib.request
+from pathlib import Path
+
+GRAPH_SCRIPT = Path('mkdocs-docs/assets/js/activity-graph.js')
+OUTPUT_PATH = Path('mkdocs-docs/assets/js/vendor/d3.min.js')
+CACHE_DIR = Path('.cache/nextpm/d3')
+INTEGRITY_PATH = Path('mkdocs-scripts/d3-integrity.json')
+REGISTRY_URL = 'https://registry.npmjs.org'
+
+# Versions of the d3 v7 modules
+D3_VERSIONS = {
+    'd3-array': '3.2.4',
+    'd3-axis': '3.0.0',
+    'd3-color': '3.1.0',
+    'd3-dispatch': '3.0.1',
+    'd3-drag': '3.0.0',
+    'd3-ease': '3.0.1',
+    'd3-format': '3.1.0',
+    'd3-interpolate': '3.0.1',
+    'd3-path': '3.1.0',
+    'd3-scale': '4.0.2',
+    'd3-selection': '3.0.0',
+    'd3-shape': '3.2.0',
+    'd3-time': '3.1.0',
+    'd3-time-format': '4.1.0',
+    'd3-timer': '3.0.1',
+    'd3-transition': '3.0.1',
+    'd3-zoom': '3.0.0',
+}
+
+# D3 functions the graph may call, by the module that provides them
+D3_EXPORTS = {
+    'd3-axis': ['axisTop', 'axisRight', 'axisBottom', 'axisLeft'],
+    'd3-scale': ['scaleLinear', 'scaleTime', 'scaleUtc', 'scaleOrdinal', 'scaleBand', 'scalePoint',
+                 'scaleLog', 'scaleSqrt', 'scalePow'],
+    'd3-selection': ['select', 'selectAll', 'pointer', 'pointers', 'create'],
+    'd3-shape': ['line', 'area', 'arc', 'pie', 'linkVertical', 'linkHorizontal',
+                 'curveBasis', 'curveLinear', 'curveMonotoneX', 'curveStep'],
+    'd3-time-format': ['timeFormat', 'timeParse', 'utcFormat', 'utcParse', 'isoFormat', 'isoParse'],
+    'd3-zoom': ['zoom', 'zoomIdentity', 'zoomTransform'],
+    'd3-array': ['extent', 'min', 'max', 'sum', 'range', 'group', 'rollup', 'bisector', 'ascending',
+                 'descending'],
+    'd3-transition': ['transition'],
+    'd3-ease': ['easeLinear', 'easeCubic', 'easeCubicInOut'],
+    'd3-drag': ['drag'],
+}
+MODULE_BY_EXPORT = {name: module for module, names in D3_EXPORTS.items() for name in names}
+
+D3_CALL_PATTERN = re.compile(r'\bd3\.([A-Za-z]+)')
+
+
+def find_required_modules(script_path):
+    """D3 modules providing the d3.* functions referenced by the script."""
+    names = set(D3_CALL_PATTERN.findall(script_path.read_text(encoding='utf-8')))
+    unknown = sorted(name for name in names if name not in MODULE_BY_EXPORT)
+    if unknown:
+        raise ValueError(f"Don't know which D3 module provides: {', '.join(unknown)} "
+                         f"(add them to D3_EXPORTS in {Path(__file__).name})")
+    return sorted({MODULE_BY_EXPORT[name] for name in names})
+
+
+def load_integrity():
+    """{module: {'version', 'integrity'}} pinned in d3-integrity.json."""
+    try:
+        return json.loads(INTEGRITY_PATH.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+
+
+def update_integrity():
+    """Pin the registry's dist.integrity of every module in D3_VERSIONS."""
+    pinned = {}
+    for module, version in sorted(D3_VERSIONS.items()):
+        url = f'{REGISTRY_URL}/{module}/{version}'
+        with urllib.request.urlopen(url, timeout=60) as response:
+            integrity = json.load(response)['dist']['integrity']
+        if not integrity.startswith('sha512-'):
+            raise ValueError(f"{module}@{version} has no sha512 integrity ({integrity})")
+        pinned[module] = {'version': version, 'integrity': integrity}
+        print(f"Pinned {module}@{version} {integrity}")
+    INTEGRITY_PATH.write_text(json.dumps(pinned, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    print(f"Wrote {INTEGRITY_PATH}")
+
+
+def check_integrity(module, version, data, pinned):
+    """Raise ValueError unless the tarball matches the sha512 pinned for module@version."""
+    entry = pinned.get(module)
+    if not entry or entry.get('version') != version:
+        raise ValueError(f"No integrity pinned for {module}@{version} in {INTEGRITY_PATH} "
+                         f"(run {Path(__file__).name} --update-lock)")
+    digest = 'sha512-' + base64.b64encode(hashlib.sha512(data).digest()).decode('ascii')
+    if digest != entry['integrity']:
+        raise ValueError(f"{module}@{version} does not match its pinned integrity "
+                         f"(expected {entry['integrity']}, got {digest})")
+
+
+def fetch_package(module, pinned):
+    """Return (package.json, minified UMD build) of a pinned D3 module."""
+    version = D3_VERSIONS[module]
+    tarball = CACHE_DIR / f'{module}-{version}.tgz'
+    if tarball.exists():
+        data = tarball.read_bytes()
+    else:
+        url = f'{REGISTRY_URL}/{module}/-/{module}-{version}.tgz'
+        print(f"Downloading {url}")
+        with urllib.request.urlopen(url, timeout=60) as response:
+            data = response.read()
+
+    # Also checked for cached tarballs, so a corrupted cache is never bundled
+    check_integrity(module, version, data, pinned)
+    if not tarball.exists():
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tarball.write_bytes(data)
+
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r:gz') as archive:
+        package = json.load(archive.extractfile('package/package.json'))
+        script = archive.extractfile(f'package/dist/{module}.min.js').read().decode('utf-8')
+    return package, script
+
+
+def resolve_modules(required):
+    """Fetch the required modules and their d3-* dependencies, dependencies first."""
+    pinned = load_integrity()
+    ordered = []
+    scripts = {}
+
+    def visit(module, path):
+        if module in scripts:
+            return
+        if module in path:
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [module])}")
+        if module not in D3_VERSIONS:
+            raise ValueError(f"No pinned version for {module} (add it to D3_VERSIONS)")
+
+        package, script = fetch_package(module, pinned)
+        # Only d3-* dependencies are separate UMD builds; others are bundled into dist/
+        for dependency in sorted(package.get('dependencies', {})):
+            if dependency.startswith('d3-'):
+                visit(dependency, path + [module])
+        scripts[module] = script
+        ordered.append(module)
+
+    for module in required:
+        visit(module, [])
+    return [(module, scripts[module]) for module in ordered]
+
+
+def bundle_header(required, modules=None):
+    lines = [
+        '/* D3 subset for activity-graph.js, generated by mkdocs-scripts/vendor-d3.py - do not edit.',
+        f" * Required: {', '.join(f'{m}@{D3_VERSIONS[m]}' for m in required)}",
+    ]
+    if modules is not None:
+        lines.append(f" * Bundled: {', '.join(f'{m}@{D3_VERSIONS[m]}' for m in modules)}")
+    lines.append(' * D3 is distributed under the ISC license: https://github.com/d3/d3/blob/main/LICENSE */')
+    return lines
+
+
+def is_up_to_date(required):
+    """True if the existing bundle was built from the same pinned modules."""
+    try:
+        with open(OUTPUT_PATH, 'r', encoding='utf-8') as f:
+            head = [f.readline().rstrip('\n') for _ in range(2)]
+    except OSError:
+        return False
+    return head == bundle_header(required)[:2]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Vendor the D3 modules used by the activity graph.')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild the bundle even if it is up to date')
+    parser.add_argument('--update-lock', action='store_true',
+                        help='Pin the registry integrity of the D3_VERSIONS tarballs in d3-integrity.json')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Change to project root
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+    os.chdir(project_root)
+
+    if args.update_lock:
+        try:
+            update_integrity()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: Could not pin D3 integrity: {e}")
+            return 1
+
+    try:
+        required = find_required_modules(GRAPH_SCRIPT)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    if not args.force and is_up_to_date(required):
+        print(f"{OUTPUT_PATH} is up to date ({', '.join(required)})")
+        return 0
+
+    try:
+        modules = resolve_modules(required)
+    except (OSError, ValueError, KeyError, tarfile.TarError) as e:
+        print(f"Error: Could not vendor D3: {e}")
+        return 1
+
+    names = [module for module, _ in modules]
+    content = '\n'.join(bundle_header(required, names) + [script.strip() for _, script in modules]) + '\n'
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_PATH.write_text(content, encoding='utf-8')
+
+    print(f"Wrote {OUTPUT_PATH} ({len(content.encode('utf-8')) / 1024:.1f} KB): {', '.join(names)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
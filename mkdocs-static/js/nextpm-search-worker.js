@@ -0,0 +1,222 @@
+/**
+ * NextPM Search Engine
+ * Evaluates spec search queries against the sharded inverted index.
+ *
+ * Runs as a Web Worker started by nextpm-search.js, so typing never waits on
+ * query evaluation. Without Worker support the same engine is loaded into the
+ * page instead. Messages in:
+ *   {type: 'init', baseUrl}                  load index.json from baseUrl (its content-hashed
+ *                                            shards live under index.shard_base, relative to it)
+ *   {type: 'query', id, query, filters}      rank and filter the specs
+ * Messages out:
+ *   {type: 'ready', totalSpecs, docs}        document metadata for rendering
+ *   {type: 'results', id, docs}              matching doc numbers, best first
+ *   {type: 'error', id, message}
+ */
+
+// Rankings, filtered results and prefix expansions kept per query
+const MEMO_LIMIT = 200;
+
+class NextPMSearchEngine {
+    constructor(post) {
+        this.post = post;
+        this.baseUrl = null;
+        this.index = null;
+        this.shards = new Map();
+        this.prefixKeys = new Map();
+        this.rankings = new Map();
+        this.results = new Map();
+        this.latestId = 0;
+        this.previous = null;
+    }
+
+    handle(message) {
+        if (message.type === 'init') return this.load(message.baseUrl);
+        if (message.type === 'query') return this.query(message);
+    }
+
+    async load(baseUrl) {
+        this.baseUrl = baseUrl;
+        try {
+            const response = await fetch(baseUrl + 'index.json');
+            if (!response.ok) throw new Error('Failed to load search index');
+            this.index = await response.json();
+            this.post({ type: 'ready', totalSpecs: this.index.total_specs, docs: this.index.docs });
+        } catch (error) {
+            this.post({ type: 'error', id: 0, message: error.message });
+        }
+    }
+
+    /**
+     * Keep a memoized value, dropping the least recently used entry when full
+     */
+    remember(memo, key, value) {
+        memo.delete(key);
+        memo.set(key, value);
+        if (memo.size > MEMO_LIMIT) memo.delete(memo.keys().next().value);
+        return value;
+    }
+
+    recall(memo, key) {
+        const value = memo.get(key);
+        if (value !== undefined) this.remember(memo, key, value);
+        return value;
+    }
+
+    tokenize(query) {
+        return (query.toLowerCase().match(/[\p{L}\p{N}]+/gu) || []).filter(term => term.length >= 2);
+    }
+
+    async query({ id, query, filters }) {
+        this.latestId = id;
+        if (!this.index) return;
+
+        const terms = this.tokenize(query || '');
+        const queryKey = terms.join(' ');
+        const resultKey = [queryKey, filters.status, filters.priority, filters.category].join('|');
+
+        let result = this.recall(this.results, resultKey);
+        if (!result) {
+            let ranking = this.recall(this.rankings, queryKey);
+            if (!ranking) {
+                try {
+                    ranking = await this.rank(terms, id);
+                } catch (error) {
+                    if (id === this.latestId) this.post({ type: 'error', id, message: error.message });
+                    return;
+                }
+                // A newer query arrived while shards were loading
+                if (ranking === null) return;
+                this.remember(this.rankings, queryKey, ranking);
+            }
+            result = this.remember(this.results, resultKey, this.filter(ranking, filters));
+        }
+        this.post({ type: 'results', id, docs: result });
+    }
+
+    /**
+     * Doc numbers matching every term, best first; null if the query was superseded
+     */
+    async rank(terms, id) {
+        if (terms.length === 0) {
+            return Int32Array.from(this.index.docs.keys());
+        }
+
+        const candidates = this.refinementCandidates(terms);
+        const lookups = await Promise.all(
+            terms.map((term, i) => this.lookupTerm(term, i === terms.length - 1, candidates)));
+        if (id !== this.latestId) return null;
+
+        // Every term must match; scores add up across terms
+        const scores = lookups[0];
+        lookups.slice(1).forEach(matches => {
+            scores.forEach((score, doc) => {
+                if (matches.has(doc)) {
+                    scores.set(doc, score + matches.get(doc));
+                } else {
+                    scores.delete(doc);
+                }
+            });
+        });
+
+        const ranking = Int32Array.from([...scores.entries()].sort((a, b) => b[1] - a[1]), ([doc]) => doc);
+        this.previous = { terms, ranking };
+        return ranking;
+    }
+
+    /**
+     * When the query only narrows the previous one (a word typed further, or
+     * more words added), its matches are a subset of the previous matches, so
+     * only those specs are scored.
+     */
+    refinementCandidates(terms) {
+        const previous = this.previous;
+        if (!previous || terms.length < previous.terms.length) return null;
+
+        const last = previous.terms.length - 1;
+        for (let i = 0; i < last; i++) {
+            if (terms[i] !== previous.terms[i]) return null;
+        }
+        if (!terms[last].startsWith(previous.terms[last])) return null;
+        return new Set(previous.ranking);
+    }
+
+    /**
+     * Find the shard holding a term: shards are keyed by a one or two character prefix
+     */
+    shardFor(term) {
+        const shards = this.index.shards;
+        return shards[term.substring(0, 2)] || shards[term.charAt(0)] || null;
+    }
+
+    loadShard(file) {
+        if (!this.shards.has(file)) {
+            const request = fetch(new URL(this.index.shard_base + file, this.baseUrl).href)
+                .then(response => {
+                    if (!response.ok) throw new Error(`Failed to load search shard ${file}`);
+                    return response.json();
+                })
+                .catch(error => {
+                    // Allow a later query to retry the shard
+                    this.shards.delete(file);
+                    throw error;
+                });
+            this.shards.set(file, request);
+        }
+        return this.shards.get(file);
+    }
+
+    /**
+     * Terms of a shard starting with prefix. The expansion of a shorter
+     * prefix typed earlier is narrowed instead of scanning the whole shard.
+     */
+    keysWithPrefix(prefix, file, shard) {
+        let keys = null;
+        // Every prefix of two or more characters lives in the same shard
+        for (let length = prefix.length; length >= 2 && !keys; length--) {
+            keys = this.recall(this.prefixKeys, `${file}:${prefix.substring(0, length)}`);
+        }
+        keys = (keys || Object.keys(shard)).filter(key => key.startsWith(prefix));
+        return this.remember(this.prefixKeys, `${file}:${prefix}`, keys);
+    }
+
+    /**
+     * Collect postings for a query term. The last term of the query is treated
+     * as a prefix so results update while a word is still being typed.
+     */
+    async lookupTerm(term, isPrefix, candidates) {
+        const file = this.shardFor(term);
+        const matches = new Map();
+        if (!file) return matches;
+
+        const shard = await this.loadShard(file);
+        const keys = isPrefix ? this.keysWithPrefix(term, file, shard) : [term];
+        const totalSpecs = this.index.total_specs;
+
+        keys.forEach(key => {
+            const postings = shard[key];
+            if (!postings) return;
+            const idf = Math.log(1 + totalSpecs / postings.length);
+            postings.forEach(([doc, tf]) => {
+                if (candidates && !candidates.has(doc)) return;
+                // Saturating term frequency so long specs don't dominate
+                const score = idf * (tf / (tf + 1.2));
+                matches.set(doc, Math.max(matches.get(doc) || 0, score));
+            });
+        });
+        return matches;
+    }
+
+    filter(ranking, filters) {
+        const active = ['status', 'priority', 'category'].filter(field => filters[field] !== 'all');
+        if (active.length === 0) return ranking;
+
+        const docs = this.index.docs;
+        return ranking.filter(doc => active.every(field => docs[doc][field] === filters[field]));
+    }
+}
+
+if (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) {
+    const engine = new NextPMSearchEngine(message => self.postMessage(message));
+    self.onmessage = event => engine.handle(event.data);
+}
@@ -1,12 +1,36 @@
 /**
  * NextPM Search System
  * Client-side search and filtering for specifications
+ *
+ * Queries are evaluated by nextpm-search-worker.js in a Web Worker; this
+ * file only debounces input, sends queries and renders the results.
  */
 
+// Resolved while this script runs; document.currentScript is null afterwards.
+// Relative to this script, so the site also works when served under a sub-path
+const SEARCH_WORKER_URL = document.currentScript
+    ? new URL('nextpm-search-worker.js', document.currentScript.src).href
+    : null;
+const SEARCH_INDEX_URL = document.currentScript
+    ? new URL('search/', document.currentScript.src).href
+    : null;
+// Wait this long after the last keystroke before searching
+const SEARCH_DEBOUNCE_MS = 120;
+// Every result gets this height so only the visible ones need to be rendered
+// (custom.css clamps the preview and tags to fit)
+const SEARCH_RESULT_HEIGHT = 240;
+
 class NextPMSearch {
     constructor() {
         this.searchIndex = null;
+        this.baseUrl = SEARCH_INDEX_URL;
+        this.engine = null;
+        this.searchSequence = 0;
+        this.debounceTimer = null;
+        this.query = '';
+        this.allDocs = null;
         this.currentResults = [];
+        this.resultList = null;
         this.filters = {
             status: 'all',
             priority: 'all',
@@ -17,24 +41,63 @@ class NextPMSearch {
 
     async init() {
         try {
-            await this.loadSearchIndex();
-            this.setupEventListeners();
-            this.initializeFilters();
-            console.log('NextPM Search initialized successfully');
+            if (!this.baseUrl) throw new Error('Cannot locate the search index');
+            this.engine = await this.startEngine();
+            this.engine({ type: 'init', baseUrl: this.baseUrl });
         } catch (error) {
             console.error('Failed to initialize NextPM Search:', error);
         }
     }
 
-    async loadSearchIndex() {
-        try {
-            const response = await fetch('/mkdocs-static/js/search-index.json');
-            if (!response.ok) throw new Error('Failed to load search index');
-            this.searchIndex = await response.json();
-            console.log(`Loaded search index with ${this.searchIndex.total_specs} specs`);
-        } catch (error) {
-            console.error('Error loading search index:', error);
-            throw error;
+    /**
+     * Start the search engine in a Web Worker, or in the page when workers are
+     * unavailable (e.g. pages opened from file://). Returns a function that
+     * sends the engine a message; its replies go to handleEngineMessage.
+     */
+    async startEngine() {
+        if (window.Worker && SEARCH_WORKER_URL) {
+            try {
+                const worker = new Worker(SEARCH_WORKER_URL);
+                worker.onmessage = (e) => this.handleEngineMessage(e.data);
+                worker.onerror = (e) => console.error('NextPM Search worker failed:', e.message);
+                return (message) => worker.postMessage(message);
+            } catch (error) {
+                console.warn('Web Worker unavailable, searching on the main thread:', error);
+            }
+        }
+
+        if (typeof NextPMSearchEngine === 'undefined') {
+            await new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = SEARCH_WORKER_URL;
+                script.onload = resolve;
+                script.onerror = () => reject(new Error('Failed to load the search engine'));
+                document.head.appendChild(script);
+            });
+        }
+        const engine = new NextPMSearchEngine((message) => this.handleEngineMessage(message));
+        return (message) => engine.handle(message);
+    }
+
+    handleEngineMessage(message) {
+        if (message.type === 'ready') {
+            this.searchIndex = {
+                total_specs: message.totalSpecs,
+                index: message.docs
+            };
+            this.allDocs = Int32Array.from(this.searchIndex.index.keys());
+            this.currentResults = this.allDocs;
+            this.setupEventListeners();
+            this.initializeFilters();
+            console.log(`NextPM Search initialized with ${this.searchIndex.total_specs} specs`);
+        } else if (message.type === 'results') {
+            // Answers to superseded queries are dropped
+            if (message.id !== this.searchSequence) return;
+            this.currentResults = message.docs;
+            this.displayResults(this.currentResults);
+            this.updateSearchStats(this.currentResults.length);
+        } else if (message.type === 'error') {
+            console.error('Search failed:', message.message);
         }
     }
 
@@ -47,7 +110,8 @@ class NextPMSearch {
 
         if (searchInput) {
             searchInput.addEventListener('input', (e) => {
-                this.performSearch(e.target.value);
+                clearTimeout(this.debounceTimer);
+                this.debounceTimer = setTimeout(() => this.performSearch(e.target.value), SEARCH_DEBOUNCE_MS);
             });
         }
 
@@ -109,58 +173,37 @@ class NextPMSearch {
     }
 
     performSearch(query) {
-        if (!this.searchIndex || !query || query.trim().length < 2) {
-            this.currentResults = this.searchIndex ? this.searchIndex.index : [];
-            this.displayResults(this.currentResults);
-            return;
-        }
-
-        const searchTerm = query.toLowerCase().trim();
-        const results = this.searchIndex.index.filter(spec => {
-            return spec.title.toLowerCase().includes(searchTerm) ||
-                   spec.content.includes(searchTerm) ||
-                   spec.demonstrates.some(demo => demo.toLowerCase().includes(searchTerm)) ||
-                   spec.category.toLowerCase().includes(searchTerm);
-        });
-
-        // Sort results by relevance
-        results.sort((a, b) => {
-            const aTitle = a.title.toLowerCase().includes(searchTerm) ? 10 : 0;
-            const bTitle = b.title.toLowerCase().includes(searchTerm) ? 10 : 0;
-            const aContent = a.content.includes(searchTerm) ? 5 : 0;
-            const bContent = b.content.includes(searchTerm) ? 5 : 0;
-
-            return (bTitle + bContent) - (aTitle + aContent);
-        });
-
-        this.currentResults = results;
+        this.query = query || '';
         this.applyFilters();
     }
 
+    /**
+     * Send the current query and filters to the engine. Each request gets a
+     * new sequence number, which cancels any query still in flight.
+     */
     applyFilters() {
-        let filteredResults = this.currentResults;
-
-        if (this.filters.status !== 'all') {
-            filteredResults = filteredResults.filter(spec => spec.status === this.filters.status);
-        }
-
-        if (this.filters.priority !== 'all') {
-            filteredResults = filteredResults.filter(spec => spec.priority === this.filters.priority);
-        }
-
-        if (this.filters.category !== 'all') {
-            filteredResults = filteredResults.filter(spec => spec.category === this.filters.category);
-        }
-
-        this.displayResults(filteredResults);
-        this.updateSearchStats(filteredResults.length);
+        if (!this.engine || !this.searchIndex) return;
+        this.engine({
+            type: 'query',
+            id: ++this.searchSequence,
+            query: this.query,
+            filters: { ...this.filters }
+        });
     }
 
-    displayResults(results) {
+    /**
+     * Show results (doc numbers into the search index, best first). Only the
+     * results in view are rendered; scrolling reuses their elements.
+     */
+    displayResults(docs) {
         const resultsContainer = document.getElementById('search-results');
         if (!resultsContainer) return;
 
-        if (results.length === 0) {
+        if (docs.length === 0) {
+            if (this.resultList) {
+                this.resultList.destroy();
+                this.resultList = null;
+            }
             resultsContainer.innerHTML = `
                 <div class="no-results">
                     <div class="no-results-icon">🔍</div>
@@ -171,50 +214,54 @@ class NextPMSearch {
             return;
         }
 
-        resultsContainer.innerHTML = results.map((spec, index) => {
-            const statusIcon = this.getStatusIcon(spec.status);
-            const priorityColor = this.getPriorityColor(spec.priority);
-
-            return `
-                <div class="search-result-item" style="animation-delay: ${index * 0.1}s">
-                    <div class="search-result-header">
-                        <h3 class="search-result-title">
-                            <a href="${spec.url}">${spec.title}</a>
-                        </h3>
-                        <div class="search-result-badges">
-                            <span class="spec-state-badge spec-state-${spec.status}">
-                                ${statusIcon} ${spec.status.replace('-', ' ').toUpperCase()}
-                            </span>
-                            <span class="priority-badge priority-${spec.priority}" style="border-left-color: ${priorityColor}">
-                                ${spec.priority.toUpperCase()}
-                            </span>
-                        </div>
-                    </div>
-                    <div class="search-result-meta">
-                        <span class="result-meta-item">📂 ${spec.category.replace('-', ' ')}</span>
-                        <span class="result-meta-item">⏱️ ${spec.estimated_hours}h estimated</span>
-                        <span class="result-meta-item">📝 ${spec.git_commits} commits</span>
-                        <span class="result-meta-item">👤 ${spec.assignee}</span>
-                    </div>
-                    <div class="search-result-preview">
-                        ${this.getPreviewText(spec.content)}
-                    </div>
-                    <div class="search-result-demonstrates">
-                        ${spec.demonstrates.map(demo =>
-                            `<span class="demo-tag">${demo.replace('-', ' ')}</span>`
-                        ).join('')}
-                    </div>
+        if (!this.resultList) {
+            this.resultList = new NextPMVirtualList({
+                container: resultsContainer,
+                rowHeight: SEARCH_RESULT_HEIGHT,
+                renderRow: (item, position) => this.renderResult(item, this.searchIndex.index[this.currentResults[position]])
+            });
+        }
+        this.resultList.setCount(docs.length);
+    }
+
+    renderResult(item, spec) {
+        const statusIcon = this.getStatusIcon(spec.status);
+        const priorityColor = this.getPriorityColor(spec.priority);
+
+        if (!item.classList.contains('search-result-item')) {
+            // New elements fade in once; recycled ones are already visible
+            item.classList.add('search-result-item');
+            requestAnimationFrame(() => item.classList.add('animated'));
+        }
+        item.innerHTML = `
+            <div class="search-result-header">
+                <h3 class="search-result-title">
+                    <a href="${spec.url}">${spec.title}</a>
+                </h3>
+                <div class="search-result-badges">
+                    <span class="spec-state-badge spec-state-${spec.status}">
+                        ${statusIcon} ${spec.status.replace('-', ' ').toUpperCase()}
+                    </span>
+                    <span class="priority-badge priority-${spec.priority}" style="border-left-color: ${priorityColor}">
+                        ${spec.priority.toUpperCase()}
+                    </span>
                 </div>
-            `;
-        }).join('');
-
-        // Animate results
-        const resultItems = resultsContainer.querySelectorAll('.search-result-item');
-        resultItems.forEach((item, index) => {
-            setTimeout(() => {
-                item.classList.add('animated');
-            }, index * 50);
-        });
+            </div>
+            <div class="search-result-meta">
+                <span class="result-meta-item">📂 ${spec.category.replace('-', ' ')}</span>
+                <span class="result-meta-item">⏱️ ${spec.estimated_hours}h estimated</span>
+                <span class="result-meta-item">📝 ${spec.git_commits} commits</span>
+                <span class="result-meta-item">👤 ${spec.assignee}</span>
+            </div>
+            <div class="search-result-preview">
+                ${spec.summary}
+            </div>
+            <div class="search-result-demonstrates">
+                ${spec.demonstrates.map(demo =>
+                    `<span class="demo-tag">${demo.replace('-', ' ')}</span>`
+                ).join('')}
+            </div>
+        `;
     }
 
     getStatusIcon(status) {
@@ -237,13 +284,6 @@ class NextPMSearch {
         return colors[priority] || '#6c757d';
     }
 
-    getPreviewText(content) {
-        // Extract first meaningful sentence
-        const sentences = content.split('.').filter(s => s.trim().length > 20);
-        const preview = sentences[0] || content;
-        return preview.length > 150 ? preview.substring(0, 150) + '...' : preview;
-    }
-
     updateSearchStats(resultCount) {
         const statsElement = document.getElementById('search-stats');
         if (statsElement) {
@@ -263,8 +303,11 @@ class NextPMSearch {
         if (priorityFilter) priorityFilter.value = 'all';
         if (categoryFilter) categoryFilter.value = 'all';
 
+        clearTimeout(this.debounceTimer);
+        this.searchSequence++;
+        this.query = '';
         this.filters = { status: 'all', priority: 'all', category: 'all' };
-        this.currentResults = this.searchIndex ? this.searchIndex.index : [];
+        this.currentResults = this.allDocs || [];
         this.displayResults(this.currentResults);
         this.updateSearchStats(this.currentResults.length);
     }